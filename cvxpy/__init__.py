@@ -25,6 +25,7 @@ import cvxpy.interface.scipy_wrapper
 from cvxpy.error import SolverError
 from cvxpy.settings import (CVXOPT, GLPK, GLPK_MI, CBC, CPLEX, JULIA_OPT, OSQP,
                             ECOS, ECOS_BB, SUPER_SCS, SCS, GUROBI, ELEMENTAL, MOSEK, XPRESS,
+                            PDHG,
                             OPTIMAL, UNBOUNDED, INFEASIBLE, SOLVER_ERROR, ROBUST_KKTSOLVER,
                             OPTIMAL_INACCURATE, UNBOUNDED_INACCURATE, INFEASIBLE_INACCURATE)
 from cvxpy.transforms import linearize, partial_optimize
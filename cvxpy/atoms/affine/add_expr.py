@@ -31,9 +31,37 @@ class AddExpression(AffAtom):
         # For efficiency group args as sums.
         self._arg_groups = arg_groups
         super(AddExpression, self).__init__(*arg_groups)
-        self.args = []
-        for group in arg_groups:
-            self.args += self.expand_args(group)
+        groups = self._args
+        # The flattened args are stored as a prefix of a list that may be
+        # shared with the AddExpressions built from this one, and are only
+        # copied out when accessed. If the args of the first group end the
+        # shared list, the remaining args are appended to it instead of
+        # copying it, so building a sum term by term (e.g.,
+        # expr = expr + x[i]) takes linear rather than quadratic time.
+        first = groups[0]
+        if isinstance(first, AddExpression) and first._args is None \
+           and len(first._flat) == first._len:
+            flat = first._flat
+        else:
+            flat = list(self.expand_args(first))
+        for group in groups[1:]:
+            flat += self.expand_args(group)
+        self._flat = flat
+        self._len = len(flat)
+        self._args = None
+
+    @property
+    def args(self):
+        """list : The summands of the expression.
+        """
+        if self._args is None:
+            self._args = self._flat[:self._len]
+        return self._args
+
+    @args.setter
+    def args(self, args):
+        self._args = args
+        self._flat = None
 
     def shape_from_args(self):
         """Returns the (row, col) shape of the expression.
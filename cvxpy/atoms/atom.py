@@ -19,6 +19,7 @@ from .. import utilities as u
 from .. import interface as intf
 from ..expressions.constants import Constant, CallbackParam
 from ..expressions.expression import Expression
+from ..utilities.traversal import post_order
 import abc
 import numpy as np
 from fastcache import clru_cache
@@ -169,28 +170,63 @@ class Atom(Expression):
     def canonicalize(self):
         """Represent the atom as an affine objective and conic constraints.
         """
-        # Constant atoms are treated as a leaf.
-        if self.is_constant():
+        def children(node):
+            # Only expand atoms whose canonical form is not known yet;
+            # everything else canonicalizes itself without recursion.
+            if node is self or (
+                    isinstance(node, Atom) and
+                    type(node).canonicalize == Atom.canonicalize and
+                    not hasattr(node, '_lazy_canonical_form')):
+                return node.args
+            return []
+
+        def leaf_form(node):
+            # Constant expressions are treated as a leaf.
+            if not node.args:
+                return node.canonical_form
             # Parameterized expressions are evaluated later.
-            if self.parameters():
-                param = CallbackParam(lambda: self.value, self.shape)
+            params = node.parameters()
+            if params:
+                param = CallbackParam(lambda: node.value, node.shape, params)
                 return param.canonical_form
             # Non-parameterized expressions are evaluated immediately.
             else:
-                return Constant(self.value).canonical_form
-        else:
+                return Constant(node.value).canonical_form
+
+        def visit(node, arg_forms):
+            # Constant nodes are visited as None, so that the arguments of
+            # a constant atom are never canonicalized. Whether a node has
+            # variables is derived from its arguments where they were
+            # visited, and from the cached is_constant otherwise.
+            if not node.args:
+                constant = not node.variables()
+            elif not arg_forms:
+                constant = node.is_constant()
+            else:
+                constant = (all(form is None for form in arg_forms) or
+                            node.is_zero() or 0 in node.shape)
+            if constant:
+                return None
+            elif not arg_forms:
+                return node.canonical_form
             arg_objs = []
             constraints = []
-            for arg in self.args:
-                obj, constr = arg.canonical_form
+            for arg, form in zip(node.args, arg_forms):
+                obj, constr = leaf_form(arg) if form is None else form
                 arg_objs.append(obj)
                 constraints += constr
             # Special info required by the graph implementation.
-            data = self.get_data()
-            graph_obj, graph_constr = self.graph_implementation(arg_objs,
-                                                                self.shape,
-                                                                data)
-            return graph_obj, constraints + graph_constr
+            data = node.get_data()
+            graph_obj, graph_constr = node.graph_implementation(
+                arg_objs, node.shape, data)
+            canon = (graph_obj, constraints + graph_constr)
+            if node is not self:
+                node.canonical_form = canon
+            return canon
+
+        # The tree is canonicalized bottom-up without recursion.
+        canon = post_order(self, visit, children)
+        return leaf_form(self) if canon is None else canon
 
     def graph_implementation(self, arg_objs, shape, data=None):
         """Reduces the atom to an affine expression and list of constraints.
@@ -71,7 +71,7 @@ class SOC(Constraint):
         -------
         list
         """
-        return [self.axis]
+        return [self.axis, self.id]
 
     def format(self, eq_constr, leq_constr, dims, solver):
         """Formats SOC constraints as inequalities for the solver.
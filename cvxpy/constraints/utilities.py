@@ -17,6 +17,7 @@ limitations under the License.
 # Utility functions for constraints.
 
 import cvxpy.lin_ops.lin_utils as lu
+import numpy as np
 import scipy.sparse as sp
 
 
@@ -110,13 +111,9 @@ def get_spacing_matrix(shape, spacing, offset):
     LinOp
         A sparse matrix constant LinOp.
     """
-    val_arr = []
-    row_arr = []
-    col_arr = []
     # Selects from each column.
-    for var_row in range(shape[1]):
-        val_arr.append(1.0)
-        row_arr.append(spacing*var_row + offset)
-        col_arr.append(var_row)
+    col_arr = np.arange(shape[1])
+    row_arr = spacing*col_arr + offset
+    val_arr = np.ones(shape[1])
     mat = sp.coo_matrix((val_arr, (row_arr, col_arr)), shape).tocsc()
     return lu.create_const(mat, shape, sparse=True)
@@ -20,6 +20,10 @@ import numpy as np
 import scipy.sparse
 from collections import deque
 
+from cvxpy.error import ParameterAffineError
+from cvxpy.utilities import profiling
+from cvxpy.utilities.traversal import post_order
+
 
 def get_problem_matrix(constrs, id_to_col=None, constr_offsets=None):
     """
@@ -36,6 +40,58 @@ def get_problem_matrix(constrs, id_to_col=None, constr_offsets=None):
         V, I, J: numpy arrays encoding a sparse representation of our problem
         const_vec: a numpy column vector representing the constant_data in our problem
     """
+    problemData, profile_start = _build_matrix(constrs, id_to_col,
+                                               constr_offsets)
+    # Unpacking
+    V = problemData.getV(len(problemData.V))
+    I = problemData.getI(len(problemData.V))
+    J = problemData.getJ(len(problemData.J))
+    const_vec = problemData.getConstVec(len(problemData.const_vec))
+
+    if profile_start is not None:
+        profiling.PROFILER.stop(profile_start, len(V))
+    return V, I, J, const_vec.reshape(-1, 1)
+
+
+def get_problem_csr(constrs, id_to_col, num_cols):
+    """
+    Builds the problem data as a CSR matrix, which build_matrix writes
+    directly, without sorting triplets.
+
+    Parameters
+    ----------
+        constrs: A list of python linOp trees
+        id_to_col: A map from variable id to offset within our matrix
+        num_cols: The number of columns of the matrix
+
+    Returns
+    ----------
+        A: a SciPy CSR matrix of the coefficients of the variables
+        const_vec: a numpy 1D array of the constant_data in our problem
+    """
+    problemData, profile_start = _build_matrix(constrs, id_to_col)
+    data = problemData.getV(len(problemData.V))
+    indices = problemData.getJ(len(problemData.J)).astype(np.int32)
+    indptr = problemData.getRowPtr(len(problemData.row_ptr)).astype(np.int32)
+    const_vec = problemData.getConstVec(len(problemData.const_vec))
+    A = scipy.sparse.csr_matrix((data, indices, indptr),
+                                shape=(const_vec.size, num_cols))
+
+    if profile_start is not None:
+        profiling.PROFILER.stop(profile_start, len(data))
+    return A, const_vec
+
+
+def _build_matrix(constrs, id_to_col=None, constr_offsets=None):
+    """Calls build_matrix on the linOp trees of constrs.
+
+    Returns the ProblemData and, if profiling, the start of the "cvxcore"
+    frame, which the caller stops once the data is unpacked.
+    """
+    profiler = profiling.PROFILER
+    profile_start = None
+    if profiler is not None:
+        profile_start = profiler.start("cvxcore")
     linOps = [constr.expr for constr in constrs]
     lin_vec = cvxcore.LinOpVector()
 
@@ -56,6 +112,9 @@ def get_problem_matrix(constrs, id_to_col=None, constr_offsets=None):
         tmp.append(tree)
         lin_vec.push_back(tree)
 
+    if profiler is not None:
+        build_start = profiler.start("build_matrix")
+    cvxcore.set_profiling(profiler is not None)
     if constr_offsets is None:
         problemData = cvxcore.build_matrix(lin_vec, id_to_col_C)
     else:
@@ -65,14 +124,150 @@ def get_problem_matrix(constrs, id_to_col=None, constr_offsets=None):
             constr_offsets_C.push_back(int(offset))
         problemData = cvxcore.build_matrix(lin_vec, id_to_col_C,
                                             constr_offsets_C)
+    if profiler is not None:
+        # The time and the nonzeros of the coefficients computed for each
+        # LinOp type, nested in build_matrix.
+        num_types = len(problemData.type_calls)
+        calls = problemData.getTypeCalls(num_types)
+        seconds = problemData.getTypeSeconds(num_types)
+        nnz = problemData.getTypeNnz(num_types)
+        for ty in np.flatnonzero(calls):
+            profiler.add(type_names[ty], seconds[ty], int(nnz[ty]),
+                         int(calls[ty]))
+        profiler.stop(build_start, len(problemData.V))
+
+    return problemData, profile_start
+
+
+def get_parameter_tensor(constrs, id_to_col, param_to_col, var_length,
+                         param_length):
+    """
+    Builds the problem data as an affine function of the parameters by
+    calling CVXCanon's C++ build_parameter_tensor function.
 
+    The coefficients are arranged in a third-order tensor, flattened into a
+    sparse matrix T of shape (rows*(var_length+1), param_length+1): the entry
+    in row i + rows*j and column k is the coefficient of the k-th parameter
+    entry in entry (i, j) of [A | b], and the last column holds the part that
+    does not depend on parameters. [A | b] is therefore T @ [p; 1], reshaped
+    in Fortran order, where p stacks the values of the parameters.
+
+    Parameters may only multiply parameter-free expressions.
+
+    Parameters
+    ----------
+        constrs: A list of python linOp trees
+        id_to_col: A map from variable id to offset within our matrix
+        param_to_col: A map from parameter id to offset within p
+        var_length: The number of columns of A
+        param_length: The length of p
+
+    Returns
+    ----------
+        V, I, J: numpy arrays encoding T in coordinate format
+
+    Raises
+    ----------
+        ParameterAffineError: If the data is not affine in the parameters.
+    """
+    linOps = [constr.expr for constr in constrs]
+    memo = {}
+    for lin in linOps:
+        _check_parameter_tensor(lin, param_to_col, var_length, memo)
+    lin_vec = cvxcore.LinOpVector()
+
+    id_to_col_C = cvxcore.IntIntMap()
+    for id, col in id_to_col.items():
+        id_to_col_C[int(id)] = int(col)
+
+    # This array keeps variables data in scope
+    # after build_lin_op_tree returns
+    tmp = []
+    for lin in linOps:
+        tree = build_lin_op_tree(lin, tmp, param_to_col)
+        tmp.append(tree)
+        lin_vec.push_back(tree)
+
+    problemData = cvxcore.build_parameter_tensor(lin_vec, id_to_col_C,
+                                                 int(var_length),
+                                                 int(param_length))
     # Unpacking
     V = problemData.getV(len(problemData.V))
-    I = problemData.getI(len(problemData.I))
-    J = problemData.getJ(len(problemData.J))
-    const_vec = problemData.getConstVec(len(problemData.const_vec))
+    I = problemData.getI(len(V)).astype(np.int64)
+    J = problemData.getJ(len(V)).astype(np.int64)
+    K = problemData.getParamEntries(len(V)).astype(np.int64)
+    rows = len(problemData.row_ptr) - 1
+    return V, I + rows*J, K
+
+
+def _linop_children(linPy):
+    """The arguments of a LinOp, and its data if it is a LinOp.
+    """
+    if isinstance(linPy.data, lo.LinOp):
+        return linPy.args + [linPy.data]
+    return linPy.args
 
-    return V, I, J, const_vec.reshape(-1, 1)
+
+def _has_params(linPy, memo=None):
+    """Does the LinOp tree contain parameters?
+    """
+    def visit(node, child_results):
+        return node.type == lo.PARAM or any(child_results)
+    return post_order(linPy, visit, _linop_children, memo)
+
+
+def _check_parameter_tensor(linPy, param_to_col, var_length, memo):
+    """Checks that build_parameter_tensor supports a LinOp tree.
+
+    The coefficients of a parameter are stacked for each of its entries in
+    cvxcore, so their number of rows must fit in an int.
+
+    Raises
+    ----------
+        ParameterAffineError: If the data of a product whose argument has
+            parameters, or of another LinOp, has parameters, or if a
+            parameter is unknown or too large.
+    """
+    def visit(node, child_results):
+        if node.type == lo.PARAM:
+            if node.data.id not in param_to_col:
+                raise ParameterAffineError("Unknown parameter %s." % node.data)
+            if node.data.size*(var_length + 1) >= 2**31:
+                raise ParameterAffineError(
+                    "Parameter %s is too large." % node.data)
+            return True
+        if isinstance(node.data, lo.LinOp) and child_results[-1]:
+            if node.type not in (lo.MUL, lo.RMUL, lo.MUL_ELEM) or \
+                    any(child_results[:-1]):
+                raise ParameterAffineError(
+                    "The problem data is not affine in the parameters.")
+            _check_product_shape(node)
+        return any(child_results)
+    post_order(linPy, visit, _linop_children, memo)
+
+
+def _check_product_shape(linPy):
+    """Checks that the data of a product with parameters has the shape that
+       cvxcore pairs with the entries of the argument (see
+       get_product_pairs in cvxcore.cpp).
+    """
+    arg = linPy.args[0]
+    size, arg_size = int(np.prod(linPy.shape)), int(np.prod(arg.shape))
+    data_size = int(np.prod(linPy.data.shape))
+    if linPy.type == lo.MUL_ELEM or (data_size == 1 and size == arg_size):
+        return
+    elif linPy.type == lo.MUL:
+        # data (m, n) times arg (n, k).
+        n = arg.shape[0] if arg.shape else 1
+        k = arg_size // n
+        expected = (size // k)*n
+    else:
+        # arg (m, n) times data (n, k).
+        m = arg.shape[0] if len(arg.shape) == 2 else 1
+        expected = (arg_size // m)*(size // m)
+    if data_size != expected:
+        raise ParameterAffineError(
+            "The problem data is not affine in the parameters.")
 
 
 def format_matrix(matrix, shape=None, format='dense'):
@@ -94,7 +289,19 @@ def format_matrix(matrix, shape=None, format='dense'):
         raise NotImplementedError()
 
 
-def set_matrix_data(linC, linPy):
+def set_dense_data(linC, matrix, tmp):
+    """Sets the dense data field of our C++ linOp.
+
+    cvxcore references the memory of the array rather than copying it, so
+    the array is made a Fortran-ordered array of doubles and kept alive in
+    tmp.
+    """
+    matrix = np.asfortranarray(matrix, dtype=np.float64)
+    tmp.append(matrix)
+    linC.set_dense_data(matrix)
+
+
+def set_matrix_data(linC, linPy, tmp):
     """Calls the appropriate CVXCanon function to set the matrix data field of
        our C++ linOp.
     """
@@ -106,8 +313,8 @@ def set_matrix_data(linC, linPy):
                                  coo.col.astype(float), coo.shape[0],
                                  coo.shape[1])
         elif linPy.data.type == 'dense_const':
-            linC.set_dense_data(format_matrix(linPy.data.data,
-                                              shape=linPy.data.shape))
+            set_dense_data(linC, format_matrix(linPy.data.data,
+                                               shape=linPy.data.shape), tmp)
             linC.data_ndim = len(linPy.data.shape)
         else:
             raise NotImplementedError()
@@ -118,8 +325,8 @@ def set_matrix_data(linC, linPy):
                                  coo.col.astype(float), coo.shape[0],
                                  coo.shape[1])
         else:
-            linC.set_dense_data(format_matrix(linPy.data,
-                                              shape=linPy.shape))
+            set_dense_data(linC, format_matrix(linPy.data,
+                                               shape=linPy.shape), tmp)
             linC.data_ndim = len(linPy.data.shape)
 
 
@@ -161,9 +368,13 @@ type_map = {
     "DENSE_CONST": cvxcore.DENSE_CONST,
     "SPARSE_CONST": cvxcore.SPARSE_CONST,
     "NO_OP": cvxcore.NO_OP,
-    "KRON": cvxcore.KRON
+    "KRON": cvxcore.KRON,
+    "PARAM": cvxcore.PARAM
 }
 
+# The name of each cvxcore LinOp type.
+type_names = {ty: name.lower() for name, ty in type_map.items()}
+
 
 def get_type(ty):
     if ty in type_map:
@@ -172,7 +383,7 @@ def get_type(ty):
         raise NotImplementedError("Type %s is not supported." % ty)
 
 
-def build_lin_op_tree(root_linPy, tmp):
+def build_lin_op_tree(root_linPy, tmp, param_to_col=None):
     """
     Breadth-first, pre-order traversal on the Python linOp tree
     Parameters
@@ -181,11 +392,17 @@ def build_lin_op_tree(root_linPy, tmp):
 
     tmp: an array to keep data from going out of scope
 
+    param_to_col: a map from parameter id to offset within the parameter
+        entries, for build_parameter_tensor; parameters are not supported
+        if None
+
     Returns
     --------
     root_linC: a C++ LinOp tree created through our swig interface
     """
     Q = deque()
+    # Whether each subtree has parameters.
+    param_memo = {}
     root_linC = cvxcore.LinOp()
     Q.append((root_linPy, root_linC))
 
@@ -209,16 +426,32 @@ def build_lin_op_tree(root_linPy, tmp):
         # Loading the problem data into the appropriate array format
         if linPy.data is None:
             pass
+        elif linPy.type == lo.PARAM:
+            if param_to_col is None:
+                raise NotImplementedError("Type PARAM is not supported.")
+            # The offset of the parameter's entries.
+            set_dense_data(linC, format_matrix(param_to_col[linPy.data.id],
+                                               format='scalar'), tmp)
+            linC.data_ndim = 0
+        elif isinstance(linPy.data, lo.LinOp) and param_to_col is not None \
+                and _has_params(linPy.data, param_memo):
+            # The data is a function of the parameters.
+            tree = cvxcore.LinOp()
+            tmp.append(tree)
+            Q.append((linPy.data, tree))
+            linC.set_linOp_data(tree)
         elif isinstance(linPy.data, tuple) and isinstance(linPy.data[0], slice):
             set_slice_data(linC, linPy)
         elif isinstance(linPy.data, float) or isinstance(linPy.data, numbers.Integral):
-            linC.set_dense_data(format_matrix(linPy.data, format='scalar'))
+            set_dense_data(linC, format_matrix(linPy.data, format='scalar'),
+                           tmp)
             linC.data_ndim = 0
         # data is supposed to be a LinOp
         elif isinstance(linPy.data, lo.LinOp) and linPy.data.type == 'scalar_const':
-            linC.set_dense_data(format_matrix(linPy.data.data, format='scalar'))
+            set_dense_data(linC, format_matrix(linPy.data.data,
+                                               format='scalar'), tmp)
             linC.data_ndim = 0
         else:
-            set_matrix_data(linC, linPy)
+            set_matrix_data(linC, linPy, tmp)
 
     return root_linC
@@ -39,8 +39,8 @@
 
 %include "LinOp.hpp"
 
-/* Typemap for the getV, getI, getJ, and getConstVec C++ routines in 
-	 problemData.hpp */
+/* Typemap for the getV, getI, getJ, getRowPtr, getParamEntries and
+	 getConstVec C++ routines in problemData.hpp */
 %apply (double* ARGOUT_ARRAY1, int DIM1) {(double* values, int num_values)}
 %include "ProblemData.hpp"
 
@@ -57,3 +57,5 @@ namespace std {
 /* Wrapper for entry point into CVXCanon Library */
 ProblemData build_matrix(std::vector< LinOp* > constraints, std::map<int, int> id_to_col);
 ProblemData build_matrix(std::vector< LinOp* > constraints, std::map<int, int> id_to_col, std::vector<int> constr_offsets);
+ProblemData build_parameter_tensor(std::vector< LinOp* > constraints, std::map<int, int> id_to_col, int var_length, int param_length);
+void set_profiling(bool enabled);
@@ -226,6 +226,9 @@ NO_OP = _cvxcore.NO_OP
 
 _cvxcore.KRON_swigconstant(_cvxcore)
 KRON = _cvxcore.KRON
+
+_cvxcore.PARAM_swigconstant(_cvxcore)
+PARAM = _cvxcore.PARAM
 class LinOp(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, LinOp, name, value)
@@ -275,6 +278,9 @@ class LinOp(_object):
     def has_constant_type(self):
         return _cvxcore.LinOp_has_constant_type(self)
 
+    def set_linOp_data(self, tree):
+        return _cvxcore.LinOp_set_linOp_data(self, tree)
+
     def set_dense_data(self, matrix):
         return _cvxcore.LinOp_set_dense_data(self, matrix)
 
@@ -297,14 +303,14 @@ class ProblemData(_object):
     __swig_getmethods__["V"] = _cvxcore.ProblemData_V_get
     if _newclass:
         V = _swig_property(_cvxcore.ProblemData_V_get, _cvxcore.ProblemData_V_set)
-    __swig_setmethods__["I"] = _cvxcore.ProblemData_I_set
-    __swig_getmethods__["I"] = _cvxcore.ProblemData_I_get
-    if _newclass:
-        I = _swig_property(_cvxcore.ProblemData_I_get, _cvxcore.ProblemData_I_set)
     __swig_setmethods__["J"] = _cvxcore.ProblemData_J_set
     __swig_getmethods__["J"] = _cvxcore.ProblemData_J_get
     if _newclass:
         J = _swig_property(_cvxcore.ProblemData_J_get, _cvxcore.ProblemData_J_set)
+    __swig_setmethods__["row_ptr"] = _cvxcore.ProblemData_row_ptr_set
+    __swig_getmethods__["row_ptr"] = _cvxcore.ProblemData_row_ptr_get
+    if _newclass:
+        row_ptr = _swig_property(_cvxcore.ProblemData_row_ptr_get, _cvxcore.ProblemData_row_ptr_set)
     __swig_setmethods__["const_vec"] = _cvxcore.ProblemData_const_vec_set
     __swig_getmethods__["const_vec"] = _cvxcore.ProblemData_const_vec_get
     if _newclass:
@@ -317,6 +323,18 @@ class ProblemData(_object):
     __swig_getmethods__["const_to_row"] = _cvxcore.ProblemData_const_to_row_get
     if _newclass:
         const_to_row = _swig_property(_cvxcore.ProblemData_const_to_row_get, _cvxcore.ProblemData_const_to_row_set)
+    __swig_setmethods__["type_calls"] = _cvxcore.ProblemData_type_calls_set
+    __swig_getmethods__["type_calls"] = _cvxcore.ProblemData_type_calls_get
+    if _newclass:
+        type_calls = _swig_property(_cvxcore.ProblemData_type_calls_get, _cvxcore.ProblemData_type_calls_set)
+    __swig_setmethods__["type_seconds"] = _cvxcore.ProblemData_type_seconds_set
+    __swig_getmethods__["type_seconds"] = _cvxcore.ProblemData_type_seconds_get
+    if _newclass:
+        type_seconds = _swig_property(_cvxcore.ProblemData_type_seconds_get, _cvxcore.ProblemData_type_seconds_set)
+    __swig_setmethods__["type_nnz"] = _cvxcore.ProblemData_type_nnz_set
+    __swig_getmethods__["type_nnz"] = _cvxcore.ProblemData_type_nnz_get
+    if _newclass:
+        type_nnz = _swig_property(_cvxcore.ProblemData_type_nnz_get, _cvxcore.ProblemData_type_nnz_set)
 
     def getV(self, values):
         return _cvxcore.ProblemData_getV(self, values)
@@ -327,9 +345,24 @@ class ProblemData(_object):
     def getJ(self, values):
         return _cvxcore.ProblemData_getJ(self, values)
 
+    def getRowPtr(self, values):
+        return _cvxcore.ProblemData_getRowPtr(self, values)
+
+    def getParamEntries(self, values):
+        return _cvxcore.ProblemData_getParamEntries(self, values)
+
     def getConstVec(self, values):
         return _cvxcore.ProblemData_getConstVec(self, values)
 
+    def getTypeCalls(self, values):
+        return _cvxcore.ProblemData_getTypeCalls(self, values)
+
+    def getTypeSeconds(self, values):
+        return _cvxcore.ProblemData_getTypeSeconds(self, values)
+
+    def getTypeNnz(self, values):
+        return _cvxcore.ProblemData_getTypeNnz(self, values)
+
     def __init__(self):
         this = _cvxcore.new_ProblemData()
         try:
@@ -1025,6 +1058,14 @@ LinOpVector_swigregister(LinOpVector)
 def build_matrix(*args):
     return _cvxcore.build_matrix(*args)
 build_matrix = _cvxcore.build_matrix
+
+def build_parameter_tensor(constraints, id_to_col, var_length, param_length):
+    return _cvxcore.build_parameter_tensor(constraints, id_to_col, var_length, param_length)
+build_parameter_tensor = _cvxcore.build_parameter_tensor
+
+def set_profiling(enabled):
+    return _cvxcore.set_profiling(enabled)
+set_profiling = _cvxcore.set_profiling
 # This file is compatible with both classic and new-style classes.
 
 
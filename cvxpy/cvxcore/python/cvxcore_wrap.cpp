@@ -7180,6 +7180,17 @@ SWIGINTERN PyObject *KRON_swigconstant(PyObject *SWIGUNUSEDPARM(self), PyObject
 }
 
 
+SWIGINTERN PyObject *PARAM_swigconstant(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *module;
+  PyObject *d;
+  if (!PyArg_ParseTuple(args,(char*)"O:swigconstant", &module)) return NULL;
+  d = PyModule_GetDict(module);
+  if (!d) return NULL;
+  SWIG_Python_SetConstant(d, "PARAM",SWIG_From_int(static_cast< int >(PARAM)));
+  return SWIG_Py_Void();
+}
+
+
 SWIGINTERN PyObject *_wrap_LinOp_type_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   LinOp *arg1 = (LinOp *) 0 ;
@@ -7647,6 +7658,36 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_LinOp_set_linOp_data(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  LinOp *arg1 = (LinOp *) 0 ;
+  LinOp *arg2 = (LinOp *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:LinOp_set_linOp_data",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_LinOp, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LinOp_set_linOp_data" "', argument " "1"" of type '" "LinOp *""'"); 
+  }
+  arg1 = reinterpret_cast< LinOp * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_LinOp, 0 |  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "LinOp_set_linOp_data" "', argument " "2"" of type '" "LinOp *""'"); 
+  }
+  arg2 = reinterpret_cast< LinOp * >(argp2);
+  (arg1)->set_linOp_data(arg2);
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_LinOp_set_dense_data(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   LinOp *arg1 = (LinOp *) 0 ;
@@ -7856,7 +7897,7 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_ProblemData_I_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_ProblemData_row_ptr_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   ProblemData *arg1 = (ProblemData *) 0 ;
   std::vector< int,std::allocator< int > > *arg2 = (std::vector< int,std::allocator< int > > *) 0 ;
@@ -7867,18 +7908,18 @@ SWIGINTERN PyObject *_wrap_ProblemData_I_set(PyObject *SWIGUNUSEDPARM(self), PyO
   PyObject * obj0 = 0 ;
   PyObject * obj1 = 0 ;
   
-  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_I_set",&obj0,&obj1)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_row_ptr_set",&obj0,&obj1)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_I_set" "', argument " "1"" of type '" "ProblemData *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_row_ptr_set" "', argument " "1"" of type '" "ProblemData *""'"); 
   }
   arg1 = reinterpret_cast< ProblemData * >(argp1);
   res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_std__vectorT_int_std__allocatorT_int_t_t, 0 |  0 );
   if (!SWIG_IsOK(res2)) {
-    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "ProblemData_I_set" "', argument " "2"" of type '" "std::vector< int,std::allocator< int > > *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "ProblemData_row_ptr_set" "', argument " "2"" of type '" "std::vector< int,std::allocator< int > > *""'"); 
   }
   arg2 = reinterpret_cast< std::vector< int,std::allocator< int > > * >(argp2);
-  if (arg1) (arg1)->I = *arg2;
+  if (arg1) (arg1)->row_ptr = *arg2;
   resultobj = SWIG_Py_Void();
   return resultobj;
 fail:
@@ -7886,7 +7927,7 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_ProblemData_I_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_ProblemData_row_ptr_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   ProblemData *arg1 = (ProblemData *) 0 ;
   void *argp1 = 0 ;
@@ -7894,13 +7935,13 @@ SWIGINTERN PyObject *_wrap_ProblemData_I_get(PyObject *SWIGUNUSEDPARM(self), PyO
   PyObject * obj0 = 0 ;
   std::vector< int,std::allocator< int > > *result = 0 ;
   
-  if (!PyArg_ParseTuple(args,(char *)"O:ProblemData_I_get",&obj0)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"O:ProblemData_row_ptr_get",&obj0)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_I_get" "', argument " "1"" of type '" "ProblemData *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_row_ptr_get" "', argument " "1"" of type '" "ProblemData *""'"); 
   }
   arg1 = reinterpret_cast< ProblemData * >(argp1);
-  result = (std::vector< int,std::allocator< int > > *)& ((arg1)->I);
+  result = (std::vector< int,std::allocator< int > > *)& ((arg1)->row_ptr);
   resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_std__vectorT_int_std__allocatorT_int_t_t, 0 |  0 );
   return resultobj;
 fail:
@@ -8292,6 +8333,403 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_ProblemData_getRowPtr(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  double *arg2 = (double *) 0 ;
+  int arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *array2 = NULL ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_getRowPtr",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_getRowPtr" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  {
+    npy_intp dims[1];
+    if (!PyInt_Check(obj1))
+    {
+      const char* typestring = pytype_string(obj1);
+      PyErr_Format(PyExc_TypeError,
+        "Int dimension expected.  '%s' given.",
+        typestring);
+      SWIG_fail;
+    }
+    arg3 = (int) PyInt_AsLong(obj1);
+    dims[0] = (npy_intp) arg3;
+    array2 = PyArray_SimpleNew(1, dims, NPY_DOUBLE);
+    if (!array2) SWIG_fail;
+    arg2 = (double*) array_data(array2);
+  }
+  (arg1)->getRowPtr(arg2,arg3);
+  resultobj = SWIG_Py_Void();
+  {
+    resultobj = SWIG_Python_AppendOutput(resultobj,array2);
+  }
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_getParamEntries(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  double *arg2 = (double *) 0 ;
+  int arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *array2 = NULL ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_getParamEntries",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_getParamEntries" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  {
+    npy_intp dims[1];
+    if (!PyInt_Check(obj1))
+    {
+      const char* typestring = pytype_string(obj1);
+      PyErr_Format(PyExc_TypeError,
+        "Int dimension expected.  '%s' given.",
+        typestring);
+      SWIG_fail;
+    }
+    arg3 = (int) PyInt_AsLong(obj1);
+    dims[0] = (npy_intp) arg3;
+    array2 = PyArray_SimpleNew(1, dims, NPY_DOUBLE);
+    if (!array2) SWIG_fail;
+    arg2 = (double*) array_data(array2);
+  }
+  (arg1)->getParamEntries(arg2,arg3);
+  resultobj = SWIG_Py_Void();
+  {
+    resultobj = SWIG_Python_AppendOutput(resultobj,array2);
+  }
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_type_calls_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  std::vector< double,std::allocator< double > > *arg2 = (std::vector< double,std::allocator< double > > *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_type_calls_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_type_calls_set" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_std__vectorT_double_std__allocatorT_double_t_t, 0 |  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "ProblemData_type_calls_set" "', argument " "2"" of type '" "std::vector< double,std::allocator< double > > *""'"); 
+  }
+  arg2 = reinterpret_cast< std::vector< double,std::allocator< double > > * >(argp2);
+  if (arg1) (arg1)->type_calls = *arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_type_calls_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  std::vector< double,std::allocator< double > > *result = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:ProblemData_type_calls_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_type_calls_get" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  result = (std::vector< double,std::allocator< double > > *)& ((arg1)->type_calls);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_std__vectorT_double_std__allocatorT_double_t_t, 0 |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_type_seconds_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  std::vector< double,std::allocator< double > > *arg2 = (std::vector< double,std::allocator< double > > *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_type_seconds_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_type_seconds_set" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_std__vectorT_double_std__allocatorT_double_t_t, 0 |  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "ProblemData_type_seconds_set" "', argument " "2"" of type '" "std::vector< double,std::allocator< double > > *""'"); 
+  }
+  arg2 = reinterpret_cast< std::vector< double,std::allocator< double > > * >(argp2);
+  if (arg1) (arg1)->type_seconds = *arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_type_seconds_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  std::vector< double,std::allocator< double > > *result = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:ProblemData_type_seconds_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_type_seconds_get" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  result = (std::vector< double,std::allocator< double > > *)& ((arg1)->type_seconds);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_std__vectorT_double_std__allocatorT_double_t_t, 0 |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_type_nnz_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  std::vector< double,std::allocator< double > > *arg2 = (std::vector< double,std::allocator< double > > *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_type_nnz_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_type_nnz_set" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2,SWIGTYPE_p_std__vectorT_double_std__allocatorT_double_t_t, 0 |  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "ProblemData_type_nnz_set" "', argument " "2"" of type '" "std::vector< double,std::allocator< double > > *""'"); 
+  }
+  arg2 = reinterpret_cast< std::vector< double,std::allocator< double > > * >(argp2);
+  if (arg1) (arg1)->type_nnz = *arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_type_nnz_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  std::vector< double,std::allocator< double > > *result = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:ProblemData_type_nnz_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_type_nnz_get" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  result = (std::vector< double,std::allocator< double > > *)& ((arg1)->type_nnz);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_std__vectorT_double_std__allocatorT_double_t_t, 0 |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_getTypeCalls(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  double *arg2 = (double *) 0 ;
+  int arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *array2 = NULL ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_getTypeCalls",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_getTypeCalls" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  {
+    npy_intp dims[1];
+    if (!PyInt_Check(obj1))
+    {
+      const char* typestring = pytype_string(obj1);
+      PyErr_Format(PyExc_TypeError,
+        "Int dimension expected.  '%s' given.",
+        typestring);
+      SWIG_fail;
+    }
+    arg3 = (int) PyInt_AsLong(obj1);
+    dims[0] = (npy_intp) arg3;
+    array2 = PyArray_SimpleNew(1, dims, NPY_DOUBLE);
+    if (!array2) SWIG_fail;
+    arg2 = (double*) array_data(array2);
+  }
+  (arg1)->getTypeCalls(arg2,arg3);
+  resultobj = SWIG_Py_Void();
+  {
+    resultobj = SWIG_Python_AppendOutput(resultobj,array2);
+  }
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_getTypeSeconds(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  double *arg2 = (double *) 0 ;
+  int arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *array2 = NULL ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_getTypeSeconds",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_getTypeSeconds" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  {
+    npy_intp dims[1];
+    if (!PyInt_Check(obj1))
+    {
+      const char* typestring = pytype_string(obj1);
+      PyErr_Format(PyExc_TypeError,
+        "Int dimension expected.  '%s' given.",
+        typestring);
+      SWIG_fail;
+    }
+    arg3 = (int) PyInt_AsLong(obj1);
+    dims[0] = (npy_intp) arg3;
+    array2 = PyArray_SimpleNew(1, dims, NPY_DOUBLE);
+    if (!array2) SWIG_fail;
+    arg2 = (double*) array_data(array2);
+  }
+  (arg1)->getTypeSeconds(arg2,arg3);
+  resultobj = SWIG_Py_Void();
+  {
+    resultobj = SWIG_Python_AppendOutput(resultobj,array2);
+  }
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProblemData_getTypeNnz(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProblemData *arg1 = (ProblemData *) 0 ;
+  double *arg2 = (double *) 0 ;
+  int arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *array2 = NULL ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProblemData_getTypeNnz",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProblemData, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProblemData_getTypeNnz" "', argument " "1"" of type '" "ProblemData *""'"); 
+  }
+  arg1 = reinterpret_cast< ProblemData * >(argp1);
+  {
+    npy_intp dims[1];
+    if (!PyInt_Check(obj1))
+    {
+      const char* typestring = pytype_string(obj1);
+      PyErr_Format(PyExc_TypeError,
+        "Int dimension expected.  '%s' given.",
+        typestring);
+      SWIG_fail;
+    }
+    arg3 = (int) PyInt_AsLong(obj1);
+    dims[0] = (npy_intp) arg3;
+    array2 = PyArray_SimpleNew(1, dims, NPY_DOUBLE);
+    if (!array2) SWIG_fail;
+    arg2 = (double*) array_data(array2);
+  }
+  (arg1)->getTypeNnz(arg2,arg3);
+  resultobj = SWIG_Py_Void();
+  {
+    resultobj = SWIG_Python_AppendOutput(resultobj,array2);
+  }
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_set_profiling(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  bool arg1 ;
+  bool val1 ;
+  int ecode1 = 0 ;
+  PyObject * obj0 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:set_profiling",&obj0)) SWIG_fail;
+  ecode1 = SWIG_AsVal_bool(obj0, &val1);
+  if (!SWIG_IsOK(ecode1)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "set_profiling" "', argument " "1"" of type '" "bool""'");
+  } 
+  arg1 = static_cast< bool >(val1);
+  set_profiling(arg1);
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_new_ProblemData(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   ProblemData *result = 0 ;
@@ -19271,6 +19709,59 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_build_parameter_tensor(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  std::vector< LinOp *,std::allocator< LinOp * > > arg1 ;
+  std::map< int,int,std::less< int >,std::allocator< std::pair< int const,int > > > arg2 ;
+  PyObject * obj0 = 0 ;
+  int arg3 ;
+  int arg4 ;
+  int val3 ;
+  int ecode3 = 0 ;
+  int val4 ;
+  int ecode4 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  ProblemData result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOO:build_parameter_tensor",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  {
+    std::vector< LinOp*,std::allocator< LinOp * > > *ptr = (std::vector< LinOp*,std::allocator< LinOp * > > *)0;
+    int res = swig::asptr(obj0, &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "build_parameter_tensor" "', argument " "1"" of type '" "std::vector< LinOp *,std::allocator< LinOp * > >""'"); 
+    }
+    arg1 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  {
+    std::map< int,int,std::less< int >,std::allocator< std::pair< int const,int > > > *ptr = (std::map< int,int,std::less< int >,std::allocator< std::pair< int const,int > > > *)0;
+    int res = swig::asptr(obj1, &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "build_parameter_tensor" "', argument " "2"" of type '" "std::map< int,int,std::less< int >,std::allocator< std::pair< int const,int > > >""'"); 
+    }
+    arg2 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  ecode3 = SWIG_AsVal_int(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "build_parameter_tensor" "', argument " "3"" of type '" "int""'");
+  } 
+  arg3 = static_cast< int >(val3);
+  ecode4 = SWIG_AsVal_int(obj3, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "build_parameter_tensor" "', argument " "4"" of type '" "int""'");
+  } 
+  arg4 = static_cast< int >(val4);
+  result = build_parameter_tensor(arg1,arg2,arg3,arg4);
+  resultobj = SWIG_NewPointerObj((new ProblemData(static_cast< const ProblemData& >(result))), SWIGTYPE_p_ProblemData, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 static PyMethodDef SwigMethods[] = {
 	 { (char *)"SWIG_PyInstanceMethod_New", (PyCFunction)SWIG_PyInstanceMethod_New, METH_O, NULL},
 	 { (char *)"delete_SwigPyIterator", _wrap_delete_SwigPyIterator, METH_VARARGS, NULL},
@@ -19315,6 +19806,7 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"SPARSE_CONST_swigconstant", SPARSE_CONST_swigconstant, METH_VARARGS, NULL},
 	 { (char *)"NO_OP_swigconstant", NO_OP_swigconstant, METH_VARARGS, NULL},
 	 { (char *)"KRON_swigconstant", KRON_swigconstant, METH_VARARGS, NULL},
+	 { (char *)"PARAM_swigconstant", PARAM_swigconstant, METH_VARARGS, NULL},
 	 { (char *)"LinOp_type_set", _wrap_LinOp_type_set, METH_VARARGS, NULL},
 	 { (char *)"LinOp_type_get", _wrap_LinOp_type_get, METH_VARARGS, NULL},
 	 { (char *)"LinOp_size_set", _wrap_LinOp_size_set, METH_VARARGS, NULL},
@@ -19333,14 +19825,15 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"LinOp_slice_get", _wrap_LinOp_slice_get, METH_VARARGS, NULL},
 	 { (char *)"new_LinOp", _wrap_new_LinOp, METH_VARARGS, NULL},
 	 { (char *)"LinOp_has_constant_type", _wrap_LinOp_has_constant_type, METH_VARARGS, NULL},
+	 { (char *)"LinOp_set_linOp_data", _wrap_LinOp_set_linOp_data, METH_VARARGS, NULL},
 	 { (char *)"LinOp_set_dense_data", _wrap_LinOp_set_dense_data, METH_VARARGS, NULL},
 	 { (char *)"LinOp_set_sparse_data", _wrap_LinOp_set_sparse_data, METH_VARARGS, NULL},
 	 { (char *)"delete_LinOp", _wrap_delete_LinOp, METH_VARARGS, NULL},
 	 { (char *)"LinOp_swigregister", LinOp_swigregister, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_V_set", _wrap_ProblemData_V_set, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_V_get", _wrap_ProblemData_V_get, METH_VARARGS, NULL},
-	 { (char *)"ProblemData_I_set", _wrap_ProblemData_I_set, METH_VARARGS, NULL},
-	 { (char *)"ProblemData_I_get", _wrap_ProblemData_I_get, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_row_ptr_set", _wrap_ProblemData_row_ptr_set, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_row_ptr_get", _wrap_ProblemData_row_ptr_get, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_J_set", _wrap_ProblemData_J_set, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_J_get", _wrap_ProblemData_J_get, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_const_vec_set", _wrap_ProblemData_const_vec_set, METH_VARARGS, NULL},
@@ -19353,6 +19846,17 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"ProblemData_getI", _wrap_ProblemData_getI, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_getJ", _wrap_ProblemData_getJ, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_getConstVec", _wrap_ProblemData_getConstVec, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_getRowPtr", _wrap_ProblemData_getRowPtr, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_getParamEntries", _wrap_ProblemData_getParamEntries, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_type_calls_set", _wrap_ProblemData_type_calls_set, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_type_calls_get", _wrap_ProblemData_type_calls_get, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_type_seconds_set", _wrap_ProblemData_type_seconds_set, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_type_seconds_get", _wrap_ProblemData_type_seconds_get, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_type_nnz_set", _wrap_ProblemData_type_nnz_set, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_type_nnz_get", _wrap_ProblemData_type_nnz_get, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_getTypeCalls", _wrap_ProblemData_getTypeCalls, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_getTypeSeconds", _wrap_ProblemData_getTypeSeconds, METH_VARARGS, NULL},
+	 { (char *)"ProblemData_getTypeNnz", _wrap_ProblemData_getTypeNnz, METH_VARARGS, NULL},
 	 { (char *)"new_ProblemData", _wrap_new_ProblemData, METH_VARARGS, NULL},
 	 { (char *)"delete_ProblemData", _wrap_delete_ProblemData, METH_VARARGS, NULL},
 	 { (char *)"ProblemData_swigregister", ProblemData_swigregister, METH_VARARGS, NULL},
@@ -19559,6 +20063,8 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"delete_LinOpVector", _wrap_delete_LinOpVector, METH_VARARGS, NULL},
 	 { (char *)"LinOpVector_swigregister", LinOpVector_swigregister, METH_VARARGS, NULL},
 	 { (char *)"build_matrix", _wrap_build_matrix, METH_VARARGS, NULL},
+	 { (char *)"build_parameter_tensor", _wrap_build_parameter_tensor, METH_VARARGS, NULL},
+	 { (char *)"set_profiling", _wrap_set_profiling, METH_VARARGS, NULL},
 	 { NULL, NULL, 0, NULL }
 };
 
@@ -18,6 +18,7 @@
 #include <vector>
 #include <cassert>
 #include <iostream>
+#include <new>
 #include "Utils.hpp"
 
 /* ID for all coefficient matrices associated with linOps of CONSTANT_TYPE */
@@ -48,9 +49,13 @@ enum operatortype {
 	DENSE_CONST,
 	SPARSE_CONST,
 	NO_OP,
-	KRON
+	KRON,
+	PARAM
 };
 
+/* The number of LinOp types */
+static const int NUM_OPERATOR_TYPES = PARAM + 1;
+
 /* linOp TYPE */
 typedef operatortype OperatorType;
 
@@ -70,16 +75,27 @@ public:
 	bool sparse; // True only if linOp has sparse_data
 	Matrix sparse_data;
 
-	/* Dense Data Field */
-	Eigen::MatrixXd dense_data;
+	/* Dense Data Field: references the caller's column-major array, which
+	 * must outlive the LinOp */
+	Eigen::Map<Eigen::MatrixXd> dense_data;
 
 	/* Slice Data: stores slice data as (row_slice, col_slice)
 	 * where slice = (start, end, step_size) */
 	std::vector<std::vector<int> > slice;
 
+	/* Data that depends on parameters: the LinOp tree of the data of MUL,
+	 * RMUL or MUL_ELEM, or NULL. Only used by build_parameter_tensor. */
+	LinOp *linOp_data;
+
 	/* Constructor */
-	LinOp(){
+	LinOp() : dense_data(NULL, 0, 0) {
 		sparse = false; // sparse by default
+		linOp_data = NULL;
+	}
+
+	/* Sets LINOP_DATA to TREE, which must outlive the LinOp. */
+	void set_linOp_data(LinOp *tree) {
+		linOp_data = tree;
 	}
 
 	/* Checks if LinOp is constant type */
@@ -92,13 +108,15 @@ public:
 	 * numpy array, ROWS and COLS are the size of the ARRAY.
 	 *
 	 * MATRIX must be a contiguous array of doubles aligned in fortran
-	 * order.
+	 * order. It is referenced, not copied, so the caller must keep the
+	 * array alive while the LinOp is in use.
 	 *
 	 * NOTE: The function prototype must match the type-map in CVXCanon.i
 	 * exactly to compile and run properly.
 	 */
 	void set_dense_data(double* matrix, int rows, int cols) {
-		dense_data = Eigen::Map<Eigen::MatrixXd> (matrix, rows, cols);
+		/* Rebind the map without copying the data */
+		new (&dense_data) Eigen::Map<Eigen::MatrixXd> (matrix, rows, cols);
 	}
 
 	/* Initializes SPARSE_DATA from a sparse matrix in COO format.
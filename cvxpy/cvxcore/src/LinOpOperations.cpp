@@ -15,6 +15,7 @@
 #include "LinOp.hpp"
 #include "LinOpOperations.hpp"
 #include "Utils.hpp"
+#include <algorithm>
 #include <cassert>
 #include <map>
 #include <iostream>
@@ -28,13 +29,7 @@ std::vector<Matrix> get_sum_entries_mat(LinOp &lin);
 std::vector<Matrix> get_trace_mat(LinOp &lin);
 std::vector<Matrix> get_neg_mat(LinOp &lin);
 std::vector<Matrix> get_div_mat(LinOp &lin);
-std::vector<Matrix> get_promote_mat(LinOp &lin);
-std::vector<Matrix> get_mul_mat(LinOp &lin);
 std::vector<Matrix> get_mul_elemwise_mat(LinOp &lin);
-std::vector<Matrix> get_rmul_mat(LinOp &lin);
-std::vector<Matrix> get_index_mat(LinOp &lin);
-std::vector<Matrix> get_transpose_mat(LinOp &lin);
-std::vector<Matrix> get_reshape_mat(LinOp &lin);
 std::vector<Matrix> get_diag_vec_mat(LinOp &lin);
 std::vector<Matrix> get_diag_matrix_mat(LinOp &lin);
 std::vector<Matrix> get_upper_tri_mat(LinOp &lin);
@@ -56,17 +51,11 @@ std::vector<Matrix> get_kron_mat(LinOp &lin);
  * Returns: std::vector of sparse coefficient matrices for LIN
  */
 std::vector<Matrix> get_func_coeffs(LinOp& lin) {
+	/* INDEX, TRANSPOSE, RESHAPE and PROMOTE are applied implicitly by
+	 * get_coefficient, see get_gather_rows, as are MUL and RMUL, see
+	 * get_kron_coeffs. */
 	std::vector<Matrix> coeffs;
 	switch (lin.type) {
-	case PROMOTE:
-		coeffs = get_promote_mat(lin);
-		break;
-	case MUL:
-		coeffs = get_mul_mat(lin);
-		break;
-	case RMUL:
-		coeffs = get_rmul_mat(lin);
-		break;
 	case MUL_ELEM:
 		coeffs = get_mul_elemwise_mat(lin);
 		break;
@@ -79,21 +68,12 @@ std::vector<Matrix> get_func_coeffs(LinOp& lin) {
 	case NEG:
 		coeffs = get_neg_mat(lin);
 		break;
-	case INDEX:
-		coeffs = get_index_mat(lin);
-		break;
-	case TRANSPOSE:
-		coeffs = get_transpose_mat(lin);
-		break;
 	case SUM_ENTRIES:
 		coeffs = get_sum_entries_mat(lin);
 		break;
 	case TRACE:
 		coeffs = get_trace_mat(lin);
 		break;
-	case RESHAPE:
-		coeffs = get_reshape_mat(lin);
-		break;
 	case DIAG_VEC:
 		coeffs = get_diag_vec_mat(lin);
 		break;
@@ -516,103 +496,6 @@ std::vector<Matrix> get_diag_vec_mat(LinOp &lin) {
 	return build_vector(coeffs);
 }
 
-/**
- * Return the coefficients for TRANSPOSE: a ROWS*COLS by ROWS*COLS matrix
- * such that element ij in the vectorized matrix is mapped to ji after
- * multiplication (i.e. entry (rows * j + i, i * cols + j) = 1 and else 0)
- *
- * Parameters: linOp of type TRANSPOSE
- *
- * Returns: vector containing coefficient matrix COEFFS
- *
- */
-std::vector<Matrix> get_transpose_mat(LinOp &lin) {
-	assert(lin.type == TRANSPOSE);
-	int rows = lin.size[0];
-	int cols = lin.size[1];
-
-	Matrix coeffs(rows * cols, rows * cols);
-
-	std::vector<Triplet> tripletList;
-	tripletList.reserve(rows * cols);
-	for (int i = 0; i < rows; i++) {
-		for (int j = 0; j < cols; j++) {
-			int row_idx = rows * j + i;
-			int col_idx = i * cols + j;
-			tripletList.push_back(Triplet(row_idx, col_idx, 1.0));
-		}
-	}
-	coeffs.setFromTriplets(tripletList.begin(), tripletList.end());
-	coeffs.makeCompressed();
-	return build_vector(coeffs);
-}
-
-/**
- * Adds Triplets for slices starting from the current axis.
- *
- * Parameters: triplet list, slices, dimensions, axis, row counter.
- *
- * Returns: new row counter
- *
- */
-int add_triplets(std::vector<Triplet> &tripletList,
-                 const std::vector<std::vector<int> > &slices,
-                 const std::vector<int> &dims,
-                 int axis, int col_offset, int row_offset) {
-  if (axis < 0) {
-    tripletList.push_back(Triplet(row_offset, col_offset, 1.0));
-    return row_offset + 1;
-  }
-  int start = slices[axis][0];
-  int end = slices[axis][1];
-  int step = slices[axis][2];
-  int pointer = start;
-  while (true) {
-    if (pointer < 0 || pointer >= dims[axis]) {
-      break;
-    }
-    int new_offset = col_offset + pointer*vecprod_before(dims, axis);
-    row_offset = add_triplets(tripletList, slices, dims,
-                              axis-1, new_offset, row_offset);
-		pointer += step;
-		if ((step > 0 && pointer >= end) || (step < 0 && pointer <= end)) {
-			break;
-		}
-  }
-  return row_offset;
-}
-
-/**
- * Return the coefficients for INDEX: a N by ROWS*COLS matrix
- * where N is the number of total elements in the slice. Element i, j
- * is 1 if element j in the vectorized matrix is the i-th element of the
- * slice and 0 otherwise.
- *
- * Parameters: LinOp of type INDEX
- *
- * Returns: vector containing coefficient matrix COEFFS
- *
- */
-std::vector<Matrix> get_index_mat(LinOp &lin) {
-	assert(lin.type == INDEX);
-	Matrix coeffs (vecprod(lin.size), vecprod(lin.args[0]->size));
-
-	/* If slice is empty, return empty matrix */
-	if (coeffs.rows () == 0 ||  coeffs.cols() == 0) {
-		return build_vector(coeffs);
-	}
-
-	/* Set the index coefficients by looping over the column selection
-	 * first to remain consistent with CVXPY. */
-	std::vector<Triplet> tripletList;
-  std::vector<int> dims = lin.args[0]->size;
-  assert(lin.slice.size() == dims.size());
-  add_triplets(tripletList, lin.slice, dims, lin.slice.size() - 1, 0, 0);
-	coeffs.setFromTriplets(tripletList.begin(), tripletList.end());
-	coeffs.makeCompressed();
-	return build_vector(coeffs);
-}
-
 /**
  * Return the coefficients for MUL_ELEM: an N x N diagonal matrix where the
  * n-th element on the diagonal corresponds to the element n = j*rows + i in
@@ -642,138 +525,6 @@ std::vector<Matrix> get_mul_elemwise_mat(LinOp &lin) {
 	return build_vector(coeffs);
 }
 
-/**
- * Return the coefficients for RMUL (right multiplication): a ROWS * N
- * by COLS * N matrix given by the kronecker product between the
- * transpose of the constant matrix CONSTANT and a N x N identity matrix.
- *
- * Parameters: linOp of type RMUL
- *
- * Returns: vector containing the corresponding coefficient matrix COEFFS
- *
- */
-std::vector<Matrix> get_rmul_mat(LinOp &lin) {
-	assert(lin.type == RMUL);
-  // Scalar multiplication handled in mul_elemwise.
-  assert(lin.args[0]->size.size() > 0);
-	Matrix constant = get_constant_data(lin, false);
-  // Interpret as row or column vector as needed.
-  int arg_cols;
-  int result_rows;
-  if (lin.args[0]->size.size() == 1) {
-    arg_cols = lin.args[0]->size[0];
-    result_rows = 1;
-  } else {
-    arg_cols = lin.args[0]->size[1];
-    result_rows = lin.args[0]->size[0];
-  }
-  if (lin.data_ndim == 1 && arg_cols != constant.rows()) {
-    constant = constant.transpose();
-  }
-	int rows = constant.rows();
-	int cols = constant.cols();
-	int n = (lin.size.size() > 0) ? result_rows : 1;
-
-	Matrix coeffs(cols * n, rows * n);
-	std::vector<Triplet> tripletList;
-	tripletList.reserve(n * constant.nonZeros());
-	for ( int k = 0; k < constant.outerSize(); ++k ) {
-		for ( Matrix::InnerIterator it(constant, k); it; ++it ) {
-			double val = it.value();
-
-			// each element of CONSTANT occupies an N x N block in the matrix
-			int row_start = it.col() * n;
-			int col_start = it.row() * n;
-			for (int i = 0; i < n; i++) {
-				int row_idx = row_start + i;
-				int col_idx = col_start + i;
-				tripletList.push_back(Triplet(row_idx, col_idx, val));
-			}
-		}
-	}
-	coeffs.setFromTriplets(tripletList.begin(), tripletList.end());
-	coeffs.makeCompressed();
-	return build_vector(coeffs);
-}
-
-/**
- * Return the coefficients for MUL (left multiplication): a NUM_BLOCKS * ROWS
- * by NUM_BLOCKS * COLS block diagonal matrix where each diagonal block is the
- * constant data BLOCK.
- *
- * Parameters: linOp with type MUL
- *
- * Returns: vector containing coefficient matrix COEFFS
- *
- */
-std::vector<Matrix> get_mul_mat(LinOp &lin) {
-	assert(lin.type == MUL);
-  // Scalar multiplication handled in mul_elemwise.
-  assert(lin.args[0]->size.size() > 0);
-	Matrix block = get_constant_data(lin, false);
-  // Interpret as row or column vector as needed.
-  if (lin.data_ndim == 1 && lin.args[0]->size[0] != block.cols()) {
-    block = block.transpose();
-  }
-	int block_rows = block.rows();
-	int block_cols = block.cols();
-
-  int num_blocks = (lin.args[0]->size.size() <= 1) ? 1 : lin.args[0]->size[1];
-	Matrix coeffs (num_blocks * block_rows, num_blocks * block_cols);
-
-	std::vector<Triplet> tripletList;
-	tripletList.reserve(num_blocks * block.nonZeros());
-	for (int curr_block = 0; curr_block < num_blocks; curr_block++) {
-		int start_i = curr_block * block_rows;
-		int start_j = curr_block * block_cols;
-		for ( int k = 0; k < block.outerSize(); ++k ) {
-			for ( Matrix::InnerIterator it(block, k); it; ++it ) {
-				tripletList.push_back(Triplet(start_i + it.row(), start_j + it.col(),
-				                              it.value()));
-			}
-		}
-	}
-	coeffs.setFromTriplets(tripletList.begin(), tripletList.end());
-	coeffs.makeCompressed();
-	return build_vector(coeffs);
-}
-
-/**
- * Return the coefficients for PROMOTE: a column vector of size N with all
- * entries 1. Note this is treated as sparse for consistency of later
- * multiplications with sparse matrices.
- *
- * Parameters: linOP with type PROMOTE
- *
- * Returns: vector containing coefficient matrix ONES.
- *
- */
-std::vector<Matrix> get_promote_mat(LinOp &lin) {
-	assert(lin.type == PROMOTE);
-	int num_entries = vecprod(lin.size);
-	Matrix ones = sparse_ones(num_entries, 1);
-	ones.makeCompressed();
-	return build_vector(ones);
-}
-
-/**
- * Return the coefficients for RESHAPE: a 1x1 matrix [1]. In Eigen, this
- * requires special case handling to multiply against an arbitrary m x n
- * matrix.
- *
- * Parameters: LinOp with type RESHAPE
- *
- * Returns: vector containing the coefficient matrix ONE.
- *
- */
-std::vector<Matrix> get_reshape_mat(LinOp &lin) {
-	assert(lin.type == RESHAPE);
-	Matrix one(1, 1);
-	one.insert(0, 0) = 1;
-	one.makeCompressed();
-	return build_vector(one);
-}
-
 /**
  * Return the coefficients for DIV: a diagonal matrix where each diagonal
  * entry is 1 / DIVISOR.
@@ -880,16 +631,16 @@ std::vector<Matrix> get_sum_coefficients(LinOp &lin) {
  * Returns: Map from VARIABLE_ID to coefficient matrix COEFFS for LIN
  *
  */
-std::map<int, Matrix> get_variable_coeffs(LinOp &lin) {
+CoeffMap get_variable_coeffs(LinOp &lin) {
 	assert(lin.type == VARIABLE);
-	std::map<int, Matrix> id_to_coeffs;
-	int id = get_id_data(lin);
+	CoeffMap id_to_coeffs(1);
+	id_to_coeffs[0].first = get_id_data(lin);
 
 	// create a giant identity matrix
 	int n = vecprod(lin.size);
 	Matrix coeffs = sparse_eye(n);
 	coeffs.makeCompressed();
-	id_to_coeffs[id] = coeffs;
+	id_to_coeffs[0].second.swap(coeffs);
 	return id_to_coeffs;
 }
 
@@ -904,14 +655,626 @@ std::map<int, Matrix> get_variable_coeffs(LinOp &lin) {
  *
  * Returns: map from CONSTANT_ID to the coefficient matrix COEFFS for LIN.
  */
-std::map<int, Matrix> get_const_coeffs(LinOp &lin) {
+CoeffMap get_const_coeffs(LinOp &lin) {
 	assert(lin.has_constant_type());
-	std::map<int, Matrix> id_to_coeffs;
-	int id = CONSTANT_ID;
+	CoeffMap id_to_coeffs(1);
+	id_to_coeffs[0].first = CONSTANT_ID;
 
 	// get coeffs as a column vector
 	Matrix coeffs = get_constant_data(lin, true);
 	coeffs.makeCompressed();
-	id_to_coeffs[id] = coeffs;
+	id_to_coeffs[0].second.swap(coeffs);
+	return id_to_coeffs;
+}
+
+/**************************
+ * IMPLICIT COEFFICIENTS
+ **************************/
+
+/**
+ * Appends the indices of the entries selected by SLICES, starting from the
+ * current AXIS, to ROWS. The indices are into the column-major vectorization
+ * of an array of shape DIMS, and are ordered by the first axis first to
+ * remain consistent with CVXPY.
+ */
+void add_slice_rows(std::vector<int> &rows,
+                    const std::vector<std::vector<int> > &slices,
+                    const std::vector<int> &dims, int axis, int offset) {
+	if (axis < 0) {
+		rows.push_back(offset);
+		return;
+	}
+	int start = slices[axis][0];
+	int end = slices[axis][1];
+	int step = slices[axis][2];
+	int pointer = start;
+	while (true) {
+		if (pointer < 0 || pointer >= dims[axis]) {
+			break;
+		}
+		add_slice_rows(rows, slices, dims, axis - 1,
+		               offset + pointer * vecprod_before(dims, axis));
+		pointer += step;
+		if ((step > 0 && pointer >= end) || (step < 0 && pointer <= end)) {
+			break;
+		}
+	}
+}
+
+/**
+ * Return the rows gathered by INDEX, TRANSPOSE and PROMOTE. These linOps
+ * only select, permute or broadcast the entries of their argument, so rather
+ * than multiplying by a 0-1 coefficient matrix, row i of their coefficients
+ * is row ROWS[i] of the coefficients of their argument.
+ *
+ * Parameters: LinOp of type INDEX, TRANSPOSE or PROMOTE
+ *
+ * Returns: vector ROWS of length equal to the size of LIN
+ */
+std::vector<int> get_gather_rows(LinOp &lin) {
+	std::vector<int> rows;
+	rows.reserve(vecprod(lin.size));
+	switch (lin.type) {
+	case INDEX: {
+		if (vecprod(lin.size) == 0) {
+			break;
+		}
+		std::vector<int> dims = lin.args[0]->size;
+		assert(lin.slice.size() == dims.size());
+		add_slice_rows(rows, lin.slice, dims, lin.slice.size() - 1, 0);
+		break;
+	}
+	case TRANSPOSE: {
+		/* Entry (i, j) of LIN is entry (j, i) of its argument */
+		int n_rows = lin.size[0];
+		int n_cols = lin.size[1];
+		for (int j = 0; j < n_cols; j++) {
+			for (int i = 0; i < n_rows; i++) {
+				rows.push_back(i * n_cols + j);
+			}
+		}
+		break;
+	}
+	case PROMOTE:
+		rows.assign(vecprod(lin.size), 0);
+		break;
+	default:
+		std::cerr << "Error: linOp type does not gather rows." << std::endl;
+		exit(-1);
+	}
+	return rows;
+}
+
+/**
+ * Returns the N_OUT by N matrix whose row i is row ROWS[i] of the N by N
+ * identity, where N_OUT is the length of ROWS.
+ */
+Matrix selection_matrix(const std::vector<int> &rows, int n) {
+	int n_out = rows.size();
+	Matrix out(n_out, n);
+	out.resizeNonZeros(n_out);
+	int *outer = out.outerIndexPtr();
+	int *inner = out.innerIndexPtr();
+	double *values = out.valuePtr();
+	/* Column j has a one in each row i with ROWS[i] == j */
+	std::fill(outer, outer + n + 1, 0);
+	for (int i = 0; i < n_out; i++) {
+		outer[rows[i] + 1]++;
+	}
+	for (int j = 0; j < n; j++) {
+		outer[j + 1] += outer[j];
+	}
+	std::vector<int> next(outer, outer + n);
+	for (int i = 0; i < n_out; i++) {
+		inner[next[rows[i]]++] = i;
+		values[i] = 1.0;
+	}
+	return out;
+}
+
+/**
+ * Return a map from the variable ID to the coefficients of the entries ROWS
+ * of the VARIABLE linOp LIN, i.e. the identity restricted to ROWS.
+ *
+ * Parameters: VARIABLE Type LinOp LIN, vector ROWS of indices into LIN
+ *
+ * Returns: Map from VARIABLE_ID to coefficient matrix COEFFS
+ */
+CoeffMap get_variable_coeffs(LinOp &lin, const std::vector<int> &rows) {
+	assert(lin.type == VARIABLE);
+	CoeffMap id_to_coeffs(1);
+	id_to_coeffs[0].first = get_id_data(lin);
+	Matrix coeffs = selection_matrix(rows, vecprod(lin.size));
+	id_to_coeffs[0].second.swap(coeffs);
 	return id_to_coeffs;
 }
+
+/**
+ * Returns the matrix whose row i is row ROWS[i] of MAT, without forming the
+ * selection matrix: the column-major storage of the result is written
+ * directly from an inverted index of ROWS.
+ */
+Matrix gather_rows(const Matrix &mat, const std::vector<int> &rows) {
+	int n = rows.size();
+	int src_rows = mat.rows();
+	int cols = mat.cols();
+
+	/* TARGETS[STARTS[r]:STARTS[r + 1]] are the rows of the result that copy
+	 * row r of MAT, in increasing order. */
+	std::vector<int> starts(src_rows + 1, 0);
+	for (int i = 0; i < n; i++) {
+		starts[rows[i] + 1]++;
+	}
+	for (int r = 0; r < src_rows; r++) {
+		starts[r + 1] += starts[r];
+	}
+	std::vector<int> targets(n);
+	std::vector<int> next(starts.begin(), starts.end() - 1);
+	/* If ROWS is nondecreasing, so is each column of the result */
+	bool sorted = true;
+	for (int i = 0; i < n; i++) {
+		targets[next[rows[i]]++] = i;
+		if (i > 0 && rows[i] < rows[i - 1]) {
+			sorted = false;
+		}
+	}
+
+	int nnz = 0;
+	for (int k = 0; k < mat.outerSize(); ++k) {
+		for (Matrix::InnerIterator it(mat, k); it; ++it) {
+			nnz += starts[it.row() + 1] - starts[it.row()];
+		}
+	}
+
+	Matrix out(n, cols);
+	out.resizeNonZeros(nnz);
+	int *outer = out.outerIndexPtr();
+	int *inner = out.innerIndexPtr();
+	double *values = out.valuePtr();
+	std::vector<std::pair<int, double> > column;
+	int pos = 0;
+	for (int k = 0; k < cols; ++k) {
+		outer[k] = pos;
+		for (Matrix::InnerIterator it(mat, k); it; ++it) {
+			for (int t = starts[it.row()]; t < starts[it.row() + 1]; t++) {
+				inner[pos] = targets[t];
+				values[pos] = it.value();
+				pos++;
+			}
+		}
+		if (!sorted) {
+			column.clear();
+			for (int p = outer[k]; p < pos; p++) {
+				column.push_back(std::make_pair(inner[p], values[p]));
+			}
+			std::sort(column.begin(), column.end());
+			for (unsigned p = 0; p < column.size(); p++) {
+				inner[outer[k] + p] = column[p].first;
+				values[outer[k] + p] = column[p].second;
+			}
+		}
+	}
+	outer[cols] = pos;
+	return out;
+}
+
+/**
+ * Returns whether the constant data of MUL or RMUL, of shape ROWS by COLS,
+ * is transposed in the constant factor of their Kronecker coefficients, and
+ * sets N to the order of the identity factor.
+ *
+ * The coefficients of MUL (left multiplication by the constant A) are
+ * kron(I_N, A), where N is the number of columns of the argument. Those of
+ * RMUL (right multiplication by the constant B) are kron(B^T, I_N), where N
+ * is the number of rows of the argument. Neither is formed: see
+ * kron_product.
+ */
+bool get_kron_layout(LinOp &lin, int rows, int cols, int &n) {
+	// Scalar multiplication handled in mul_elemwise.
+	assert(lin.args[0]->size.size() > 0);
+	if (lin.type == MUL) {
+		n = (lin.args[0]->size.size() <= 1) ? 1 : lin.args[0]->size[1];
+		// Interpret as row or column vector as needed.
+		return lin.data_ndim == 1 && lin.args[0]->size[0] != cols;
+	}
+	assert(lin.type == RMUL);
+	// Interpret as row or column vector as needed.
+	int arg_cols;
+	int result_rows;
+	if (lin.args[0]->size.size() == 1) {
+		arg_cols = lin.args[0]->size[0];
+		result_rows = 1;
+	} else {
+		arg_cols = lin.args[0]->size[1];
+		result_rows = lin.args[0]->size[0];
+	}
+	n = (lin.size.size() > 0) ? result_rows : 1;
+	return !(lin.data_ndim == 1 && arg_cols != rows);
+}
+
+/**
+ * Return the constant factor of the Kronecker coefficients of MUL or RMUL
+ * with sparse data.
+ */
+Matrix get_kron_block(LinOp &lin, int &n) {
+	Matrix block = get_constant_data(lin, false);
+	if (get_kron_layout(lin, block.rows(), block.cols(), n)) {
+		Matrix block_t = block.transpose();
+		return block_t;
+	}
+	return block;
+}
+
+/**
+ * Return the constant factor of the Kronecker coefficients of MUL or RMUL
+ * with dense data, as a view of the data, transposed through its strides
+ * if needed.
+ */
+DenseBlock get_dense_kron_block(LinOp &lin, int &n) {
+	int rows = lin.dense_data.rows();
+	int cols = lin.dense_data.cols();
+	const double *data = lin.dense_data.data();
+	if (get_kron_layout(lin, rows, cols, n)) {
+		return DenseBlock(data, cols, rows, Eigen::Stride<Eigen::Dynamic,
+		                  Eigen::Dynamic>(1, rows));
+	}
+	return DenseBlock(data, rows, cols, Eigen::Stride<Eigen::Dynamic,
+	                  Eigen::Dynamic>(rows, 1));
+}
+
+/**
+ * Iterates over the nonzeros of a column of a DenseBlock, with the
+ * interface of Matrix::InnerIterator.
+ */
+class DenseColumnIterator {
+public:
+	DenseColumnIterator(const DenseBlock &block, int col)
+		: block_(block), col_(col), row_(-1) {
+		advance();
+	}
+	operator bool() const { return row_ < block_.rows(); }
+	DenseColumnIterator &operator++() {
+		advance();
+		return *this;
+	}
+	int row() const { return row_; }
+	double value() const { return block_(row_, col_); }
+private:
+	void advance() {
+		do {
+			row_++;
+		} while (row_ < block_.rows() && block_(row_, col_) == 0);
+	}
+	const DenseBlock &block_;
+	int col_;
+	int row_;
+};
+
+template <typename Block> struct ColumnIterator;
+template <> struct ColumnIterator<Matrix> {
+	typedef Matrix::InnerIterator type;
+};
+template <> struct ColumnIterator<DenseBlock> {
+	typedef DenseColumnIterator type;
+};
+
+/**
+ * Returns the number of nonzeros in each column of BLOCK.
+ */
+template <typename Block>
+std::vector<int> column_nonzeros(const Block &block) {
+	std::vector<int> nonzeros(block.cols(), 0);
+	for (int j = 0; j < block.cols(); j++) {
+		typedef typename ColumnIterator<Block>::type iterator;
+		for (iterator it(block, j); it; ++it) {
+			nonzeros[j]++;
+		}
+	}
+	return nonzeros;
+}
+
+/**
+ * Returns the product of a Kronecker coefficient matrix and MAT, without
+ * forming the Kronecker product: kron(I_N, BLOCK) * MAT if IDENTITY_FIRST,
+ * and kron(BLOCK, I_N) * MAT otherwise.
+ *
+ * Each nonzero of MAT scales a column of BLOCK, whose rows are spread over
+ * the result as the Kronecker product prescribes. Columns of MAT with a
+ * single nonzero, such as those of the coefficients of a variable, are
+ * copied in order; the others are accumulated and sorted.
+ */
+template <typename Block>
+Matrix kron_scatter(const Block &block, int n, bool identity_first,
+                    const Matrix &mat) {
+	typedef typename ColumnIterator<Block>::type iterator;
+	int block_rows = block.rows();
+	int block_cols = block.cols();
+	int cols = mat.cols();
+	assert(mat.rows() == n * block_cols);
+	std::vector<int> block_nonzeros = column_nonzeros(block);
+
+	/* The nonzeros of the result are at most those of the scaled columns */
+	long nnz = 0;
+	for (int k = 0; k < mat.outerSize(); ++k) {
+		for (Matrix::InnerIterator it(mat, k); it; ++it) {
+			int block_col = identity_first ? it.row() % block_cols
+			                               : it.row() / n;
+			nnz += block_nonzeros[block_col];
+		}
+	}
+
+	Matrix out(block_rows * n, cols);
+	out.resizeNonZeros(nnz);
+	int *outer = out.outerIndexPtr();
+	int *inner = out.innerIndexPtr();
+	double *values = out.valuePtr();
+	/* Accumulator for the columns with several nonzeros */
+	std::vector<double> dense;
+	std::vector<int> marker;
+	std::vector<int> touched;
+	int pos = 0;
+	for (int k = 0; k < cols; ++k) {
+		outer[k] = pos;
+		bool single = true;
+		int entries = 0;
+		for (Matrix::InnerIterator it(mat, k); it; ++it) {
+			if (++entries > 1) {
+				single = false;
+				break;
+			}
+		}
+		if (!single && dense.empty()) {
+			dense.assign(block_rows * n, 0.0);
+			marker.assign(block_rows * n, -1);
+		}
+		for (Matrix::InnerIterator it(mat, k); it; ++it) {
+			int block_col, shift, stride;
+			if (identity_first) {
+				block_col = it.row() % block_cols;
+				shift = (it.row() / block_cols) * block_rows;
+				stride = 1;
+			} else {
+				block_col = it.row() / n;
+				shift = it.row() % n;
+				stride = n;
+			}
+			for (iterator b_it(block, block_col); b_it; ++b_it) {
+				int row = shift + stride * b_it.row();
+				double value = it.value() * b_it.value();
+				if (single) {
+					inner[pos] = row;
+					values[pos] = value;
+					pos++;
+				} else {
+					if (marker[row] != k) {
+						marker[row] = k;
+						touched.push_back(row);
+						dense[row] = 0.0;
+					}
+					dense[row] += value;
+				}
+			}
+		}
+		if (!single) {
+			std::sort(touched.begin(), touched.end());
+			for (unsigned t = 0; t < touched.size(); t++) {
+				inner[pos] = touched[t];
+				values[pos] = dense[touched[t]];
+				pos++;
+			}
+			touched.clear();
+		}
+	}
+	outer[cols] = pos;
+	out.resizeNonZeros(pos);
+	return out;
+}
+
+/**
+ * Returns the ROWS by COLS matrix with the entries TRIPLETS, summing
+ * duplicates, and releases TRIPLETS. Unlike setFromTriplets, the cost does
+ * not depend on ROWS.
+ */
+Matrix compress_triplets(int rows, int cols, std::vector<Triplet> &triplets) {
+	/* Counting sort by column, then sort each column by row */
+	std::vector<int> starts(cols + 1, 0);
+	for (unsigned t = 0; t < triplets.size(); t++) {
+		starts[triplets[t].col() + 1]++;
+	}
+	for (int j = 0; j < cols; j++) {
+		starts[j + 1] += starts[j];
+	}
+	std::vector<std::pair<int, double> > entries(triplets.size());
+	std::vector<int> next(starts.begin(), starts.end() - 1);
+	for (unsigned t = 0; t < triplets.size(); t++) {
+		entries[next[triplets[t].col()]++] =
+			std::make_pair(triplets[t].row(), triplets[t].value());
+	}
+	std::vector<Triplet>().swap(triplets);
+
+	Matrix out(rows, cols);
+	out.resizeNonZeros(entries.size());
+	int *outer = out.outerIndexPtr();
+	int *inner = out.innerIndexPtr();
+	double *values = out.valuePtr();
+	int pos = 0;
+	for (int j = 0; j < cols; j++) {
+		outer[j] = pos;
+		std::sort(entries.begin() + starts[j], entries.begin() + starts[j + 1]);
+		for (int k = starts[j]; k < starts[j + 1]; k++) {
+			if (pos > outer[j] && inner[pos - 1] == entries[k].first) {
+				values[pos - 1] += entries[k].second;
+			} else {
+				inner[pos] = entries[k].first;
+				values[pos] = entries[k].second;
+				pos++;
+			}
+		}
+	}
+	outer[cols] = pos;
+	out.resizeNonZeros(pos);
+	return out;
+}
+
+/**
+ * Returns A * B, accumulating each column of the product by sorting rather
+ * than in a dense vector, so that the cost does not depend on the number of
+ * rows of A, which is large for the coefficients of parameters (see
+ * build_parameter_tensor).
+ */
+Matrix sparse_product(const Matrix &a, const Matrix &b) {
+	std::vector<Triplet> triplets;
+	for (int k = 0; k < b.outerSize(); ++k) {
+		for (Matrix::InnerIterator it(b, k); it; ++it) {
+			for (Matrix::InnerIterator a_it(a, it.row()); a_it; ++a_it) {
+				triplets.push_back(Triplet(a_it.row(), k,
+				                           a_it.value() * it.value()));
+			}
+		}
+	}
+	return compress_triplets(a.rows(), b.cols(), triplets);
+}
+
+Matrix kron_product(const Matrix &block, int n, bool identity_first,
+                    const Matrix &mat) {
+	return kron_scatter(block, n, identity_first, mat);
+}
+
+/**
+ * The product above for a dense BLOCK. If MAT is mostly dense too, the
+ * product is computed densely with a single matrix-matrix product, which
+ * is only made sparse once computed.
+ */
+Matrix kron_product(const DenseBlock &block, int n, bool identity_first,
+                    const Matrix &mat) {
+	long dense_size = (long) mat.rows() * mat.cols();
+	if ((identity_first || n == 1) && 4L * mat.nonZeros() >= dense_size) {
+		/* Column k of kron(I_N, BLOCK) * MAT is BLOCK times column k of MAT
+		 * reshaped to BLOCK.cols() by N, so all columns are computed by a
+		 * single product with MAT reshaped to BLOCK.cols() by N * COLS. */
+		Eigen::MatrixXd dense_mat(mat);
+		Eigen::Map<Eigen::MatrixXd> stacked(dense_mat.data(), block.cols(),
+		                                    n * mat.cols());
+		Eigen::MatrixXd product = block * stacked;
+		Eigen::Map<Eigen::MatrixXd> out(product.data(), block.rows() * n,
+		                                mat.cols());
+		Matrix coeffs = out.sparseView();
+		return coeffs;
+	}
+	return kron_scatter(block, n, identity_first, mat);
+}
+
+/**
+ * Return the coefficients of MUL or RMUL applied to the coefficients
+ * RH_COEFFS of their argument. Dense data is used in place.
+ *
+ * Parameters: linOp LIN of type MUL or RMUL, map RH_COEFFS from variable ID
+ *             to the coefficients of the argument of LIN
+ *
+ * Returns: map from variable ID to the coefficients of LIN
+ */
+CoeffMap get_kron_coeffs(LinOp &lin, CoeffMap &rh_coeffs) {
+	CoeffMap coeffs(rh_coeffs.size());
+	bool identity_first = lin.type == MUL;
+	int n;
+	if (lin.sparse) {
+		Matrix block = get_kron_block(lin, n);
+		for (unsigned i = 0; i < rh_coeffs.size(); i++) {
+			coeffs[i].first = rh_coeffs[i].first;
+			Matrix product = kron_product(block, n, identity_first,
+			                              rh_coeffs[i].second);
+			coeffs[i].second.swap(product);
+		}
+	} else {
+		DenseBlock block = get_dense_kron_block(lin, n);
+		for (unsigned i = 0; i < rh_coeffs.size(); i++) {
+			coeffs[i].first = rh_coeffs[i].first;
+			Matrix product = kron_product(block, n, identity_first,
+			                              rh_coeffs[i].second);
+			coeffs[i].second.swap(product);
+		}
+	}
+	return coeffs;
+}
+
+/**
+ * Returns the number of nonzeros of the data of LIN, counting dense data as
+ * nonzero.
+ */
+double get_data_nnz(LinOp &lin) {
+	if (lin.sparse) {
+		return lin.sparse_data.nonZeros();
+	}
+	return double(lin.dense_data.rows()) * lin.dense_data.cols();
+}
+
+/**
+ * Returns the largest number of nonzeros in a row or a column of the data
+ * of LIN, which bounds the number of nonzeros of a column of the Kronecker
+ * coefficients of MUL or RMUL.
+ */
+double get_max_line_nnz(LinOp &lin) {
+	if (!lin.sparse) {
+		return std::max(lin.dense_data.rows(), lin.dense_data.cols());
+	}
+	Matrix &data = lin.sparse_data;
+	std::vector<int> row_nnz(data.rows(), 0);
+	int max_nnz = 0;
+	for (int k = 0; k < data.outerSize(); ++k) {
+		int col_nnz = 0;
+		for (Matrix::InnerIterator it(data, k); it; ++it) {
+			row_nnz[it.row()]++;
+			col_nnz++;
+		}
+		max_nnz = std::max(max_nnz, col_nnz);
+	}
+	for (unsigned i = 0; i < row_nnz.size(); i++) {
+		max_nnz = std::max(max_nnz, row_nnz[i]);
+	}
+	return max_nnz;
+}
+
+/**
+ * Returns an upper bound on the number of nonzeros of the coefficients of
+ * the variables in LIN, computed from the shapes and the data of the tree
+ * alone, i.e. without forming any coefficients.
+ *
+ * Parameters: linOp LIN, double COLS set to the number of columns of the
+ *             coefficients of LIN, counting a variable once per occurrence
+ *
+ * Returns: the bound, at most that of dense coefficients
+ */
+double get_nnz_bound(LinOp &lin, double &cols) {
+	cols = 0;
+	if (lin.type == VARIABLE) {
+		cols = vecprod(lin.size);
+		return cols;
+	}
+	if (lin.has_constant_type() || lin.type == NO_OP) {
+		return 0;
+	}
+	double bound = 0;
+	for (unsigned i = 0; i < lin.args.size(); i++) {
+		double arg_cols;
+		bound += get_nnz_bound(*lin.args[i], arg_cols);
+		cols += arg_cols;
+	}
+	switch (lin.type) {
+	case PROMOTE:
+		bound *= vecprod(lin.size);
+		break;
+	case MUL:
+	case RMUL:
+		bound *= get_max_line_nnz(lin);
+		break;
+	case CONV:
+	case KRON:
+		bound *= get_data_nnz(lin);
+		break;
+	default:
+		/* Each nonzero of the coefficients of the arguments is scaled, moved
+		 * or summed into at most one nonzero */
+		break;
+	}
+	return std::min(bound, vecprod(lin.size) * cols);
+}
@@ -20,8 +20,17 @@
 #include "Utils.hpp"
 #include "LinOp.hpp"
 
-std::map<int, Matrix> get_variable_coeffs(LinOp &lin);
-std::map<int, Matrix> get_const_coeffs(LinOp &lin);
+CoeffMap get_variable_coeffs(LinOp &lin);
+CoeffMap get_variable_coeffs(LinOp &lin, const std::vector<int> &rows);
+CoeffMap get_const_coeffs(LinOp &lin);
 std::vector<Matrix> get_func_coeffs(LinOp& lin);
+std::vector<int> get_gather_rows(LinOp &lin);
+Matrix gather_rows(const Matrix &mat, const std::vector<int> &rows);
+CoeffMap get_kron_coeffs(LinOp &lin, CoeffMap &rh_coeffs);
+Matrix sparse_eye(int n);
+Matrix selection_matrix(const std::vector<int> &rows, int n);
+Matrix compress_triplets(int rows, int cols, std::vector<Triplet> &triplets);
+Matrix sparse_product(const Matrix &a, const Matrix &b);
+double get_nnz_bound(LinOp &lin, double &cols);
 
 #endif
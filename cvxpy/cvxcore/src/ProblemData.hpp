@@ -22,11 +22,16 @@
  * trees. */
 class ProblemData {
 public:
-	/* COO sparse matrix representation. V stores the data, I the row indices
-	 * and J the column indices. */
+	/* CSR sparse matrix representation. V stores the data and J the column
+	 * indices, and the entries of row i are those from ROW_PTR[i] to
+	 * ROW_PTR[i + 1], in increasing order of their columns. */
 	std::vector<double> V;
-	std::vector<int> I;
 	std::vector<int> J;
+	std::vector<int> row_ptr;
+
+	/* The entry of the parameters that each entry of V multiplies, set by
+	 * build_parameter_tensor only. */
+	std::vector<int> param_entries;
 
 	/* Dense matrix representation of the constant vector */
 	std::vector<double> const_vec;
@@ -37,6 +42,14 @@ public:
 	/* Map of constant linOp's to row in the problemData matrix  */
 	std::map<int, int> const_to_row;
 
+	/* Statistics of computing the coefficients of the LinOps, indexed by
+	 * LinOp type: the number of LinOps, the time spent on them excluding
+	 * their arguments, in seconds, and the number of nonzeros of their
+	 * coefficients. Empty unless profiling is enabled (see set_profiling). */
+	std::vector<double> type_calls;
+	std::vector<double> type_seconds;
+	std::vector<double> type_nnz;
+
 	/*******************************************
 	 * The functions below return problemData vectors as contiguous 1d
 	 * numpy arrays.
@@ -64,11 +77,14 @@ public:
 	}
 
 	/**
-	 * Returns the row index vector I as a contiguous 1D numpy array.
+	 * Returns the row index of each entry of V, expanded from ROW_PTR, as a
+	 * contiguous 1D numpy array.
 	 */
 	void getI(double* values, int num_values) {
-		for (int i = 0; i < num_values; i++) {
-			values[i] = I[i];
+		for (unsigned row = 0; row + 1 < row_ptr.size(); row++) {
+			for (int i = row_ptr[row]; i < row_ptr[row + 1] && i < num_values; i++) {
+				values[i] = row;
+			}
 		}
 	}
 
@@ -81,6 +97,24 @@ public:
 		}
 	}
 
+	/**
+	 * Returns ROW_PTR as a contiguous 1D numpy array.
+	 */
+	void getRowPtr(double* values, int num_values) {
+		for (int i = 0; i < num_values; i++) {
+			values[i] = row_ptr[i];
+		}
+	}
+
+	/**
+	 * Returns PARAM_ENTRIES as a contiguous 1D numpy array.
+	 */
+	void getParamEntries(double* values, int num_values) {
+		for (int i = 0; i < num_values; i++) {
+			values[i] = param_entries[i];
+		}
+	}
+
 	/**
 	 * Returns the CONST_VEC as a contiguous 1D numpy array.
 	 */
@@ -89,6 +123,33 @@ public:
 			values[i] = const_vec[i];
 		}
 	}
+
+	/**
+	 * Returns TYPE_CALLS as a contiguous 1D numpy array.
+	 */
+	void getTypeCalls(double* values, int num_values) {
+		for (int i = 0; i < num_values; i++) {
+			values[i] = type_calls[i];
+		}
+	}
+
+	/**
+	 * Returns TYPE_SECONDS as a contiguous 1D numpy array.
+	 */
+	void getTypeSeconds(double* values, int num_values) {
+		for (int i = 0; i < num_values; i++) {
+			values[i] = type_seconds[i];
+		}
+	}
+
+	/**
+	 * Returns TYPE_NNZ as a contiguous 1D numpy array.
+	 */
+	void getTypeNnz(double* values, int num_values) {
+		for (int i = 0; i < num_values; i++) {
+			values[i] = type_nnz[i];
+		}
+	}
 };
 
 #endif
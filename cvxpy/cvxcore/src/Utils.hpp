@@ -17,6 +17,8 @@
 #ifndef UTILS_H
 #define UTILS_H
 
+#include <utility>
+#include <vector>
 #include "../include/Eigen/Sparse"
 #include "../include/Eigen/Core"
 
@@ -24,8 +26,15 @@
 
 typedef Eigen::Matrix<int, Eigen::Dynamic, 1> Vector;
 typedef Eigen::SparseMatrix<double> Matrix;
-typedef std::map<int, Matrix> CoeffMap;
+/* The coefficients of a LinOp: pairs of a variable ID (or CONSTANT_ID) and
+ * its coefficient matrix, sorted by ID. A sorted vector rather than a map,
+ * so that the coefficients of a subtree take a single allocation and are
+ * merged in a single pass. */
+typedef std::vector<std::pair<int, Matrix> > CoeffMap;
 typedef Eigen::Triplet<double> Triplet;
+/* A view of dense column-major data, possibly transposed through strides */
+typedef Eigen::Map<const Eigen::MatrixXd, 0,
+                   Eigen::Stride<Eigen::Dynamic, Eigen::Dynamic> > DenseBlock;
 
 int vecprod(const std::vector<int> &vec);
 int vecprod_before(const std::vector<int> &vec, int end);
@@ -13,87 +13,449 @@
 //   limitations under the License.
 
 #include "cvxcore.hpp"
+#include <algorithm>
+#include <cassert>
+#include <chrono>
 #include <iostream>
 #include <map>
+#include <new>
+#include <numeric>
 #include "LinOp.hpp"
 #include "LinOpOperations.hpp"
 #include "ProblemData.hpp"
 
-void mul_by_const(Matrix &coeff_mat,
-        std::map<int, Matrix > &rh_coeffs,
-        std::map<int, Matrix > &result){
-
-	typedef std::map<int, Matrix >::iterator it_type;
-	for (it_type it = rh_coeffs.begin(); it != rh_coeffs.end(); ++it){
-		int id = it->first;
-		Matrix rh = it->second;
+/* Multiplies RH_COEFFS by COEFF_MAT into RESULT, which is empty.
+	 RH_COEFFS may be consumed. */
+void mul_by_const(Matrix &coeff_mat, CoeffMap &rh_coeffs, CoeffMap &result){
+	result.resize(rh_coeffs.size());
+	for (unsigned i = 0; i < rh_coeffs.size(); i++){
+		result[i].first = rh_coeffs[i].first;
+		Matrix &rh = rh_coeffs[i].second;
 		/* Convert scalars (1x1 matrices) to primitive types */
 		if (coeff_mat.rows() == 1 && coeff_mat.cols() == 1){
 			double scalar = coeff_mat.coeffRef(0, 0);
-			if (result.count(id) == 0)
-				result[id] = scalar * rh;
-			else
-				result[id] += scalar * rh;
+			/* Scale the argument's coefficients in place instead of copying */
+			if (scalar != 1) {
+				rh *= scalar;
+			}
+			result[i].second.swap(rh);
 		} else if (rh.rows() == 1 && rh.cols() == 1) {
 			double scalar = rh.coeffRef(0, 0);
-			if(result.count(id) == 0)
-				result[id] = coeff_mat * scalar;
-			else
-				result[id] = coeff_mat * scalar;
+			result[i].second = coeff_mat * scalar;
 		} else{
-			if (result.count(id) == 0) {
-				result[id] = coeff_mat * rh;
-			} else {
-				result[id] += coeff_mat * rh;
-            }
+			result[i].second = coeff_mat * rh;
 		}
 	}
 }
 
-std::map<int, Matrix > get_coefficient(LinOp &lin){
-	std::map<int, Matrix > coeffs;
-	if (lin.type == VARIABLE){
-		std::map<int, Matrix> new_coeffs = get_variable_coeffs(lin);
-		typedef std::map<int, Matrix >::iterator it_type;
-		for(it_type it = new_coeffs.begin(); it != new_coeffs.end(); ++it){
-			if(coeffs.count(it->first) == 0) {
-				coeffs[it->first] = it->second;
-			} else {
-				coeffs[it->first] += it->second;
-      }
+/* Adds the coefficients in NEW_COEFFS to COEFFS, emptying NEW_COEFFS. Both
+	 are sorted by ID, so they are merged in a single pass, taking over the
+	 matrices instead of copying them. */
+void add_coefficients(CoeffMap &coeffs, CoeffMap &new_coeffs){
+	if (coeffs.empty()) {
+		coeffs.swap(new_coeffs);
+		return;
+	}
+	CoeffMap merged(coeffs.size() + new_coeffs.size());
+	unsigned i = 0, j = 0, k = 0;
+	for (; i < coeffs.size() || j < new_coeffs.size(); k++){
+		bool take_old = j == new_coeffs.size() ||
+			(i < coeffs.size() && coeffs[i].first <= new_coeffs[j].first);
+		bool take_new = i == coeffs.size() ||
+			(j < new_coeffs.size() && new_coeffs[j].first <= coeffs[i].first);
+		if (take_old) {
+			merged[k].first = coeffs[i].first;
+			merged[k].second.swap(coeffs[i].second);
+			i++;
+		}
+		if (take_new && take_old) {
+			merged[k].second += new_coeffs[j].second;
+			j++;
+		} else if (take_new) {
+			merged[k].first = new_coeffs[j].first;
+			merged[k].second.swap(new_coeffs[j].second);
+			j++;
+		}
+	}
+	merged.resize(k);
+	coeffs.swap(merged);
+	new_coeffs.clear();
+}
+
+/* Whether build_matrix records statistics of get_coefficient per LinOp
+	 type in the ProblemData it returns, see set_profiling. */
+static bool profiling_enabled = false;
+
+/* The ProblemData being built, if it records statistics, or NULL. */
+static ProblemData *profile_data = NULL;
+
+/* The time spent in the get_coefficient calls nested in each active call,
+	 innermost last. */
+static std::vector<double> nested_seconds;
+
+void set_profiling(bool enabled){
+	profiling_enabled = enabled;
+}
+
+CoeffMap compute_coefficient(LinOp &lin);
+
+/* Returns the coefficients of LIN, recording their time and number of
+	 nonzeros in PROFILE_DATA, if set. The time excludes that of the nested
+	 calls, so that the times of all types add up to the total. */
+CoeffMap get_coefficient(LinOp &lin){
+	if (profile_data == NULL) {
+		return compute_coefficient(lin);
+	}
+	typedef std::chrono::steady_clock clock;
+	clock::time_point start = clock::now();
+	nested_seconds.push_back(0);
+	CoeffMap coeffs = compute_coefficient(lin);
+	double seconds = std::chrono::duration<double>(clock::now() - start).count();
+	double self_seconds = seconds - nested_seconds.back();
+	nested_seconds.pop_back();
+	if (!nested_seconds.empty()) {
+		nested_seconds.back() += seconds;
+	}
+	double nnz = 0;
+	for (unsigned i = 0; i < coeffs.size(); i++){
+		nnz += coeffs[i].second.nonZeros();
+	}
+	profile_data->type_calls[lin.type] += 1;
+	profile_data->type_seconds[lin.type] += self_seconds;
+	profile_data->type_nnz[lin.type] += nnz;
+	return coeffs;
+}
+
+/* Starts recording statistics in PROB_DATA if profiling is enabled. */
+void start_profile(ProblemData &prob_data){
+	if (profiling_enabled) {
+		prob_data.type_calls.assign(NUM_OPERATOR_TYPES, 0);
+		prob_data.type_seconds.assign(NUM_OPERATOR_TYPES, 0);
+		prob_data.type_nnz.assign(NUM_OPERATOR_TYPES, 0);
+		profile_data = &prob_data;
+	}
+}
+
+/* Whether LIN selects, permutes or broadcasts the entries of a variable,
+	 whose coefficients are then formed directly. */
+bool is_variable_gather(LinOp &lin){
+	return (lin.type == INDEX || lin.type == TRANSPOSE || lin.type == PROMOTE)
+		&& lin.args[0]->type == VARIABLE;
+}
+
+/* Returns the coefficients of LIN due to its argument I, given the
+	 coefficients ARG_COEFFS of that argument, which may be consumed.
+	 FUNC_COEFFS holds get_func_coeffs(LIN), computed on first use. */
+CoeffMap apply_to_arg(LinOp &lin, unsigned i, CoeffMap &arg_coeffs,
+                      std::vector<Matrix> &func_coeffs){
+	CoeffMap coeffs;
+	if (lin.type == RESHAPE) {
+		/* Reshaping preserves the column-major order of the entries */
+		coeffs.swap(arg_coeffs);
+	}
+	else if (lin.type == INDEX || lin.type == TRANSPOSE || lin.type == PROMOTE) {
+		/* Select, permute or broadcast the rows of the argument's coefficients
+		 * instead of multiplying them by a 0-1 matrix */
+		std::vector<int> rows = get_gather_rows(lin);
+		coeffs.resize(arg_coeffs.size());
+		for (unsigned j = 0; j < arg_coeffs.size(); j++){
+			coeffs[j].first = arg_coeffs[j].first;
+			Matrix gathered = gather_rows(arg_coeffs[j].second, rows);
+			coeffs[j].second.swap(gathered);
+			/* Release the argument's coefficients as soon as possible */
+			Matrix().swap(arg_coeffs[j].second);
+		}
+	}
+	else if (lin.type == MUL || lin.type == RMUL) {
+		/* Apply the Kronecker coefficients without forming them */
+		coeffs = get_kron_coeffs(lin, arg_coeffs);
+	}
+	else {
+		if (func_coeffs.empty()) {
+			func_coeffs = get_func_coeffs(lin);
 		}
+		mul_by_const(func_coeffs[i], arg_coeffs, coeffs);
+	}
+	return coeffs;
+}
+
+CoeffMap compute_coefficient(LinOp &lin){
+	CoeffMap coeffs;
+	if (lin.type == VARIABLE){
+		coeffs = get_variable_coeffs(lin);
 	}
 	else if (lin.has_constant_type()){
 		/* ID will be CONSTANT_TYPE */
-		std::map<int, Matrix> new_coeffs = get_const_coeffs(lin);
-		typedef std::map<int, Matrix >::iterator it_type;
-		for(it_type it = new_coeffs.begin(); it != new_coeffs.end(); ++it){
-			if(coeffs.count(it->first) == 0) {
-				coeffs[it->first] = it->second;
-      } else {
-				coeffs[it->first] += it->second;
-      }
+		coeffs = get_const_coeffs(lin);
+	}
+	else if (is_variable_gather(lin)) {
+		/* Select the rows of the identity without forming it */
+		coeffs = get_variable_coeffs(*lin.args[0], get_gather_rows(lin));
+	}
+	else {
+		/* Sum the coefficients due to each argument in order */
+		std::vector<Matrix> func_coeffs;
+		for (unsigned i = 0; i < lin.args.size(); i++){
+			CoeffMap rh_coeffs = get_coefficient(*lin.args[i]);
+			CoeffMap new_coeffs = apply_to_arg(lin, i, rh_coeffs, func_coeffs);
+			add_coefficients(coeffs, new_coeffs);
+		}
+	}
+	return coeffs;
+}
+
+/* The coefficients of a LinOp as an affine function of the parameters: for
+	 each parameter, in increasing order of its OFFSET in the vector of
+	 parameter entries, its number of entries SIZE and the coefficients
+	 multiplying them. The parameter-free part has offset PARAM_LENGTH and
+	 a single entry, and holds the usual coefficients.
+	 
+	 The coefficients of a parameter stack one block of columns per entry,
+	 and are stored transposed: row e * W + j and column i of a matrix hold
+	 the coefficient of entry e times column j, of W, in row i. Row-wise
+	 operations on the LinOp thus combine columns, and only the nonzeros are
+	 stored however many entries the parameter has. */
+struct ParamCoeffs {
+	int offset;
+	int size;
+	CoeffMap coeffs;
+};
+typedef std::vector<ParamCoeffs> Tensor;
+
+/* Moves the coefficients SRC to DST. */
+void move_param_coeffs(ParamCoeffs &dst, ParamCoeffs &src){
+	dst.offset = src.offset;
+	dst.size = src.size;
+	dst.coeffs.swap(src.coeffs);
+}
+
+/* Adds NEW_TENSOR to TENSOR, emptying NEW_TENSOR. Both are sorted by
+	 parameter, so they are merged in a single pass. */
+void add_tensor(Tensor &tensor, Tensor &new_tensor){
+	if (tensor.empty()) {
+		tensor.swap(new_tensor);
+		return;
+	}
+	Tensor merged(tensor.size() + new_tensor.size());
+	unsigned i = 0, j = 0, k = 0;
+	for (; i < tensor.size() || j < new_tensor.size(); k++){
+		bool take_old = j == new_tensor.size() ||
+			(i < tensor.size() && tensor[i].offset <= new_tensor[j].offset);
+		bool take_new = i == tensor.size() ||
+			(j < new_tensor.size() && new_tensor[j].offset <= tensor[i].offset);
+		if (take_old) {
+			move_param_coeffs(merged[k], tensor[i]);
+			i++;
+		}
+		if (take_new && take_old) {
+			add_coefficients(merged[k].coeffs, new_tensor[j].coeffs);
+			j++;
+		} else if (take_new) {
+			move_param_coeffs(merged[k], new_tensor[j]);
+			j++;
+		}
+	}
+	merged.resize(k);
+	tensor.swap(merged);
+	new_tensor.clear();
+}
+
+/* Returns the transpose of the matrix that LIN applies to its argument I,
+	 for the coefficients of parameters, to which the implicit forms of
+	 apply_to_arg do not apply. */
+Matrix get_operator_transpose(LinOp &lin, unsigned i,
+                              std::vector<Matrix> &func_coeffs){
+	int arg_size = vecprod(lin.args[i]->size);
+	Matrix op;
+	if (lin.type == RESHAPE) {
+		op = sparse_eye(arg_size);
+	} else if (lin.type == INDEX || lin.type == TRANSPOSE ||
+	           lin.type == PROMOTE) {
+		op = selection_matrix(get_gather_rows(lin), arg_size);
+	} else if (lin.type == MUL || lin.type == RMUL) {
+		CoeffMap identity(1);
+		Matrix eye = sparse_eye(arg_size);
+		identity[0].second.swap(eye);
+		CoeffMap kron_coeffs = get_kron_coeffs(lin, identity);
+		op.swap(kron_coeffs[0].second);
+	} else {
+		if (func_coeffs.empty()) {
+			func_coeffs = get_func_coeffs(lin);
+		}
+		op = func_coeffs[i];
+		/* Scalars (1x1 matrices) scale every entry, see mul_by_const */
+		if (op.rows() == 1 && op.cols() == 1 && arg_size != 1) {
+			double scalar = op.coeffRef(0, 0);
+			op = sparse_eye(arg_size) * scalar;
+		}
+	}
+	Matrix op_t = op.transpose();
+	return op_t;
+}
+
+/* Appends to ROWS and SOURCES the pairs (i, s) such that entry T of the
+	 data of LIN, of type MUL, RMUL or MUL_ELEM, multiplies entry s of its
+	 argument into entry i of LIN. */
+void get_product_pairs(LinOp &lin, int t, std::vector<int> &rows,
+                       std::vector<int> &sources){
+	std::vector<int> &arg_shape = lin.args[0]->size;
+	int size = vecprod(lin.size);
+	int arg_size = vecprod(arg_shape);
+	int data_size = vecprod(lin.linOp_data->size);
+	if (lin.type == MUL_ELEM || (data_size == 1 && size == arg_size)) {
+		/* A scalar multiplies every entry */
+		int start = data_size == 1 ? 0 : t;
+		int end = data_size == 1 ? size : t + 1;
+		for (int i = start; i < end; i++){
+			rows.push_back(i);
+			sources.push_back(i);
+		}
+	} else if (lin.type == MUL) {
+		/* The data (M, N) times the argument (N, K) */
+		int n = arg_shape.empty() ? 1 : arg_shape[0];
+		int k = arg_size / n;
+		int m = size / k;
+		for (int l = 0; l < k; l++){
+			rows.push_back(t % m + m * l);
+			sources.push_back(t / m + n * l);
 		}
+	} else {
+		/* The argument (M, N) times the data (N, K) */
+		int m = arg_shape.size() == 2 ? arg_shape[0] : 1;
+		int n = arg_size / m;
+		for (int a = 0; a < m; a++){
+			rows.push_back(a + m * (t / n));
+			sources.push_back(a + m * (t % n));
+		}
+	}
+}
+
+Tensor get_tensor(LinOp &lin, int param_length);
+
+/* Returns the coefficients of LIN, a MUL, RMUL or MUL_ELEM whose data
+	 LINOP_DATA depends on parameters and whose argument does not. Each
+	 entry of the data, as a function of the parameters, scales entries of
+	 the argument's coefficients into those of LIN (see get_product_pairs). */
+Tensor get_product_tensor(LinOp &lin, int param_length){
+	Tensor data = get_tensor(*lin.linOp_data, param_length);
+	Tensor arg = get_tensor(*lin.args[0], param_length);
+	assert(arg.size() <= 1);
+	CoeffMap arg_coeffs;
+	if (!arg.empty()) {
+		arg_coeffs.swap(arg[0].coeffs);
+	}
+	/* The rows of the coefficients of the argument */
+	std::vector<int> arg_ids(arg_coeffs.size());
+	std::vector<Matrix> arg_rows(arg_coeffs.size());
+	for (unsigned b = 0; b < arg_coeffs.size(); b++){
+		arg_ids[b] = arg_coeffs[b].first;
+		Matrix rows_b = arg_coeffs[b].second.transpose();
+		arg_rows[b].swap(rows_b);
+	}
+	CoeffMap().swap(arg_coeffs);
+
+	int size = vecprod(lin.size);
+	std::vector<int> rows, sources;
+	Tensor tensor(data.size());
+	for (unsigned d = 0; d < data.size(); d++){
+		tensor[d].offset = data[d].offset;
+		tensor[d].size = data[d].size;
+		bool stacked = data[d].offset != param_length;
+		if (data[d].coeffs.empty()) {
+			continue;
+		}
+		/* The data has no variables, only constant coefficients */
+		Matrix &values = data[d].coeffs[0].second;
+		tensor[d].coeffs.resize(arg_rows.size());
+		for (unsigned b = 0; b < arg_rows.size(); b++){
+			int width = arg_rows[b].rows();
+			std::vector<Triplet> triplets;
+			for (int k = 0; k < values.outerSize(); ++k){
+				for (Matrix::InnerIterator it(values, k); it; ++it){
+					/* Entry T of the data is multiplied by entry E of the parameter */
+					int t = stacked ? k : it.row();
+					int e = stacked ? it.row() : 0;
+					rows.clear();
+					sources.clear();
+					get_product_pairs(lin, t, rows, sources);
+					for (unsigned p = 0; p < rows.size(); p++){
+						for (Matrix::InnerIterator c_it(arg_rows[b], sources[p]); c_it;
+						     ++c_it){
+							double value = it.value() * c_it.value();
+							if (stacked) {
+								triplets.push_back(Triplet(e * width + c_it.row(), rows[p],
+								                           value));
+							} else {
+								triplets.push_back(Triplet(rows[p], c_it.row(), value));
+							}
+						}
+					}
+				}
+			}
+			tensor[d].coeffs[b].first = arg_ids[b];
+			Matrix product = stacked ?
+				compress_triplets(tensor[d].size * width, size, triplets) :
+				compress_triplets(size, width, triplets);
+			tensor[d].coeffs[b].second.swap(product);
+		}
+	}
+	return tensor;
+}
+
+/* Returns the coefficients of LIN as an affine function of the
+	 parameters, see Tensor. */
+Tensor get_tensor(LinOp &lin, int param_length){
+	Tensor tensor;
+	if (lin.type == PARAM) {
+		/* Entry e of the parameter is entry e of its value */
+		int size = vecprod(lin.size);
+		tensor.resize(1);
+		tensor[0].offset = int(lin.dense_data(0, 0));
+		tensor[0].size = size;
+		tensor[0].coeffs.resize(1);
+		tensor[0].coeffs[0].first = CONSTANT_ID;
+		Matrix eye = sparse_eye(size);
+		tensor[0].coeffs[0].second.swap(eye);
+	}
+	else if (lin.linOp_data != NULL) {
+		tensor = get_product_tensor(lin, param_length);
+	}
+	else if (lin.args.empty() || is_variable_gather(lin)) {
+		/* No parameters */
+		tensor.resize(1);
+		tensor[0].offset = param_length;
+		tensor[0].size = 1;
+		tensor[0].coeffs = get_coefficient(lin);
 	}
 	else {
-		/* Multiply the arguments of the function coefficient in order */
-		std::vector<Matrix> coeff_mat = get_func_coeffs(lin);
+		std::vector<Matrix> func_coeffs;
 		for (unsigned i = 0; i < lin.args.size(); i++){
-			Matrix coeff = coeff_mat[i];
-			std::map<int, Matrix > rh_coeffs = get_coefficient(*lin.args[i]);
-			std::map<int,  Matrix > new_coeffs;
-			mul_by_const(coeff, rh_coeffs, new_coeffs);
-
-			typedef std::map<int, Matrix>::iterator it_type;
-			for (it_type it = new_coeffs.begin(); it != new_coeffs.end(); ++it){
-				if(coeffs.count(it->first) == 0)
-					coeffs[it->first] = it->second;
-				else
-					coeffs[it->first] += it->second;
+			Tensor arg_tensor = get_tensor(*lin.args[i], param_length);
+			Tensor new_tensor(arg_tensor.size());
+			Matrix op_t;
+			for (unsigned j = 0; j < arg_tensor.size(); j++){
+				ParamCoeffs &arg = arg_tensor[j];
+				new_tensor[j].offset = arg.offset;
+				new_tensor[j].size = arg.size;
+				if (arg.offset == param_length) {
+					new_tensor[j].coeffs = apply_to_arg(lin, i, arg.coeffs, func_coeffs);
+					continue;
+				}
+				if (op_t.size() == 0) {
+					op_t = get_operator_transpose(lin, i, func_coeffs);
+				}
+				new_tensor[j].coeffs.resize(arg.coeffs.size());
+				for (unsigned b = 0; b < arg.coeffs.size(); b++){
+					new_tensor[j].coeffs[b].first = arg.coeffs[b].first;
+					Matrix product = sparse_product(arg.coeffs[b].second, op_t);
+					new_tensor[j].coeffs[b].second.swap(product);
+					Matrix().swap(arg.coeffs[b].second);
+				}
 			}
+			add_tensor(tensor, new_tensor);
 		}
 	}
-	return coeffs;
+	return tensor;
 }
 
 int get_horiz_offset(int id, std::map<int, int> &offsets,
@@ -105,27 +467,6 @@ int get_horiz_offset(int id, std::map<int, int> &offsets,
 	return offsets[id];
 }
 
-/* function: add_matrix_to_vectors
-*
-* This function adds a matrix to our sparse matrix triplet
-* representation, by using eigen's sparse matrix iterator
-* This function takes horizontal and vertical offset, which indicate
-* the offset of this block within our larger matrix.
-*/
-void add_matrix_to_vectors(Matrix &block, std::vector<double> &V,
-                           std::vector<int>  &I, std::vector<int> &J,
-                           int &vert_offset, int &horiz_offset){
-	for ( int k = 0; k < block.outerSize(); ++k ) {
-		for ( Matrix::InnerIterator it(block, k); it; ++it ){
-			V.push_back(it.value());
-
-			/* Push back current row and column indices */
-			I.push_back(it.row() + vert_offset);
-			J.push_back(it.col() + horiz_offset);
-		}
-	}
-}
-
 void extend_constant_vec(std::vector<double> &const_vec, int &vert_offset,
                          Matrix &block){
 	int rows = block.rows();
@@ -137,24 +478,147 @@ void extend_constant_vec(std::vector<double> &const_vec, int &vert_offset,
 	}
 }
 
-void process_constraint(LinOp & lin, std::vector<double> &V,
-                        std::vector<int> &I, std::vector<int> &J,
-                        std::vector<double> &constant_vec, int &vert_offset,
-                        std::map<int, int> &id_to_col, int & horiz_offset){
-	/* Get the coefficient for the current constraint */
-	std::map<int, Matrix > coeffs = get_coefficient(lin);	
-
-	typedef std::map<int, Matrix >::iterator it_type;
-	for(it_type it = coeffs.begin(); it != coeffs.end(); ++it){
-		int id = it->first;									// Horiz offset determined by the id
-		Matrix block = it->second;
+/* Adds the coefficients COEFFS of the constraint LIN, whose rows start at
+	 VERT_OFFSET, to PROB_DATA, releasing them once written.
+
+	 The blocks of the variables are written directly in compressed sparse
+	 row form after the current end of V and J, ordered by row with a
+	 counting sort, and ordered by column within each row by writing the
+	 blocks in the order of their columns. The number of entries of each
+	 row is stored in ROW_PTR, which build_matrix sums once every constraint
+	 is written. */
+void process_constraint(LinOp &lin, CoeffMap &coeffs, ProblemData &prob_data,
+                        int vert_offset, int &horiz_offset){
+	/* The first column and the coefficients of each variable */
+	std::vector<std::pair<int, Matrix *> > blocks;
+	for (unsigned i = 0; i < coeffs.size(); i++){
+		int id = coeffs[i].first;
+		Matrix &block = coeffs[i].second;
 		if (id == CONSTANT_ID) { // Add to CONSTANT_VEC if linop is constant
-			extend_constant_vec(constant_vec, vert_offset, block);	
+			extend_constant_vec(prob_data.const_vec, vert_offset, block);
+		} else {
+			int offset = get_horiz_offset(id, prob_data.id_to_col, horiz_offset,
+			                              lin);
+			blocks.push_back(std::make_pair(offset, &block));
+		}
+	}
+	std::sort(blocks.begin(), blocks.end());
+
+	/* The position of the next entry of each row */
+	int rows = vecprod(lin.size);
+	std::vector<int> next(rows + 1, 0);
+	for (unsigned b = 0; b < blocks.size(); b++){
+		Matrix &block = *blocks[b].second;
+		for (int k = 0; k < block.outerSize(); ++k){
+			for (Matrix::InnerIterator it(block, k); it; ++it){
+				next[it.row() + 1]++;
+			}
 		}
-		else {
-			int offset = get_horiz_offset(id, id_to_col, horiz_offset, lin);
-			add_matrix_to_vectors(block, V, I, J, vert_offset, offset);
+	}
+	next[0] = prob_data.V.size();
+	for (int row = 0; row < rows; row++){
+		prob_data.row_ptr[vert_offset + row + 1] = next[row + 1];
+		next[row + 1] += next[row];
+	}
+	prob_data.V.resize(next[rows]);
+	prob_data.J.resize(next[rows]);
+	for (unsigned b = 0; b < blocks.size(); b++){
+		Matrix &block = *blocks[b].second;
+		for (int k = 0; k < block.outerSize(); ++k){
+			int col = k + blocks[b].first;
+			for (Matrix::InnerIterator it(block, k); it; ++it){
+				int pos = next[it.row()]++;
+				prob_data.V[pos] = it.value();
+				prob_data.J[pos] = col;
+			}
 		}
+		Matrix().swap(block);
+	}
+	coeffs.clear();
+}
+
+/* Adds the coefficients TENSOR of the constraint LIN, whose rows start at
+	 VERT_OFFSET, to PROB_DATA, releasing them once written.
+
+	 As in process_constraint, the entries are written by row with a
+	 counting sort. The column of an entry in [A | b] is written in J, with
+	 VAR_LENGTH for the constant, and the parameter entry it multiplies in
+	 PARAM_ENTRIES, with PARAM_LENGTH for the parameter-free part. */
+void process_tensor_constraint(LinOp &lin, Tensor &tensor,
+                               ProblemData &prob_data, int vert_offset,
+                               int &horiz_offset, int var_length,
+                               int param_length){
+	/* The position of the next entry of each row, once the entries of each
+	 * row are counted in the first pass */
+	int rows = vecprod(lin.size);
+	std::vector<int> next(rows + 1, 0);
+	for (int pass = 0; pass < 2; pass++){
+		for (unsigned d = 0; d < tensor.size(); d++){
+			ParamCoeffs &param = tensor[d];
+			bool stacked = param.offset != param_length;
+			for (unsigned b = 0; b < param.coeffs.size(); b++){
+				int id = param.coeffs[b].first;
+				Matrix &block = param.coeffs[b].second;
+				int col = var_length;
+				int width = 1;
+				if (id != CONSTANT_ID) {
+					col = get_horiz_offset(id, prob_data.id_to_col, horiz_offset, lin);
+					width = stacked ? block.rows() / param.size : block.cols();
+				}
+				for (int k = 0; k < block.outerSize(); ++k){
+					for (Matrix::InnerIterator it(block, k); it; ++it){
+						int row = stacked ? it.col() : it.row();
+						if (pass == 0) {
+							next[row + 1]++;
+							continue;
+						}
+						int pos = next[row]++;
+						prob_data.V[pos] = it.value();
+						if (stacked) {
+							prob_data.J[pos] = col + it.row() % width;
+							prob_data.param_entries[pos] = param.offset + it.row() / width;
+						} else {
+							prob_data.J[pos] = col + it.col();
+							prob_data.param_entries[pos] = param_length;
+						}
+					}
+				}
+				if (pass == 1) {
+					Matrix().swap(block);
+				}
+			}
+		}
+		if (pass == 0) {
+			next[0] = prob_data.V.size();
+			for (int row = 0; row < rows; row++){
+				prob_data.row_ptr[vert_offset + row + 1] = next[row + 1];
+				next[row + 1] += next[row];
+			}
+			prob_data.V.resize(next[rows]);
+			prob_data.J.resize(next[rows]);
+			prob_data.param_entries.resize(next[rows]);
+		}
+	}
+	tensor.clear();
+}
+
+/* Reserves V and J in PROB_DATA for an upper bound on the number of
+	 nonzeros of the coefficients of CONSTRAINTS, computed from the LinOp
+	 trees before any coefficients, so that the coefficients of each
+	 constraint are written and released before those of the next are
+	 computed, without reallocating V and J. */
+void reserve_nonzeros(std::vector<LinOp*> &constraints,
+                      ProblemData &prob_data){
+	double nnz = 0;
+	for (unsigned i = 0; i < constraints.size(); i++){
+		double cols;
+		nnz += get_nnz_bound(*constraints[i], cols);
+	}
+	try {
+		prob_data.V.reserve(size_t(nnz));
+		prob_data.J.reserve(size_t(nnz));
+	} catch (std::bad_alloc &) {
+		/* The bound is loose: grow V and J as they are written instead */
 	}
 }
 
@@ -182,7 +646,7 @@ int get_total_constraint_length(std::vector<LinOp*> &constraints,
 	int offset_end = 0;
 	/* Offsets must be monotonically increasing */
 	for(unsigned i = 0; i < constr_offsets.size(); i++){
-		LinOp constr = *constraints[i];
+		LinOp &constr = *constraints[i];
 		int offset_start = constr_offsets[i];
     offset_end = offset_start + vecprod(constr.size);
 
@@ -214,19 +678,24 @@ ProblemData build_matrix(std::vector< LinOp* > constraints,
 	ProblemData prob_data;
 	int num_rows = get_total_constraint_length(constraints);
 	prob_data.const_vec = std::vector<double> (num_rows, 0);
+	prob_data.row_ptr = std::vector<int> (num_rows + 1, 0);
 	prob_data.id_to_col = id_to_col;
 	int vert_offset = 0;
 	int horiz_offset  = 0;
+	start_profile(prob_data);
+	reserve_nonzeros(constraints, prob_data);
 
 	/* Build matrix one constraint at a time */
 	for (unsigned i = 0; i < constraints.size(); i++){
-		LinOp constr = *constraints[i];
-		process_constraint(constr, prob_data.V, prob_data.I, prob_data.J,
-		                   prob_data.const_vec, vert_offset,
-		                   prob_data.id_to_col, horiz_offset);
+		LinOp &constr = *constraints[i];
+		CoeffMap coeffs = get_coefficient(constr);
+		process_constraint(constr, coeffs, prob_data, vert_offset, horiz_offset);
 		prob_data.const_to_row[i] = vert_offset;
 		vert_offset += vecprod(constr.size);
 	}
+	std::partial_sum(prob_data.row_ptr.begin(), prob_data.row_ptr.end(),
+	                 prob_data.row_ptr.begin());
+	profile_data = NULL;
 	return prob_data;
 }
 
@@ -246,17 +715,56 @@ ProblemData build_matrix(std::vector<LinOp*> constraints,
 	/* Function also verifies the offsets are valid */
 	int num_rows = get_total_constraint_length(constraints, constr_offsets);
 	prob_data.const_vec = std::vector<double> (num_rows, 0);
+	prob_data.row_ptr = std::vector<int> (num_rows + 1, 0);
 	prob_data.id_to_col = id_to_col;
 	int horiz_offset  = 0;
+	start_profile(prob_data);
+	reserve_nonzeros(constraints, prob_data);
 
 	/* Build matrix one constraint at a time */
 	for (unsigned i = 0; i < constraints.size(); i++){
-		LinOp constr = *constraints[i];
+		LinOp &constr = *constraints[i];
 		int vert_offset = constr_offsets[i];
-		process_constraint(constr, prob_data.V, prob_data.I, prob_data.J,
-		                   prob_data.const_vec, vert_offset,
-		                   prob_data.id_to_col, horiz_offset);
+		CoeffMap coeffs = get_coefficient(constr);
+		process_constraint(constr, coeffs, prob_data, vert_offset, horiz_offset);
 		prob_data.const_to_row[i] = vert_offset;
 	}
+	std::partial_sum(prob_data.row_ptr.begin(), prob_data.row_ptr.end(),
+	                 prob_data.row_ptr.begin());
+	profile_data = NULL;
+	return prob_data;
+}
+
+/* Builds the coefficients of CONSTRAINTS as an affine function of the
+	 parameters, whose entries are stacked in a vector of length
+	 PARAM_LENGTH. The leaves of type PARAM hold their offset in that
+	 vector, and products whose data depends on parameters hold the LinOp
+	 tree of the data, see LinOp::set_linOp_data.
+
+	 Entry k of V is the coefficient of parameter entry PARAM_ENTRIES[k], or
+	 of one for PARAM_LENGTH, in row I[k] and column J[k] of [A | b], where
+	 b is column VAR_LENGTH. The rows are in compressed form in ROW_PTR, and
+	 CONST_VEC is left empty. */
+ProblemData build_parameter_tensor(std::vector< LinOp* > constraints,
+                                   std::map<int, int> id_to_col,
+                                   int var_length, int param_length) {
+	ProblemData prob_data;
+	int num_rows = get_total_constraint_length(constraints);
+	prob_data.row_ptr = std::vector<int> (num_rows + 1, 0);
+	prob_data.id_to_col = id_to_col;
+	int vert_offset = 0;
+	int horiz_offset  = 0;
+
+	/* Build the tensor one constraint at a time */
+	for (unsigned i = 0; i < constraints.size(); i++){
+		LinOp &constr = *constraints[i];
+		Tensor tensor = get_tensor(constr, param_length);
+		process_tensor_constraint(constr, tensor, prob_data, vert_offset,
+		                          horiz_offset, var_length, param_length);
+		prob_data.const_to_row[i] = vert_offset;
+		vert_offset += vecprod(constr.size);
+	}
+	std::partial_sum(prob_data.row_ptr.begin(), prob_data.row_ptr.end(),
+	                 prob_data.row_ptr.begin());
 	return prob_data;
 }
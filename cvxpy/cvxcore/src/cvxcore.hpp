@@ -26,4 +26,12 @@ ProblemData build_matrix(std::vector< LinOp* > constraints,
 ProblemData build_matrix(std::vector< LinOp* > constraints,
                          std::map<int, int> id_to_col,
                          std::vector<int> constr_offsets);
+
+ProblemData build_parameter_tensor(std::vector< LinOp* > constraints,
+                                   std::map<int, int> id_to_col,
+                                   int var_length, int param_length);
+
+/* Enables recording statistics of the LinOp types in the ProblemData
+	 returned by build_matrix. */
+void set_profiling(bool enabled);
 #endif
@@ -31,3 +31,10 @@ class ParameterError(Exception):
     """Error thrown for accessing the value of an unspecified parameter.
     """
     pass
+
+
+class ParameterAffineError(ValueError):
+    """Error thrown when the problem data is not an affine function of the
+       parameters that can be stuffed as a function of them.
+    """
+    pass
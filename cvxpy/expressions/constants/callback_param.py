@@ -14,21 +14,66 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import numpy as np
+
+import cvxpy.interface as intf
 from cvxpy.expressions.constants.parameter import Parameter
 
 
 class CallbackParam(Parameter):
     """
     A parameter whose value is obtained by evaluating a function.
+
+    If the parameters the function depends on are given, its value is
+    cached until a value is assigned to one of them. The cached value is
+    read-only.
+
+    Parameters
+    ----------
+    callback : function
+        Returns the value of the parameter.
+    shape : tuple
+        The shape of the parameter.
+    params : list, optional
+        The parameters the value depends on, or None to evaluate the
+        callback whenever the value is read.
     """
     PARAM_COUNT = 0
 
-    def __init__(self, callback, shape=(), **kwargs):
+    def __init__(self, callback, shape=(), params=None, **kwargs):
         self._callback = callback
+        # The parameters with a value whose versions are tracked; those
+        # of nested callback parameters are tracked directly.
+        self._dependencies = None
+        if params is not None:
+            self._dependencies = []
+            for param in params:
+                if not isinstance(param, CallbackParam):
+                    self._dependencies.append(param)
+                elif param._dependencies is None:
+                    self._dependencies = None
+                    break
+                else:
+                    self._dependencies += param._dependencies
+        self._cached_versions = None
         super(CallbackParam, self).__init__(shape, **kwargs)
 
     @property
     def value(self):
         """Evaluate the callback to get the value.
         """
-        return self._validate_value(self._callback())
+        if self._dependencies is None:
+            return self._validate_value(self._callback())
+        versions = [param._version for param in self._dependencies]
+        if versions != self._cached_versions:
+            value = self._validate_value(self._callback())
+            if isinstance(value, np.ndarray):
+                # A read-only copy, so that neither the cache nor the array
+                # returned by the callback is modified through the other.
+                value = value.copy()
+                value.setflags(write=False)
+            self._cached_value = value
+            self._cached_versions = versions
+        if intf.is_sparse(self._cached_value):
+            return self._cached_value.copy()
+        return self._cached_value
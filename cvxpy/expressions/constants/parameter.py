@@ -38,6 +38,9 @@ class Parameter(Leaf):
             self._name = name
         # Initialize with value if provided.
         self._value = None
+        # Incremented whenever a value is saved, so that values computed
+        # from the parameter can be cached (see CallbackParam).
+        self._version = 0
         super(Parameter, self).__init__(shape, value, **kwargs)
 
     def get_data(self):
@@ -57,7 +60,11 @@ class Parameter(Leaf):
 
     @value.setter
     def value(self, val):
-        self._value = self._validate_value(val)
+        self.save_value(self._validate_value(val))
+
+    def save_value(self, val):
+        self._value = val
+        self._version += 1
 
     @property
     def grad(self):
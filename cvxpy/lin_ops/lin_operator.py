@@ -0,0 +1,402 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
+
+import cvxpy.lin_ops.lin_op as lo
+from cvxpy.utilities.traversal import post_order
+
+# Operators that select entries of their argument.
+SELECT_OPS = [lo.INDEX, lo.TRANSPOSE, lo.DIAG_MAT, lo.UPPER_TRI]
+CONSTANT_OPS = [lo.SCALAR_CONST, lo.DENSE_CONST, lo.SPARSE_CONST]
+
+
+def get_problem_operator(lin_ops, id_to_col, num_vars):
+    """Builds a matrix-free representation of stacked LinOp trees.
+
+    The coefficients are never formed. Products with the coefficient
+    matrix and its transpose are computed by evaluating the LinOp trees,
+    with the same conventions as ``canonInterface.get_problem_matrix``.
+
+    Parameters
+    ----------
+    lin_ops : list
+        The LinOp trees, whose vectorized values are stacked vertically.
+    id_to_col : dict
+        A map from variable id to offset in the variable vector.
+    num_vars : int
+        The length of the variable vector.
+
+    Returns
+    -------
+    LinOpOperator
+        The coefficient operator A.
+    NumPy.ndarray
+        The offset vector b, such that the stacked trees are A*x + b.
+    """
+    A = LinOpOperator(lin_ops, id_to_col, num_vars)
+    return A, A.offset
+
+
+def _vec_size(shape):
+    return int(np.prod(shape, dtype=int))
+
+
+def _matrix_shape(shape):
+    """The shape of the matrix a value of the given shape is stored as.
+    """
+    if len(shape) == 0:
+        return (1, 1)
+    elif len(shape) == 1:
+        return (shape[0], 1)
+    return shape
+
+
+def _const_vec(lin_op):
+    """The vectorized value of a constant LinOp.
+    """
+    if lin_op.type == lo.SPARSE_CONST:
+        value = lin_op.data.toarray()
+    else:
+        value = np.asarray(lin_op.data, dtype=float)
+    return np.ravel(value, order='F').astype(float)
+
+
+def _const_mat(lin_op):
+    """The data of a LinOp as a matrix, and the number of dimensions of the data.
+    """
+    data = lin_op.data
+    if not isinstance(data, lo.LinOp):
+        return np.array([[float(data)]]), 0
+    elif data.type == lo.SPARSE_CONST:
+        return sp.csr_matrix(data.data), 2
+    elif data.type == lo.SCALAR_CONST:
+        return np.array([[float(data.data)]]), 0
+    value = np.reshape(np.asarray(data.data, dtype=float),
+                       _matrix_shape(data.shape), order='F')
+    return value, len(data.shape)
+
+
+def _select_indices(lin_op):
+    """The positions of the entries of the argument an operator selects.
+    """
+    arg_shape = lin_op.args[0].shape
+    if lin_op.type == lo.INDEX:
+        # Mirrors the slice semantics of cvxcore.
+        axes = []
+        for sl, dim in zip(lin_op.data, arg_shape):
+            idx = []
+            pointer = sl.start
+            while 0 <= pointer < dim:
+                idx.append(pointer)
+                pointer += sl.step
+                if (sl.step > 0 and pointer >= sl.stop) or \
+                   (sl.step < 0 and pointer <= sl.stop):
+                    break
+            axes.append(idx)
+        if any(len(idx) == 0 for idx in axes):
+            return np.zeros(0, dtype=int)
+        grid = np.ix_(*axes)
+        flat = np.ravel_multi_index(grid, arg_shape, order='F')
+        return np.ravel(flat, order='F')
+    elif lin_op.type == lo.TRANSPOSE:
+        rows, cols = lin_op.shape
+        return np.ravel(np.arange(rows*cols).reshape((cols, rows), order='F').T,
+                        order='F')
+    elif lin_op.type == lo.DIAG_MAT:
+        n = lin_op.shape[0]
+        return np.arange(n)*(n + 1)
+    else:
+        rows, cols = arg_shape
+        i, j = np.triu_indices(rows, 1, cols)
+        return j*rows + i
+
+
+def _fftconvolve(*args, **kwargs):
+    # scipy.signal is slow to import, so it is imported on first use.
+    from scipy.signal import fftconvolve
+    return fftconvolve(*args, **kwargs)
+
+
+class LinOpOperator(LinearOperator):
+    """The coefficient matrix of stacked LinOp trees as a LinearOperator.
+
+    The trees are sorted topologically when the operator is built, and the
+    constant data of each node is extracted once. Products are then computed
+    node by node on vectorized (column-major) values: convolutions with
+    FFTs, Kronecker products and multiplications blockwise, and promotions,
+    sums and selections without forming any matrix.
+
+    Parameters
+    ----------
+    lin_ops : list
+        The LinOp trees, whose vectorized values are stacked vertically.
+    id_to_col : dict
+        A map from variable id to offset in the variable vector.
+    num_vars : int
+        The length of the variable vector.
+    """
+
+    def __init__(self, lin_ops, id_to_col, num_vars):
+        self.lin_ops = lin_ops
+        self.id_to_col = id_to_col
+        # The nodes in topological order, the positions of their arguments,
+        # and the data used to apply them.
+        self._nodes = []
+        self._arg_idx = []
+        self._data = []
+        # Whether a node depends on a variable.
+        self._has_vars = []
+
+        def visit(node, arg_idx):
+            self._nodes.append(node)
+            self._arg_idx.append(arg_idx)
+            self._data.append(self._prepare(node))
+            self._has_vars.append(node.type == lo.VARIABLE or
+                                  any(self._has_vars[i] for i in arg_idx))
+            return len(self._nodes) - 1
+
+        memo = {}
+        self._roots = [post_order(lin_op, visit, lambda node: node.args, memo)
+                       for lin_op in lin_ops]
+        self._sizes = [_vec_size(node.shape) for node in self._nodes]
+        num_rows = sum(self._sizes[idx] for idx in self._roots)
+        super(LinOpOperator, self).__init__(float, (num_rows, num_vars))
+        self.offset = self._forward(None)
+
+    def _prepare(self, node):
+        """Extracts the data used to apply a node.
+        """
+        if node.type == lo.VARIABLE:
+            return self.id_to_col[node.data]
+        elif node.type in CONSTANT_OPS:
+            return _const_vec(node)
+        elif node.type in SELECT_OPS or node.type == lo.DIAG_VEC:
+            if node.type == lo.DIAG_VEC:
+                n = node.shape[0]
+                return np.arange(n)*(n + 1)
+            return _select_indices(node)
+        elif node.type in [lo.MUL, lo.RMUL]:
+            return self._prepare_mul(node)
+        elif node.type == lo.MUL_ELEM:
+            data = node.data
+            if data.type == lo.SCALAR_CONST:
+                return float(data.data)
+            return _const_vec(data)
+        elif node.type == lo.DIV:
+            return _const_mat(node)[0][0, 0]
+        elif node.type == lo.CONV:
+            return np.ravel(_const_vec(node.data))
+        elif node.type == lo.KRON:
+            const = _const_mat(node)[0]
+            if sp.issparse(const):
+                const = const.toarray()
+            return const
+        elif node.type == lo.TRACE:
+            n = node.args[0].shape[0]
+            return np.arange(n)*(n + 1)
+        elif node.type in [lo.PROMOTE, lo.SUM, lo.NEG, lo.SUM_ENTRIES,
+                           lo.RESHAPE, lo.HSTACK, lo.VSTACK, lo.NO_OP]:
+            return None
+        raise NotImplementedError("Type %s is not supported." % node.type)
+
+    @staticmethod
+    def _prepare_mul(node):
+        """Returns the constant of a MUL or RMUL and the shape of the argument
+           as a matrix.
+        """
+        const, ndim = _const_mat(node)
+        arg_shape = node.args[0].shape
+        if node.type == lo.MUL:
+            # Interpret as row or column vector as needed.
+            if ndim == 1 and arg_shape[0] != const.shape[1]:
+                const = const.T
+            num_blocks = arg_shape[1] if len(arg_shape) > 1 else 1
+            return const, (const.shape[1], num_blocks)
+        else:
+            if len(arg_shape) == 1:
+                arg_cols, result_rows = arg_shape[0], 1
+            else:
+                result_rows, arg_cols = arg_shape
+            if ndim == 1 and arg_cols != const.shape[0]:
+                const = const.T
+            n = result_rows if len(node.shape) > 0 else 1
+            return const, (n, const.shape[0])
+
+    def _matvec(self, x):
+        return self._forward(np.ravel(x))
+
+    def _rmatvec(self, y):
+        return self._adjoint(np.ravel(y))
+
+    def _forward(self, x):
+        """Evaluates the trees.
+
+        If x is None, the variables are zero and the result is the offset.
+        Otherwise the constants are zero and the result is A*x.
+        """
+        values = [None]*len(self._nodes)
+        for idx, node in enumerate(self._nodes):
+            if x is not None and not self._has_vars[idx]:
+                values[idx] = np.zeros(self._sizes[idx])
+            else:
+                args = [values[i] for i in self._arg_idx[idx]]
+                values[idx] = self._apply(idx, node, args, x)
+        return np.concatenate([values[idx] for idx in self._roots] +
+                              [np.zeros(0)])
+
+    def _apply(self, idx, node, args, x):
+        data = self._data[idx]
+        size = self._sizes[idx]
+        if node.type == lo.VARIABLE:
+            if x is None:
+                return np.zeros(size)
+            return x[data:data + size]
+        elif node.type in CONSTANT_OPS:
+            return data
+        elif node.type == lo.NO_OP:
+            return np.zeros(size)
+        elif node.type == lo.PROMOTE:
+            return np.full(size, args[0][0])
+        elif node.type == lo.SUM:
+            return sum(args[1:], args[0].copy())
+        elif node.type == lo.NEG:
+            return -args[0]
+        elif node.type == lo.RESHAPE:
+            return args[0]
+        elif node.type == lo.SUM_ENTRIES:
+            return np.array([args[0].sum()])
+        elif node.type == lo.TRACE:
+            return np.array([args[0][data].sum()])
+        elif node.type in SELECT_OPS:
+            return args[0][data]
+        elif node.type == lo.DIAG_VEC:
+            result = np.zeros(size)
+            result[data] = args[0]
+            return result
+        elif node.type == lo.MUL_ELEM:
+            return data*args[0]
+        elif node.type == lo.DIV:
+            return args[0]/data
+        elif node.type == lo.MUL:
+            const, arg_shape = data
+            arg = np.reshape(args[0], arg_shape, order='F')
+            return np.ravel(const.dot(arg), order='F')
+        elif node.type == lo.RMUL:
+            const, arg_shape = data
+            arg = np.reshape(args[0], arg_shape, order='F')
+            return np.ravel(const.T.dot(arg.T).T, order='F')
+        elif node.type == lo.CONV:
+            return _fftconvolve(data, args[0])
+        elif node.type == lo.KRON:
+            arg = np.reshape(args[0], node.args[0].shape, order='F')
+            return np.ravel(np.kron(data, arg), order='F')
+        elif node.type == lo.HSTACK:
+            return np.concatenate(args)
+        else:
+            # VSTACK: the columns of the arguments are interleaved.
+            rows = node.shape[0]
+            cols = size//rows
+            mats = [np.reshape(arg, (-1, cols), order='F') for arg in args]
+            return np.ravel(np.vstack(mats), order='F')
+
+    def _adjoint(self, y):
+        """Computes A.T*y by propagating y from the roots to the variables.
+        """
+        result = np.zeros(self.shape[1])
+        adjoints = [None]*len(self._nodes)
+        offset = 0
+        for idx in self._roots:
+            size = self._sizes[idx]
+            self._accumulate(adjoints, idx, y[offset:offset + size])
+            offset += size
+        for idx in reversed(range(len(self._nodes))):
+            node = self._nodes[idx]
+            if adjoints[idx] is None:
+                continue
+            elif node.type == lo.VARIABLE:
+                col = self._data[idx]
+                result[col:col + self._sizes[idx]] += adjoints[idx]
+                continue
+            arg_adjoints = self._apply_adjoint(idx, node, adjoints[idx])
+            for i, adjoint in zip(self._arg_idx[idx], arg_adjoints):
+                self._accumulate(adjoints, i, adjoint)
+            adjoints[idx] = None
+        return result
+
+    def _accumulate(self, adjoints, idx, adjoint):
+        if not self._has_vars[idx]:
+            return
+        elif adjoints[idx] is None:
+            adjoints[idx] = np.array(adjoint, dtype=float)
+        else:
+            adjoints[idx] += adjoint
+
+    def _apply_adjoint(self, idx, node, y):
+        """Returns the adjoints of the arguments of a node.
+        """
+        data = self._data[idx]
+        arg_sizes = [self._sizes[i] for i in self._arg_idx[idx]]
+        if node.type == lo.PROMOTE:
+            return [np.array([y.sum()])]
+        elif node.type in [lo.SUM, lo.RESHAPE]:
+            return [y]*len(arg_sizes)
+        elif node.type == lo.NEG:
+            return [-y]
+        elif node.type == lo.SUM_ENTRIES:
+            return [np.full(arg_sizes[0], y[0])]
+        elif node.type == lo.TRACE:
+            result = np.zeros(arg_sizes[0])
+            result[data] = y[0]
+            return [result]
+        elif node.type in SELECT_OPS:
+            result = np.zeros(arg_sizes[0])
+            result[data] = y
+            return [result]
+        elif node.type == lo.DIAG_VEC:
+            return [y[data]]
+        elif node.type == lo.MUL_ELEM:
+            return [data*y]
+        elif node.type == lo.DIV:
+            return [y/data]
+        elif node.type == lo.MUL:
+            const, arg_shape = data
+            y = np.reshape(y, (const.shape[0], arg_shape[1]), order='F')
+            return [np.ravel(const.T.dot(y), order='F')]
+        elif node.type == lo.RMUL:
+            const, arg_shape = data
+            y = np.reshape(y, (arg_shape[0], const.shape[1]), order='F')
+            return [np.ravel(const.dot(y.T).T, order='F')]
+        elif node.type == lo.CONV:
+            return [_fftconvolve(y, data[::-1], mode='valid')]
+        elif node.type == lo.KRON:
+            lh_rows, lh_cols = data.shape
+            rh_rows, rh_cols = node.args[0].shape
+            y = np.reshape(y, (lh_rows*rh_rows, lh_cols*rh_cols), order='F')
+            y = np.reshape(y, (lh_rows, rh_rows, lh_cols, rh_cols))
+            return [np.ravel(np.einsum('ij,iajb->ab', data, y), order='F')]
+        elif node.type == lo.HSTACK:
+            return np.split(y, np.cumsum(arg_sizes)[:-1])
+        else:
+            # VSTACK.
+            rows = node.shape[0]
+            y = np.reshape(y, (rows, -1), order='F')
+            cols = y.shape[1]
+            row_splits = np.cumsum([size//cols for size in arg_sizes])[:-1]
+            return [np.ravel(block, order='F')
+                    for block in np.split(y, row_splits, axis=0)]
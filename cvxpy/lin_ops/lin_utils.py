@@ -139,6 +139,9 @@ def is_scalar(operator):
 def is_const(operator):
     """Returns whether a LinOp is constant.
 
+    Parameters are constant for the purpose of forming products; their
+    values are substituted before or when the problem data is built.
+
     Parameters
     ----------
     operator : LinOp
@@ -146,9 +149,10 @@ def is_const(operator):
 
     Returns
     -------
-        True if the LinOp is a constant, False otherwise.
+        True if the LinOp is a constant or a parameter, False otherwise.
     """
-    return operator.type in [lo.SCALAR_CONST, lo.SPARSE_CONST, lo.DENSE_CONST]
+    return operator.type in [lo.SCALAR_CONST, lo.SPARSE_CONST, lo.DENSE_CONST,
+                             lo.PARAM]
 
 
 def sum_expr(operators):
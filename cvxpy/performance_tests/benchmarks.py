@@ -0,0 +1,329 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Benchmarks for tracking the performance of CVXPY over time.
+
+The benchmarks follow the conventions of airspeed velocity (asv): each
+class has ``params`` and ``param_names``, a ``setup`` method that receives
+one combination of parameters, and methods prefixed ``time_`` (timed),
+``peakmem_`` (peak memory measured) or ``track_`` (returning the value to
+record). They can therefore be run by asv, or without any dependency by
+this module, which writes the results as JSON:
+
+    python -m cvxpy.performance_tests.benchmarks -o results.json
+
+This runner reports the best of several timings, calling setup again
+before each of them as asv does with ``number = 1``, and measures peak
+memory as the high-water mark of the allocations traced by tracemalloc.
+
+Only open-source solvers (ECOS, SCS and OSQP) are used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import cvxpy as cvx
+from cvxpy.transforms.separable_problems import get_separable_problems
+
+
+def lp(n):
+    np.random.seed(0)
+    A = np.random.randn(n, n)
+    x = cvx.Variable(n)
+    return cvx.Problem(cvx.Minimize(np.ones(n)*x),
+                       [A*x <= np.ones(n), x >= -1])
+
+
+def qp(n):
+    np.random.seed(0)
+    A = np.random.randn(2*n, n)
+    x = cvx.Variable(n)
+    return cvx.Problem(cvx.Minimize(cvx.sum_squares(A*x - 1)),
+                       [x >= 0, cvx.sum(x) <= 1])
+
+
+def socp(n):
+    np.random.seed(0)
+    A = np.random.randn(n, n)
+    x = cvx.Variable(n)
+    cons = [cvx.norm(A[i]*x + 1) <= 10 for i in range(n)]
+    return cvx.Problem(cvx.Minimize(cvx.sum(x)), cons)
+
+
+def sdp(n):
+    np.random.seed(0)
+    C = np.random.randn(n, n)
+    X = cvx.Variable((n, n), PSD=True)
+    return cvx.Problem(cvx.Minimize(cvx.trace(C*X)), [cvx.diag(X) == 1])
+
+
+def exp_cone(n):
+    np.random.seed(0)
+    X = np.random.randn(10*n, 10)
+    y = np.sign(np.random.randn(10*n))
+    w = cvx.Variable(10)
+    loss = cvx.sum(cvx.logistic(-cvx.multiply(y, X*w)))
+    return cvx.Problem(cvx.Minimize(loss + cvx.norm(w, 1)))
+
+
+def control(n):
+    """Optimal control over n time steps; compiling it is dominated by
+       slicing the state and input trajectories.
+    """
+    np.random.seed(0)
+    A = 0.1*np.random.randn(10, 10)
+    B = np.random.randn(10, 5)
+    x = cvx.Variable((10, n + 1))
+    u = cvx.Variable((5, n))
+    cons = [x[:, 0] == 1]
+    for t in range(n):
+        cons += [x[:, t + 1] == A*x[:, t] + B*u[:, t],
+                 cvx.norm(u[:, t], 'inf') <= 1]
+    return cvx.Problem(cvx.Minimize(cvx.sum_squares(x) + cvx.sum_squares(u)),
+                       cons)
+
+
+# Problem families and the solver whose data they are compiled for.
+PROBLEMS = {
+    'lp': (lp, cvx.ECOS),
+    'qp': (qp, cvx.OSQP),
+    'socp': (socp, cvx.ECOS),
+    'sdp': (sdp, cvx.SCS),
+    'exp_cone': (exp_cone, cvx.ECOS),
+    # SCS orders the arguments of exponential cones differently.
+    'exp_cone_scs': (exp_cone, cvx.SCS),
+    'control': (control, cvx.ECOS),
+}
+
+
+class Compile(object):
+    """Compile time versus problem size.
+
+    A problem caches its compiled data, so each timing compiles a new
+    problem, built by setup.
+    """
+    params = (sorted(PROBLEMS), [10, 100, 1000])
+    param_names = ['problem', 'size']
+    # Time a single compilation per setup, without warming up.
+    number = 1
+    warmup_time = 0
+
+    def setup(self, problem, size):
+        if problem == 'sdp':
+            # The number of scalar variables grows quadratically.
+            size = int(np.sqrt(size)) + 1
+        make_problem, self.solver = PROBLEMS[problem]
+        self.problem = make_problem(size)
+
+    def time_get_problem_data(self, problem, size):
+        self.problem.get_problem_data(self.solver)
+
+    def peakmem_get_problem_data(self, problem, size):
+        self.problem.get_problem_data(self.solver)
+
+
+class Resolve(object):
+    """Latency of solving again after changing parameter values.
+    """
+    params = ([cvx.ECOS, cvx.OSQP], [10, 100])
+    param_names = ['solver', 'size']
+
+    def setup(self, solver, size):
+        np.random.seed(0)
+        A = np.random.randn(2*size, size)
+        self.b = cvx.Parameter(2*size)
+        self.gamma = cvx.Parameter(nonneg=True, value=1)
+        x = cvx.Variable(size)
+        self.problem = cvx.Problem(cvx.Minimize(
+            cvx.sum_squares(A*x - self.b) + self.gamma*cvx.norm(x, 1)))
+        self.b.value = np.random.randn(2*size)
+        self.problem.solve(solver=solver)
+
+    def time_resolve(self, solver, size):
+        self.b.value = -self.b.value
+        self.gamma.value = 2 - self.gamma.value
+        self.problem.solve(solver=solver)
+
+    def time_resolve_raw(self, solver, size):
+        self.b.value = -self.b.value
+        self.gamma.value = 2 - self.gamma.value
+        self.problem.solve(solver=solver, return_raw=True)
+
+
+class Separable(object):
+    """Scaling of splitting a problem into independent subproblems.
+    """
+    params = [10, 100, 1000]
+    param_names = ['blocks']
+
+    def setup(self, blocks):
+        xs = [cvx.Variable(2) for _ in range(blocks)]
+        obj = cvx.Minimize(sum(cvx.sum_squares(x - i) for i, x in enumerate(xs)))
+        self.problem = cvx.Problem(obj, [x >= 0 for x in xs])
+
+    def time_get_separable_problems(self, blocks):
+        get_separable_problems(self.problem)
+
+
+class Import(object):
+    """Time to import cvxpy in a fresh interpreter.
+    """
+    def track_import_time(self):
+        code = ("import time; t0 = time.time(); import cvxpy; "
+                "print(time.time() - t0)")
+        return float(subprocess.check_output([sys.executable, '-c', code]))
+    track_import_time.unit = 'seconds'
+
+
+BENCHMARKS = [Compile, Resolve, Separable, Import]
+
+
+def _param_combinations(bench):
+    params = getattr(bench, 'params', [])
+    if not params:
+        return [()]
+    if not isinstance(params, tuple):
+        params = (params,)
+    return list(itertools.product(*params))
+
+
+def _setup(bench, method, args):
+    """Returns the method of a new instance of bench, set up for args.
+    """
+    instance = bench()
+    if hasattr(instance, 'setup'):
+        instance.setup(*args)
+    return getattr(instance, method)
+
+
+def _peak_memory(func, args):
+    """Returns the peak memory allocated by func, in bytes.
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(names=None, repeat=3, max_size=None):
+    """Runs the benchmarks.
+
+    Parameters
+    ----------
+    names : list, optional
+        Run only the benchmarks whose qualified name ("Class.method")
+        contains one of these strings.
+    repeat : int, optional
+        The number of timings taken; the best is reported.
+    max_size : int, optional
+        Skip parameter combinations with a numeric parameter above this.
+
+    Returns
+    -------
+    list
+        A dict per measurement, with keys "name", "params", "metric",
+        "value" and "unit".
+    """
+    results = []
+    for bench in BENCHMARKS:
+        methods = sorted(m for m in dir(bench)
+                         if m.split('_')[0] in ('time', 'peakmem', 'track'))
+        for method in methods:
+            name = '%s.%s' % (bench.__name__, method)
+            if names and not any(n in name for n in names):
+                continue
+            param_names = getattr(bench, 'param_names', [])
+            for args in _param_combinations(bench):
+                if max_size is not None and any(
+                        isinstance(a, int) and a > max_size for a in args):
+                    continue
+                kind = method.split('_')[0]
+                if kind == 'time':
+                    timings = []
+                    for _ in range(repeat):
+                        func = _setup(bench, method, args)
+                        start = time.time()
+                        func(*args)
+                        timings.append(time.time() - start)
+                    value, unit = min(timings), 'seconds'
+                elif kind == 'peakmem':
+                    func = _setup(bench, method, args)
+                    value, unit = _peak_memory(func, args), 'bytes'
+                else:
+                    values = []
+                    for _ in range(repeat):
+                        func = _setup(bench, method, args)
+                        values.append(func(*args))
+                    value = min(values)
+                    unit = getattr(func, 'unit', None)
+                results.append({'name': name,
+                                'params': dict(zip(param_names, args)),
+                                'metric': kind,
+                                'value': value,
+                                'unit': unit})
+    return results
+
+
+def environment():
+    """Returns a description of the machine and library versions.
+    """
+    return {'cvxpy': cvx.__version__,
+            'numpy': np.__version__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'installed_solvers': cvx.installed_solvers(),
+            'date': datetime.datetime.utcnow().isoformat()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the CVXPY benchmarks and write the results as JSON.")
+    parser.add_argument('-o', '--output',
+                        help="The file to write; defaults to stdout.")
+    parser.add_argument('-b', '--bench', action='append',
+                        help="Run only the benchmarks matching this name.")
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('--max-size', type=int,
+                        help="Skip the problems larger than this size.")
+    args = parser.parse_args(argv)
+    report = {'environment': environment(),
+              'results': run(args.bench, args.repeat, args.max_size)}
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from cvxpy.performance_tests import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run(self):
+        """Run the smallest instance of every benchmark.
+        """
+        results = benchmarks.run(repeat=1, max_size=10)
+        names = {result['name'] for result in results}
+        for bench in benchmarks.BENCHMARKS:
+            self.assertTrue(any(name.startswith(bench.__name__ + '.')
+                                for name in names))
+        for result in results:
+            self.assertTrue(result['value'] > 0)
+            self.assertTrue(all(not isinstance(v, int) or v <= 10
+                                for v in result['params'].values()))
+        # The results are machine-readable.
+        self.assertEqual(json.loads(json.dumps(results)), results)
+
+    def test_compile_fresh_problem(self):
+        """Each timing of Compile compiles a problem that was never compiled.
+        """
+        problems = []
+        setup = benchmarks.Compile.setup
+
+        def record_setup(self, problem, size):
+            setup(self, problem, size)
+            problems.append(self.problem)
+        with mock.patch.object(benchmarks.Compile, 'setup', record_setup):
+            benchmarks.run(['Compile.time'], repeat=3, max_size=10)
+        self.assertEqual(len(problems), 3*len(benchmarks.PROBLEMS))
+        self.assertEqual(len(set(map(id, problems))), len(problems))
+
+    def test_exp_cone(self):
+        """Every sample of the logistic regression gives two exponential cones.
+        """
+        for name in ['exp_cone', 'exp_cone_scs']:
+            make_problem, solver = benchmarks.PROBLEMS[name]
+            data = make_problem(10).get_problem_data(solver)[0]
+            self.assertEqual(data["dims"].exp, 2*100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import subprocess
+import sys
+import unittest
+
+
+# Modules that are slow to import and should only be imported on first use.
+DEFERRED_MODULES = ['ecos', 'scs', 'superscs', 'osqp', 'cvxopt', 'mosek',
+                    'gurobipy', 'cplex', 'xpress', 'multiprocess']
+
+
+def run_python(code):
+    """Runs code in a fresh interpreter and returns its output.
+    """
+    return subprocess.check_output([sys.executable, '-c', code]).decode()
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_deferred_imports(self):
+        """Test that import cvxpy does not import the solvers.
+        """
+        code = ("import sys; import cvxpy; cvxpy.installed_solvers(); "
+                "print(' '.join(m for m in %r if m in sys.modules))"
+                % DEFERRED_MODULES)
+        self.assertEqual(run_python(code).split(), [])
+
+    def test_deferred_solver_probing(self):
+        """Test that import cvxpy does not look for the solvers.
+        """
+        code = ("import cvxpy; "
+                "from cvxpy.reductions.solvers import defines; "
+                "print(defines._INSTALLED_SOLVERS); "
+                "print(cvxpy.ECOS in defines.INSTALLED_SOLVERS)")
+        self.assertEqual(run_python(code).split(), ['None', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,10 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import numpy as np
+
 import cvxpy.settings as s
 from cvxpy.error import DCPError, SolverError
 # from cvxpy.expressions.variables import Bool, Int
 from cvxpy.problems.objective import Minimize, Maximize
+from cvxpy.reductions.matrix_stuffing import MatrixStuffing
 from cvxpy.reductions.solvers.solving_chain import construct_solving_chain
 from cvxpy.interface.matrix_utilities import scalar_value
 
@@ -28,8 +31,8 @@ from cvxpy.interface.matrix_utilities import scalar_value
 import cvxpy  # noqa
 import cvxpy.constraints.zero as eqc
 import cvxpy.utilities as u
+from cvxpy.utilities import profiling
 from collections import namedtuple
-import multiprocess as multiprocessing
 
 
 SolveResult = namedtuple(
@@ -37,6 +40,17 @@ SolveResult = namedtuple(
     ['opt_value', 'status', 'primal_values', 'dual_values'])
 
 
+def _solver_error(chain):
+    """Returns the error raised when the solver of a chain fails.
+    """
+    return SolverError(
+        "Solver '%s' failed. " % chain.solver.name() +
+        "Try another solver or solve with verbose=True for more information. " +
+        "Try recentering the problem data around 0 and rescaling " +
+        "to reduce the dynamic range."
+    )
+
+
 class Problem(u.Canonical):
     """A convex optimization problem.
 
@@ -60,21 +74,38 @@ class Problem(u.Canonical):
         # Check that objective is Minimize or Maximize.
         if not isinstance(objective, (Minimize, Maximize)):
             raise DCPError("Problem objective must be Minimize or Maximize.")
+        self._init(objective, [c for c in constraints])
+
+    @classmethod
+    def _from_reduction(cls, objective, constraints):
+        """Creates a problem output by a reduction.
+
+        The objective is not checked, and the problem takes ownership of the
+        list of constraints rather than copying it.
+        """
+        problem = cls.__new__(cls)
+        problem._init(objective, constraints)
+        return problem
+
+    def _init(self, objective, constraints):
         # Constraints and objective are immutable.
         self._objective = objective
-        self._constraints = [c for c in constraints]
-        # Cache the variables as a list.
-        self._vars = self._variables()
+        self._constraints = constraints
+        # The variables and size metrics are computed when first accessed.
+        self._vars = None
+        self._size_metrics = None
         self._value = None
         self._status = None
         # The solving chain with which to solve the problem
         self._solving_chain = None
         # List of separable (sub)problems
         self._separable_problems = None
-        # Information about the shape of the problem and its constituent parts
-        self._size_metrics = SizeMetrics(self)
         # Benchmarks reported by the solver:
         self._solver_stats = None
+        # Statistics about the most recent compilation:
+        self._compilation_stats = None
+        # Profile of the most recent solve with profile=True:
+        self._profiler = None
         self.args = [self._objective, self._constraints]
         # Cache for warm start.
         self._solver_cache = {}
@@ -143,6 +174,8 @@ class Problem(u.Canonical):
         list of :class:`~cvxpy.expressions.variable.Variable`
             A list of the variables in the problem.
         """
+        if self._vars is None:
+            self._vars = self._variables()
         return self._vars
 
     def _variables(self):
@@ -201,6 +234,8 @@ class Problem(u.Canonical):
     def size_metrics(self):
         """:class:`~cvxpy.problems.problem.SizeMetrics` : Information about the problem's size.
         """
+        if self._size_metrics is None:
+            self._size_metrics = SizeMetrics(self)
         return self._size_metrics
 
     @property
@@ -209,6 +244,20 @@ class Problem(u.Canonical):
         """
         return self._solver_stats
 
+    @property
+    def compilation_stats(self):
+        """:class:`~cvxpy.problems.problem.CompilationStats` : Information about the
+        most recent compilation of the problem.
+        """
+        return self._compilation_stats
+
+    @property
+    def profiler(self):
+        """:class:`~cvxpy.utilities.profiling.Profiler` : The profile of the
+        most recent solve with ``profile=True``.
+        """
+        return self._profiler
+
     def solve(self, *args, **kwargs):
         """Solves the problem using the specified method.
 
@@ -260,7 +309,7 @@ class Problem(u.Canonical):
         """
         cls.REGISTERED_SOLVE_METHODS[name] = func
 
-    def get_problem_data(self, solver):
+    def get_problem_data(self, solver, presolve=False):
         """Returns the problem data used in the call to the solver.
 
         When a problem is solved, a chain of reductions, called a
@@ -284,6 +333,9 @@ class Problem(u.Canonical):
         ----------
         solver : str
             The solver the problem data is for.
+        presolve : bool, optional
+            Whether to remove redundant rows and fixed variables from the
+            data.
 
         Returns
         -------
@@ -295,10 +347,11 @@ class Problem(u.Canonical):
             The inverse data generated by the chain.
         """
         try:
-            solving_chain = construct_solving_chain(self, solver)
+            solving_chain = construct_solving_chain(self, solver, presolve)
         except Exception as e:
             raise e
         data, inv_data = solving_chain.apply(self)
+        self._compilation_stats = CompilationStats(inv_data)
         return data, solving_chain, inv_data
 
     def _solve(self,
@@ -306,11 +359,14 @@ class Problem(u.Canonical):
                ignore_dcp=False,
                warm_start=True,
                verbose=False,
-               parallel=False, **kwargs):
+               parallel=False,
+               presolve=False,
+               return_raw=False,
+               profile=False, **kwargs):
         """Solves a DCP compliant optimization problem.
 
         Saves the values of primal and dual variables in the variable
-        and constraint objects, respectively.
+        and constraint objects, respectively, unless return_raw is True.
 
         Parameters
         ----------
@@ -326,6 +382,16 @@ class Problem(u.Canonical):
             Overrides the default of hiding solver output.
         parallel : bool, optional
             If problem is separable, solve in parallel.
+        presolve : bool, optional
+            Remove redundant constraint rows and fixed variables before
+            calling the solver? Only applies to cone programs.
+        return_raw : bool, optional
+            Return a :class:`~cvxpy.problems.problem.RawResult` holding the
+            solution instead of saving it in the problem, variables and
+            constraints. Cannot be combined with parallel.
+        profile : bool, optional
+            Record where the time of the solve goes, by reduction and atom
+            type, and in cvxcore, in problem.profiler.
         kwargs : dict, optional
             A dict of options that will be passed to the specific solver.
             In general, these options will override any default settings
@@ -333,11 +399,23 @@ class Problem(u.Canonical):
 
         Returns
         -------
-        float
+        float or RawResult
             The optimal value for the problem, or a string indicating
             why the problem could not be solved.
         """
+        if profile:
+            with profiling.profiling() as profiler:
+                self._profiler = profiler
+                with profiler.frame("solve"):
+                    return self._solve(solver, ignore_dcp, warm_start,
+                                       verbose, parallel, presolve,
+                                       return_raw, **kwargs)
+        profiler = profiling.PROFILER
+
         if parallel:
+            if return_raw:
+                raise ValueError("return_raw is not supported when solving "
+                                 "in parallel.")
             from cvxpy.transforms.separable_problems import get_separable_problems
             self._separable_problems = (get_separable_problems(self))
             if len(self._separable_problems) > 1:
@@ -346,21 +424,39 @@ class Problem(u.Canonical):
 
         # If a previous chain does not exist, or if the solver is
         # specified and it does not match the solver used for the previous
-        # solve, then construct a new solving chain.
+        # solve, or if presolve is toggled, then construct a new solving
+        # chain.
         if (self._solving_chain is None
                 or (solver is not None
-                    and self._solving_chain.solver.name != solver)):
+                    and self._solving_chain.solver.name() != solver)
+                or presolve != self._solving_chain.presolve):
             try:
-                self._solving_chain = construct_solving_chain(self,
-                                                              solver=solver)
+                self._solving_chain = construct_solving_chain(
+                    self, solver=solver, presolve=presolve)
             except Exception as e:
                 raise e
 
+        if profiler is not None:
+            start = profiler.start("compile")
         data, inverse_data = self._solving_chain.apply(self)
+        self._compilation_stats = CompilationStats(inverse_data)
+        if profiler is not None:
+            profiler.stop(start)
+            start = profiler.start("solve_via_data")
         solution = self._solving_chain.solve_via_data(self, data, warm_start, verbose,
                                                       kwargs)
-        self.unpack_results(solution, self._solving_chain, inverse_data)
-        return self.value
+        if profiler is not None:
+            profiler.stop(start)
+            start = profiler.start("unpack_results")
+        if return_raw:
+            result = RawResult(self, solution, self._solving_chain,
+                               inverse_data)
+        else:
+            self.unpack_results(solution, self._solving_chain, inverse_data)
+            result = self.value
+        if profiler is not None:
+            profiler.stop(start)
+        return result
 
     def _parallel_solve(self,
                         solver=None,
@@ -408,6 +504,8 @@ class Problem(u.Canonical):
             dual_values = [constr.dual_value for constr in problem.constraints]
             return SolveResult(opt_value, status, primal_values, dual_values)
 
+        # multiprocess is slow to import, so it is imported on first use.
+        import multiprocess as multiprocessing
         pool = multiprocessing.Pool(processes=multiprocessing.cpu_count())
         solve_results = pool.map(_solve_problem, self._separable_problems)
         pool.close()
@@ -452,6 +550,11 @@ class Problem(u.Canonical):
             The inverse data returned by applying the chain to the problem.
         """
         solution = chain.invert(solution, inverse_data)
+        self._save_solution(solution, chain)
+
+    def _save_solution(self, solution, chain):
+        """Saves a solution to the problem in the problem state.
+        """
         self._value = solution.opt_val
         if solution.status in s.SOLUTION_PRESENT:
             for v in self.variables():
@@ -465,12 +568,7 @@ class Problem(u.Canonical):
             for constr in self.constraints:
                 constr.save_value(None)
         else:
-            raise SolverError(
-                "Solver '%s' failed. " % chain.solver.name() +
-                "Try another solver or solve with verbose=True for more information. " +
-                "Try recentering the problem data around 0 and rescaling " +
-                "to reduce the dynamic range."
-            )
+            raise _solver_error(chain)
         self._status = solution.status
         self._solver_stats = SolverStats(solution.attr, chain.solver.name())
 
@@ -562,6 +660,238 @@ class SolverStats(object):
             self.num_iters = results_dict[s.NUM_ITERS]
 
 
+class RawResult(object):
+    """The solution of a problem, as returned by
+    ``Problem.solve(return_raw=True)``.
+
+    The solution is not saved in the problem, variables and constraints.
+    Only the solver's output is unpacked on construction, into the stacked
+    primal and dual vectors; the values of the variables and duals of the
+    problem are recovered the first time they are read. Call save() to
+    save the solution as a regular solve would.
+
+    Attributes
+    ----------
+    raw : object
+        The output of the solver.
+    inverse_data : list
+        The inverse data of the reductions of the solving chain.
+    status : str
+        The status of the solve.
+    primal : NumPy.ndarray
+        The stacked variables of the problem data passed to the solver (after
+        undoing presolve), or None if there is no solution.
+    dual : NumPy.ndarray
+        The stacked duals of the constraints of the problem data passed to
+        the solver (after undoing presolve), or None if there are none. It
+        is a view of the solver's output if the solver returns the duals as
+        slices of one vector.
+    solver_stats : SolverStats
+        Information returned by the solver.
+    """
+    def __init__(self, problem, raw, chain, inverse_data):
+        self.raw = raw
+        self.inverse_data = inverse_data
+        self._problem = problem
+        self._chain = chain
+        self._solution = None
+        self._index_map = None
+        self._dual_index_map = None
+        # Invert the reductions after matrix stuffing, which only unpack the
+        # solver's output; the others are inverted on demand.
+        self._num_lazy = 0
+        for i, reduction in enumerate(chain.reductions):
+            if isinstance(reduction, MatrixStuffing):
+                self._num_lazy = i + 1
+        solution = raw
+        for reduction, inv in reversed(list(zip(
+                chain.reductions[self._num_lazy:],
+                inverse_data[self._num_lazy:]))):
+            solution = reduction.invert(solution, inv)
+        if solution.status not in s.SOLUTION_PRESENT + s.INF_OR_UNB:
+            raise _solver_error(chain)
+        self._stuffed = solution
+        self.status = solution.status
+        self.solver_stats = SolverStats(solution.attr, chain.solver.name())
+        self.primal = None
+        self.dual = None
+        if self._num_lazy and solution.status in s.SOLUTION_PRESENT:
+            self.primal = list(solution.primal_vars.values())[0]
+            if solution.dual_vars:
+                stuffing_inv = inverse_data[self._num_lazy - 1]
+                self.dual = _stack_values(
+                    [solution.dual_vars[new_con]
+                     for new_con, _, _ in stuffing_inv.dual_table])
+
+    def _invert(self):
+        """Returns the solution to the problem, inverting the remaining
+        reductions the first time.
+        """
+        if self._solution is None:
+            solution = self._stuffed
+            for reduction, inv in reversed(list(zip(
+                    self._chain.reductions[:self._num_lazy],
+                    self.inverse_data[:self._num_lazy]))):
+                solution = reduction.invert(solution, inv)
+            self._solution = solution
+        return self._solution
+
+    @property
+    def value(self):
+        """float : The optimal value, or None if there is none.
+        """
+        opt_val = self._invert().opt_val
+        return None if opt_val is None else scalar_value(opt_val)
+
+    @property
+    def primal_values(self):
+        """dict : Maps the id of each variable of the problem to its value.
+        """
+        return self._invert().primal_vars
+
+    @property
+    def dual_values(self):
+        """dict : Maps the id of each constraint of the problem to its dual
+        value.
+        """
+        return self._invert().dual_vars
+
+    @property
+    def index_map(self):
+        """dict : Maps the id of each variable stored in primal as is to a
+        tuple (start, stop, shape) of its entries, in column-major order.
+
+        The variables that the reductions transformed (e.g., by projecting
+        onto the variable's attributes or recombining complex parts) are
+        not indexed.
+        """
+        if self._index_map is None:
+            self._index_map = {}
+            if self.primal is not None:
+                var_table = self.inverse_data[self._num_lazy - 1].var_table
+                for var_id, start, stop, shape in var_table:
+                    value = self.primal_values.get(var_id)
+                    if (isinstance(value, np.ndarray)
+                            and np.may_share_memory(value, self.primal)):
+                        self._index_map[var_id] = (start, stop, shape)
+        return self._index_map
+
+    @property
+    def dual_index_map(self):
+        """dict : Maps the id of each constraint whose dual is stored in dual
+        as is to a tuple (start, stop, shape) of its entries, in column-major
+        order.
+        """
+        if self._dual_index_map is None:
+            self._dual_index_map = {}
+            if self.dual is not None:
+                # The stuffed duals, keyed by the memory they occupy.
+                stuffing_inv = self.inverse_data[self._num_lazy - 1]
+                entries = {}
+                start = 0
+                for new_con, _, _ in stuffing_inv.dual_table:
+                    dual = self._stuffed.dual_vars[new_con]
+                    stop = start + np.size(dual)
+                    entries[_memory_key(dual)] = (start, stop)
+                    start = stop
+                for con_id, dual in self.dual_values.items():
+                    key = _memory_key(dual)
+                    if key in entries:
+                        start, stop = entries[key]
+                        self._dual_index_map[con_id] = (start, stop,
+                                                        np.shape(dual))
+        return self._dual_index_map
+
+    def primal_value(self, variable):
+        """Returns the value of a variable of the problem, or None.
+        """
+        if variable.id in self.index_map:
+            start, stop, shape = self.index_map[variable.id]
+            return np.reshape(self.primal[start:stop], shape, order='F')
+        return self.primal_values.get(variable.id)
+
+    def dual_value(self, constraint):
+        """Returns the dual value of a constraint of the problem, or None.
+        """
+        if constraint.id in self.dual_index_map:
+            start, stop, shape = self.dual_index_map[constraint.id]
+            if shape == ():
+                return self.dual[start]
+            return np.reshape(self.dual[start:stop], shape, order='F')
+        return self.dual_values.get(constraint.id)
+
+    def save(self):
+        """Saves the solution in the problem, variables and constraints.
+        """
+        self._problem._save_solution(self._invert(), self._chain)
+
+
+def _memory_key(value):
+    """Returns a key shared by a NumPy array and the views of it with the
+    same entries, or by a scalar and itself.
+    """
+    if isinstance(value, np.ndarray):
+        return (value.__array_interface__['data'][0], value.size)
+    return id(value)
+
+
+def _stack_values(values):
+    """Stacks scalars and NumPy arrays into one vector.
+
+    If the values are consecutive slices of one vector, the vector
+    returned is a view of it.
+    """
+    arrays = [np.asarray(value) for value in values]
+    if not arrays:
+        return np.zeros(0)
+    base = arrays[0].base
+    if (isinstance(base, np.ndarray) and base.ndim == 1
+            and base.flags.c_contiguous
+            and all(array.base is base and array.dtype == base.dtype
+                    and array.flags.c_contiguous for array in arrays)):
+        itemsize = base.itemsize
+        addresses = [array.__array_interface__['data'][0]
+                     for array in arrays]
+        if all(address + array.nbytes == next_address
+               for address, array, next_address
+               in zip(addresses, arrays, addresses[1:])):
+            start = (addresses[0] - base.__array_interface__['data'][0])
+            start //= itemsize
+            size = sum(array.size for array in arrays)
+            return base[start:start + size]
+    return np.concatenate([np.ravel(array) for array in arrays])
+
+
+class CompilationStats(object):
+    """Reports information about the compilation of a problem by a
+    solving chain.
+
+    Attributes
+    ----------
+    num_canon_exprs : int
+        The number of distinct expressions canonicalized.
+    num_shared_exprs : int
+        The number of references to expressions that reused an existing
+        canonicalization instead of canonicalizing the expression again,
+        e.g., because a subexpression is shared by the objective and a
+        constraint.
+    num_rows_eliminated : int
+        The number of constraint rows removed by presolve.
+    num_cols_eliminated : int
+        The number of variables fixed and removed by presolve.
+    """
+    def __init__(self, inverse_data):
+        self.num_canon_exprs = 0
+        self.num_shared_exprs = 0
+        self.num_rows_eliminated = 0
+        self.num_cols_eliminated = 0
+        for inv in inverse_data:
+            self.num_canon_exprs += getattr(inv, "num_canon_exprs", 0)
+            self.num_shared_exprs += getattr(inv, "num_shared_exprs", 0)
+            self.num_rows_eliminated += getattr(inv, "num_rows_eliminated", 0)
+            self.num_cols_eliminated += getattr(inv, "num_cols_eliminated", 0)
+
+
 # TODO(akshayka): Consider moving this to another file
 class SizeMetrics(object):
     """Reports various metrics regarding the problem.
@@ -19,7 +19,24 @@ from cvxpy.expressions import cvxtypes
 from cvxpy.expressions.expression import Expression
 from cvxpy.expressions.constants import Constant
 from cvxpy.reductions import InverseData, Reduction, Solution
-from cvxpy.expressions.constants import CallbackParam
+from cvxpy.expressions.constants import CallbackParam, Parameter
+from cvxpy.utilities import profiling
+from cvxpy.utilities.traversal import post_order
+
+
+class _VariableFree(object):
+    """The result of visiting an expression without variables.
+
+    Attributes
+    ----------
+    canon : Expression
+        The constant or callback parameter that replaces the expression, or
+        None until an expression with variables uses it.
+    """
+    __slots__ = ['canon']
+
+    def __init__(self):
+        self.canon = None
 
 
 class Canonicalization(Reduction):
@@ -33,23 +50,38 @@ class Canonicalization(Reduction):
     # explicit or eliminated.
     def apply(self, problem):
         inverse_data = InverseData(problem)
+        # Canonicalizations are memoized by node across the objective and
+        # the constraints, so each shared subexpression yields a single
+        # canonical expression and a single set of auxiliary constraints.
+        memo = {}
+        canon_objective, canon_constraints, num_refs = self._canonicalize(
+            problem.objective, memo)
 
-        canon_objective, canon_constraints = self.canonicalize_tree(
-            problem.objective)
-
+        seen = set()
         for constraint in problem.constraints:
             # canon_constr is the constraint rexpressed in terms of
             # its canonicalized arguments, and aux_constr are the constraints
             # generated while canonicalizing the arguments of the original
             # constraint
-            canon_constr, aux_constr = self.canonicalize_tree(
-                constraint)
-            canon_constraints += aux_constr + [canon_constr]
+            canon_constr, aux_constr, refs = self._canonicalize(
+                constraint, memo)
+            num_refs += refs
+            canon_constraints += aux_constr
+            if canon_constr.id not in seen:
+                seen.add(canon_constr.id)
+                canon_constraints.append(canon_constr)
             inverse_data.cons_id_map.update({constraint.id:
                                              canon_constr.id})
 
-        new_problem = problems.problem.Problem(canon_objective,
-                                               canon_constraints)
+        # Variable-free subexpressions that no expression with variables
+        # uses were never canonicalized.
+        num_canon_exprs = sum(not isinstance(canon, _VariableFree) or
+                              canon.canon is not None
+                              for _, canon in memo.values())
+        inverse_data.num_canon_exprs = num_canon_exprs
+        inverse_data.num_shared_exprs = num_refs - num_canon_exprs
+        new_problem = problems.problem.Problem._from_reduction(
+            canon_objective, canon_constraints)
         return new_problem, inverse_data
 
     def invert(self, solution, inverse_data):
@@ -61,36 +93,141 @@ class Canonicalization(Reduction):
         return Solution(solution.status, solution.opt_val, pvars, dvars,
                         solution.attr)
 
-    def canonicalize_tree(self, expr):
-        # TODO don't copy affine expressions?
-        if type(expr) == cvxtypes.partial_problem():
-            canon_expr, constrs = self.canonicalize_tree(expr.args[0].objective.expr)
-            for constr in expr.args[0].constraints:
-                canon_constr, aux_constr = self.canonicalize_tree(constr)
-                constrs += [canon_constr] + aux_constr
-        else:
-            canon_args = []
-            constrs = []
-            for arg in expr.args:
-                canon_arg, c = self.canonicalize_tree(arg)
-                canon_args += [canon_arg]
-                constrs += c
-            canon_expr, c = self.canonicalize_expr(expr, canon_args)
-            constrs += c
+    def canonicalize_tree(self, expr, memo=None):
+        """Canonicalizes an expression tree bottom-up.
+
+        Subexpressions shared within the tree are canonicalized only once.
+
+        Parameters
+        ----------
+        expr : Expression or Constraint
+            The root of the tree.
+        memo : dict, optional
+            Canonicalizations computed by earlier calls; see
+            ``cvxpy.utilities.traversal.post_order``. Subexpressions found in
+            the memo are not canonicalized again, and their auxiliary
+            constraints are not returned again.
+
+        Returns
+        -------
+        tuple
+            (canonicalized expression, list of auxiliary constraints)
+        """
+        canon_expr, constrs, _ = self._canonicalize(expr, memo)
         return canon_expr, constrs
 
-    def canonicalize_expr(self, expr, args):
-        if isinstance(expr, Expression) and not expr.variables():
+    def _canonicalize(self, expr, memo=None):
+        """Like canonicalize_tree, but also returns the number of references
+           to nodes made while traversing the tree (including the root).
+        """
+        constrs = []
+        num_refs = [1]
+
+        def canon_arg(arg, canon_arg):
+            # Variable-free subexpressions are only replaced by a constant or
+            # a callback parameter when an expression with variables uses
+            # them, and the replacement is computed once.
+            if isinstance(canon_arg, _VariableFree):
+                if canon_arg.canon is None:
+                    canon_arg.canon, _ = self.canonicalize_expr(
+                        arg, arg.args, variable_free=True)
+                return canon_arg.canon
+            return canon_arg
+
+        def visit(node, canon_args):
+            partial_problem = type(node) == cvxtypes.partial_problem()
+            if isinstance(node, Expression) and not partial_problem:
+                # Whether the node has variables is computed bottom-up
+                # from its arguments, so no subtree is traversed again.
+                if node.args:
+                    variable_free = all(isinstance(arg, _VariableFree)
+                                        for arg in canon_args)
+                else:
+                    variable_free = not node.variables()
+                if variable_free:
+                    return _VariableFree()
+            num_refs[0] += len(canon_args)
+            canon_args = [canon_arg(arg, c) for arg, c in
+                          zip(self._canon_children(node), canon_args)]
+            if partial_problem:
+                # canon_args holds the canonicalized objective followed by
+                # the canonicalized constraints of the partial problem.
+                canon_expr = canon_args[0]
+                for canon_constr in canon_args[1:]:
+                    constrs.append(canon_constr)
+                return canon_expr
+            profiler = profiling.PROFILER
+            if profiler is not None:
+                start = profiler.start(type(node).__name__)
+            canon_expr, c = self.canonicalize_expr(node, canon_args,
+                                                   variable_free=False)
+            if profiler is not None:
+                # The output size is the number of scalar entries of the
+                # canonical expression and of the auxiliary constraints.
+                size = getattr(canon_expr, 'size', 0)
+                profiler.stop(start, size + sum(con.size for con in c))
+            constrs.extend(c)
+            return canon_expr
+
+        canon_expr = post_order(expr, visit, self._canon_children, memo)
+        return canon_arg(expr, canon_expr), constrs, num_refs[0]
+
+    @staticmethod
+    def _canon_children(expr):
+        if type(expr) == cvxtypes.partial_problem():
+            return [expr.args[0].objective.expr] + expr.args[0].constraints
+        return expr.args
+
+    def canonicalize_expr(self, expr, args, variable_free=None):
+        """Canonicalizes a single node given its canonicalized arguments.
+
+        Parameters
+        ----------
+        expr : Expression or Constraint
+            The node to canonicalize.
+        args : list
+            The canonicalized arguments of the node.
+        variable_free : bool, optional
+            Whether the node is an expression without variables, if known.
+
+        Returns
+        -------
+        tuple
+            (canonicalized expression, list of auxiliary constraints)
+        """
+        if variable_free is None:
+            variable_free = (isinstance(expr, Expression) and
+                             not expr.variables())
+        if variable_free:
             # Parameterized expressions are evaluated in a subsequent
             # reduction.
-            if expr.parameters():
-                rows, cols = expr.shape
-                param = CallbackParam(lambda: expr.value, (rows, cols))
+            if isinstance(expr, Parameter):
+                return expr, []
+            params = expr.parameters()
+            if params:
+                param = CallbackParam(lambda: expr.value, expr.shape, params)
                 return param, []
-            # Non-parameterized expressions are evaluated immediately.
+            elif isinstance(expr, Constant):
+                return expr, []
+            # Non-parameterized expressions are evaluated immediately. As
+            # they cannot change, the constant is stored on the expression
+            # and reused whenever the expression is canonicalized again.
             else:
-                return Constant(expr.value), []
+                if not hasattr(expr, '_canon_constant'):
+                    expr._canon_constant = Constant(expr.value)
+                return expr._canon_constant, []
         elif type(expr) in self.canon_methods:
             return self.canon_methods[type(expr)](expr, args)
+        # Subtrees left unchanged are returned as is, and the copy of an
+        # expression is reused as long as its canonicalized arguments are
+        # the same objects, so that canonical forms and coefficients carry
+        # over from one compilation to the next.
+        elif all(new is old for new, old in zip(args, expr.args)):
+            return expr, []
         else:
-            return expr.copy(args), []
+            cached = getattr(expr, '_canon_copy', None)
+            if cached is None or any(new is not old for new, old
+                                     in zip(args, cached[0])):
+                cached = (args, expr.copy(args))
+                expr._canon_copy = cached
+            return cached[1], []
@@ -1,4 +1,5 @@
 from cvxpy.reductions.reduction import Reduction
+from cvxpy.utilities import profiling
 
 
 class Chain(Reduction):
@@ -55,7 +56,12 @@ class Chain(Reduction):
         """
         inverse_data = []
         for r in self.reductions:
+            profiler = profiling.PROFILER
+            if profiler is not None:
+                start = profiler.start(type(r).__name__)
             problem, inv = r.apply(problem)
+            if profiler is not None:
+                profiler.stop(start)
             inverse_data.append(inv)
         return problem, inverse_data
 
@@ -50,8 +50,8 @@ class Complex2Real(Reduction):
             if imag_constr is not None:
                 constrs.append(imag_constr)
 
-        new_problem = problems.problem.Problem(real_obj,
-                                               constrs)
+        new_problem = problems.problem.Problem._from_reduction(real_obj,
+                                                               constrs)
         return new_problem, inverse_data
 
     def invert(self, solution, inverse_data):
@@ -75,7 +75,7 @@ class Complex2Real(Reduction):
                         1j*solution.primal_vars[imag_id]
             for cid, cons in inverse_data.id2cons.items():
                 if cons.is_real():
-                    dvars[vid] = solution.dual_vars[cid]
+                    dvars[cid] = solution.dual_vars[cid]
                 elif cons.is_imag():
                     imag_id = inverse_data.real2imag[cid]
                     dvars[cid] = 1j*solution.dual_vars[imag_id]
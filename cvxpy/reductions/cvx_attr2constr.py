@@ -18,8 +18,8 @@ from cvxpy.reductions import Reduction, Solution
 from cvxpy.atoms import diag, reshape
 from cvxpy.expressions.constants import Constant
 from cvxpy.expressions import cvxtypes
-from cvxpy.expressions.variable import Variable, upper_tri_to_full
-import numpy as np
+from cvxpy.expressions.variable import Variable
+from cvxpy.utilities.tri_packing import unpack_lower_tri, upper_tri_to_full
 import scipy.sparse as sp
 
 
@@ -117,7 +117,7 @@ class CvxAttr2Constr(Reduction):
             constr.append(cons.tree_copy(id_objects=id2new_obj))
             cons_id_map[cons.id] = constr[-1].id
         inverse_data = (id2new_var, id2old_var, cons_id_map)
-        return cvxtypes.problem()(obj, constr), inverse_data
+        return cvxtypes.problem()._from_reduction(obj, constr), inverse_data
 
     def invert(self, solution, inverse_data):
         if not inverse_data:
@@ -133,11 +133,8 @@ class CvxAttr2Constr(Reduction):
                     pvars[id] = sp.diags(solution.primal_vars[new_var.id].flatten())
                 elif attributes_present([var], SYMMETRIC_ATTRIBUTES):
                     n = var.shape[0]
-                    value = np.zeros(var.shape)
-                    idxs = np.triu_indices(n)
-                    value[idxs] = solution.primal_vars[new_var.id].flatten()
-                    value += value.T - np.diag(value.diagonal())
-                    pvars[id] = value
+                    pvars[id] = unpack_lower_tri(
+                        solution.primal_vars[new_var.id], n)
                 else:
                     pvars[id] = var.project(solution.primal_vars[new_var.id])
 
@@ -14,8 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import copy
+
 import numpy as np
+import scipy.sparse as sp
 
+from cvxpy import problems
+from cvxpy.error import ParameterError
 from cvxpy.expressions.variable import Variable
 from cvxpy.problems.objective import Minimize
 from cvxpy.reductions.matrix_stuffing import extract_mip_idx, MatrixStuffing
@@ -56,3 +61,171 @@ class ConeMatrixStuffing(MatrixStuffing):
 
         inverse_data.r = R[0]
         return new_obj, x
+
+    def param_cone_prog(self, problem):
+        """Stuffs a problem whose data depends on parameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            A problem accepted by this reduction, with parameters.
+
+        Returns
+        -------
+        ParamConeProg
+            The stuffed problem as a function of the parameters.
+
+        Raises
+        ------
+        ParameterAffineError
+            If the problem data is not affine in the parameters.
+        """
+        stuffed, inverse_data = self.apply(problem)
+        return ParamConeProg(problem, stuffed, inverse_data)
+
+
+class ParamConeProg(object):
+    """A cone program whose data is an affine function of parameters.
+
+    The coefficients of the objective and of the constraints with
+    parameters are stored in a single tensor, so that the problem is stuffed
+    for new values of the parameters with one sparse matrix-vector product
+    instead of compiling it again. The stuffed constraints keep their ids,
+    so the inverse data of the stuffing remains valid.
+
+    Parameters
+    ----------
+    problem : Problem
+        The problem with parameters that was stuffed.
+    stuffed : Problem
+        The problem output by ConeMatrixStuffing.
+    inverse_data : InverseData
+        The inverse data output by ConeMatrixStuffing.
+    """
+
+    def __init__(self, problem, stuffed, inverse_data):
+        self.parameters = problem.parameters()
+        param_offsets = {}
+        param_length = 0
+        for param in self.parameters:
+            param_offsets[param.id] = param_length
+            param_length += param.size
+        self.x = stuffed.variables()[0]
+        self.objective = stuffed.objective
+        self.constraints = stuffed.constraints
+        self.inverse_data = inverse_data
+        N = inverse_data.x_length
+        extractor = CoeffExtractor(inverse_data)
+
+        # The expressions whose coefficients form each argument of each
+        # stuffed constraint.
+        sources = {}
+        for new_id, old_ids, _ in inverse_data.dual_table:
+            if old_ids[0] in inverse_data.merged_cons:
+                # In the order in which they are stacked.
+                old_ids = sorted(old_ids, key=inverse_data.merged_cons.get)
+                sources[new_id] = [[inverse_data.id2cons[old_id].args[0]
+                                    for old_id in old_ids]]
+            else:
+                old_con = inverse_data.id2cons[old_ids[0]]
+                sources[new_id] = [[arg] for arg in old_con.args]
+
+        # The tensors of the blocks of rows, which are stacked vertically.
+        tensors = []
+        num_rows = 0
+        self.has_param_objective = bool(problem.objective.parameters())
+        if self.has_param_objective:
+            tensors.append(extractor.affine_tensor(
+                problem.objective.expr, param_offsets, param_length))
+            num_rows += 1
+        # Positions of the constraints with parameters, and the first row
+        # and shape of each of their arguments.
+        self.param_cons = []
+        for idx, con in enumerate(self.constraints):
+            arg_sources = sources[con.id]
+            if not any(expr.parameters() for exprs in arg_sources
+                       for expr in exprs):
+                continue
+            args = []
+            for exprs, arg in zip(arg_sources, con.args):
+                tensors.append(extractor.affine_tensor(
+                    exprs, param_offsets, param_length))
+                args.append((num_rows, arg.size, arg.shape))
+                num_rows += arg.size
+            self.param_cons.append((idx, args))
+
+        # Only the entries of [A | b] that can be nonzero are stored; the
+        # rows of self.tensor map to the entries (self.rows, self.cols).
+        rows, cols, params, vals = [], [], [], []
+        start = 0
+        for tensor in tensors:
+            size = tensor.shape[0] // (N + 1)
+            col, row = np.divmod(tensor.row, size)
+            rows.append(row + start)
+            cols.append(col)
+            params.append(tensor.col)
+            vals.append(tensor.data)
+            start += size
+        self.shape = (num_rows, N + 1)
+        if tensors:
+            rows, cols, params, vals = [np.concatenate(arr) for arr in
+                                        (rows, cols, params, vals)]
+        else:
+            rows = cols = params = np.zeros(0, dtype=int)
+            vals = np.zeros(0)
+        keys, entries = np.unique(cols.astype(np.int64)*max(num_rows, 1) +
+                                  rows, return_inverse=True)
+        self.cols, self.rows = np.divmod(keys, max(num_rows, 1))
+        self.tensor = sp.csr_matrix((vals, (entries, params)),
+                                    shape=(keys.size, param_length + 1))
+
+    def apply_parameters(self):
+        """Stuffs the problem for the current values of the parameters.
+
+        Returns
+        -------
+        Problem
+            The stuffed problem.
+        InverseData
+            The inverse data of the stuffing.
+
+        Raises
+        ------
+        ParameterError
+            If a parameter does not have a value.
+        """
+        values = []
+        for param in self.parameters:
+            value = param.value
+            if value is None:
+                raise ParameterError("Problem contains unspecified parameters.")
+            values.append(np.ravel(value, order='F'))
+        values.append([1.])
+        data = sp.csr_matrix((self.tensor*np.concatenate(values),
+                              (self.rows, self.cols)), shape=self.shape)
+        N = self.shape[1] - 1
+
+        def coeffs(start, size):
+            block = data[start:start+size]
+            return block[:, :N], block[:, N].toarray().flatten()
+
+        inverse_data = self.inverse_data
+        objective = self.objective
+        if self.has_param_objective:
+            C, R = coeffs(0, 1)
+            c = C.toarray().flatten()
+            objective = Minimize(c.T * self.x + 0)
+            inverse_data = copy.copy(inverse_data)
+            inverse_data.r = R[0]
+
+        constraints = list(self.constraints)
+        for idx, args in self.param_cons:
+            arg_list = []
+            for start, size, shape in args:
+                A, b = coeffs(start, size)
+                arg_list.append(MatrixStuffing.stuffed_arg(A, b, self.x,
+                                                           shape))
+            constraints[idx] = constraints[idx].copy(arg_list)
+        stuffed = problems.problem.Problem._from_reduction(objective,
+                                                           constraints)
+        return stuffed, inverse_data
@@ -0,0 +1,115 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+
+from cvxpy.problems.objective import Minimize
+from cvxpy.reductions.cvx_attr2constr import convex_attributes
+from cvxpy.reductions.inverse_data import InverseData
+from cvxpy.reductions.matrix_stuffing import MatrixStuffing
+from cvxpy.reductions.utilities import are_args_affine
+from cvxpy.utilities.coeff_extractor import CoeffExtractor
+
+
+class MatrixFreeConeProg(object):
+    """A cone program whose coefficients are applied without forming them.
+
+    minimize   c'x + r
+    subject to cone_constr1(A_1*x + b_1, ...)
+               ...
+               cone_constrK(A_i*x + b_i, ...)
+
+    where the [A_1; ...; A_K] stacking the coefficients of the arguments of
+    the constraints is a LinearOperator (see
+    ``cvxpy.lin_ops.lin_operator.LinOpOperator``).
+
+    Attributes
+    ----------
+    c : NumPy.ndarray
+        The coefficients of the objective.
+    r : float
+        The constant term of the objective.
+    A : SciPy LinearOperator
+        The coefficients of the arguments of the constraints, stacked
+        vertically in the order of the constraints and of their arguments.
+    b : NumPy.ndarray
+        The offsets of the arguments of the constraints, stacked likewise.
+    constraints : list
+        The constraints of the problem that was stuffed, which give the
+        type, the arguments and the shapes of each block of rows.
+    """
+
+    def __init__(self, c, r, A, b, constraints):
+        self.c = c
+        self.r = r
+        self.A = A
+        self.b = b
+        self.constraints = constraints
+
+    def constraint_rows(self):
+        """Returns the first row of each argument of each constraint.
+
+        Returns
+        -------
+        list
+            A list of (constraint, list of first rows of its arguments).
+        """
+        rows = []
+        offset = 0
+        for con in self.constraints:
+            starts = []
+            for arg in con.args:
+                starts.append(offset)
+                offset += arg.size
+            rows.append((con, starts))
+        return rows
+
+
+class MatrixFreeStuffing(MatrixStuffing):
+    """Stuffs linear cone problems without forming their coefficients.
+
+    Accepts the same problems as ConeMatrixStuffing, and yields a
+    MatrixFreeConeProg whose coefficient operator evaluates the LinOp trees
+    of the constraints. It is meant for first-order solvers on problems
+    whose coefficients are expensive to form, e.g., with large convolutions
+    or Kronecker products.
+    """
+
+    def accepts(self, problem):
+        return (type(problem.objective) == Minimize
+                and problem.objective.expr.is_affine()
+                and not problem.is_mixed_integer()
+                and not convex_attributes(problem.variables())
+                and are_args_affine(problem.constraints))
+
+    def apply(self, problem):
+        inverse_data = InverseData(problem)
+        extractor = CoeffExtractor(inverse_data)
+        # The objective is a single row, whose coefficients are the adjoint
+        # of the operator applied to one.
+        C, R = extractor.affine_operator(problem.objective.expr)
+        c = C.rmatvec(np.ones(1))
+        inverse_data.r = R[0]
+        args = [arg for con in problem.constraints for arg in con.args]
+        A, b = extractor.affine_operator(args)
+        # The constraints keep their ids; none are merged.
+        inverse_data.merged_cons = {}
+        for con in problem.constraints:
+            inverse_data.cons_id_map[con.id] = con.id
+        self.inversion_tables(inverse_data)
+        inverse_data.minimize = True
+        prog = MatrixFreeConeProg(c, R[0], A, b, problem.constraints)
+        return prog, inverse_data
@@ -3,22 +3,23 @@ from cvxpy.expressions.constants.constant import Constant
 from cvxpy.expressions.constants.parameter import Parameter
 from cvxpy import problems
 from cvxpy.reductions.reduction import Reduction
+from cvxpy.utilities.traversal import post_order
 
 
 def replace_params_with_consts(expr):
-    if isinstance(expr, list):
-        return [replace_params_with_consts(elem) for elem in expr]
-    elif len(expr.parameters()) == 0:
-        return expr
-    elif isinstance(expr, Parameter):
-        if expr.value is None:
-            raise ParameterError("Problem contains unspecified parameters.")
-        return Constant(expr.value)
-    else:
-        new_args = []
-        for arg in expr.args:
-            new_args.append(replace_params_with_consts(arg))
-        return expr.copy(new_args)
+    def visit(node, new_args):
+        if isinstance(node, list):
+            return new_args
+        elif isinstance(node, Parameter):
+            if node.value is None:
+                raise ParameterError("Problem contains unspecified parameters.")
+            return Constant(node.value)
+        # Subtrees without parameters are returned unchanged.
+        elif all(new is old for new, old in zip(new_args, node.args)):
+            return node
+        else:
+            return node.copy(new_args)
+    return post_order(expr, visit)
 
 
 class EvalParams(Reduction):
@@ -70,7 +71,9 @@ class EvalParams(Reduction):
                     constraints.append(type(c)(*(args + data)))
                 else:
                     constraints.append(type(c)(*args))
-        return problems.problem.Problem(objective, constraints), []
+        new_problem = problems.problem.Problem._from_reduction(objective,
+                                                               constraints)
+        return new_problem, []
 
     def invert(self, solution, inverse_data):
         """Returns a solution to the original problem given the inverse_data.
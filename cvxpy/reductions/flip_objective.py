@@ -43,8 +43,8 @@ class FlipObjective(Reduction):
         """
         is_maximize = type(problem.objective) == Maximize
         objective = Minimize if is_maximize else Maximize
-        problem = cvxtypes.problem()(objective(-problem.objective.expr),
-                                     problem.constraints)
+        problem = cvxtypes.problem()._from_reduction(
+            objective(-problem.objective.expr), problem.constraints)
         return problem, []
 
     def invert(self, solution, inverse_data):
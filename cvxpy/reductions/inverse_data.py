@@ -30,6 +30,13 @@ class InverseData(object):
         self.real2imag.update(constr_dict)
         self.id2cons = {cons.id: cons for cons in problem.constraints}
         self.cons_id_map = dict()
+        # Number of distinct nodes canonicalized, and number of additional
+        # references to them that reused an existing canonicalization.
+        self.num_canon_exprs = 0
+        self.num_shared_exprs = 0
+        # Number of rows and columns eliminated by presolve.
+        self.num_rows_eliminated = 0
+        self.num_cols_eliminated = 0
 
     def get_var_offsets(self, variables):
         var_shapes = {}
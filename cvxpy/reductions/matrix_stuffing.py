@@ -22,7 +22,7 @@ from cvxpy.reductions import Reduction, Solution, InverseData
 from cvxpy.utilities.coeff_extractor import CoeffExtractor
 from cvxpy.atoms import reshape
 from cvxpy import problems
-from cvxpy.constraints import SOC, ExpCone
+from cvxpy.constraints import SOC, ExpCone, NonPos, Zero
 from cvxpy.problems.objective import Minimize
 
 
@@ -62,24 +62,110 @@ class MatrixStuffing(Reduction):
         new_obj, new_var = self.stuffed_objective(problem, inverse_data)
         # Form the constraints
         extractor = CoeffExtractor(inverse_data)
+        # Scalar Zero and NonPos constraints on the same variables are
+        # merged into a single constraint of each type, whose coefficients
+        # are extracted at once. The merged constraint takes the place of
+        # the first of them, and stacks them in the order they are listed.
+        keys = [self.merge_key(con) for con in problem.constraints]
+        scalar_cons = {}
+        for con, key in zip(problem.constraints, keys):
+            if key is not None:
+                scalar_cons.setdefault(key, []).append(con)
+        # Map of old constraint id to position in a merged constraint.
+        inverse_data.merged_cons = {}
         new_cons = []
-        for con in problem.constraints:
+        for con, key in zip(problem.constraints, keys):
+            group = scalar_cons.get(key, [])
+            if len(group) > 1:
+                if con is group[0]:
+                    new_cons.append(self.merged_constraint(
+                        group, extractor, new_var, inverse_data))
+                continue
             arg_list = []
             for arg in con.args:
                 A, b = extractor.get_coeffs(arg)
-                arg_list.append(reshape(A*new_var + b, arg.shape))
+                arg_list.append(self.stuffed_arg(A, b, new_var, arg.shape))
             new_cons.append(con.copy(arg_list))
             inverse_data.cons_id_map[con.id] = new_cons[-1].id
 
+        self.inversion_tables(inverse_data)
+
         # Map of old constraint id to new constraint id.
         inverse_data.minimize = type(problem.objective) == Minimize
-        new_prob = problems.problem.Problem(Minimize(new_obj), new_cons)
+        new_prob = problems.problem.Problem._from_reduction(Minimize(new_obj),
+                                                            new_cons)
         return new_prob, inverse_data
 
+    @staticmethod
+    def stuffed_arg(A, b, new_var, shape):
+        """Returns the expression A*new_var + b reshaped to shape.
+        """
+        Ax = A*new_var
+        # A*new_var is a column vector if new_var has a single entry.
+        b = np.reshape(b, Ax.shape, order='F')
+        return reshape(Ax + b, shape)
+
+    @staticmethod
+    def merge_key(con):
+        """Returns the key of the constraints con is merged with, or None if
+           con is not merged.
+
+        Only scalar Zero and NonPos constraints are merged, with those of
+        the same type on the same variables.
+        """
+        if type(con) not in (Zero, NonPos) or con.size != 1:
+            return None
+        return type(con), frozenset(var.id for var in con.variables())
+
+    @staticmethod
+    def merged_constraint(constraints, extractor, new_var, inverse_data):
+        """Stuffs scalar constraints of the same type into a single
+           vectorized constraint.
+        """
+        A, b = extractor.affine([con.args[0] for con in constraints])
+        merged = type(constraints[0])(MatrixStuffing.stuffed_arg(
+            A, b, new_var, (len(constraints),)))
+        for idx, con in enumerate(constraints):
+            inverse_data.cons_id_map[con.id] = merged.id
+            inverse_data.merged_cons[con.id] = idx
+        return merged
+
+    @staticmethod
+    def inversion_tables(inverse_data):
+        """Precomputes where each variable and dual lives in the solution.
+
+        Sets inverse_data.var_table, a list of (var_id, start, stop, shape)
+        locating each variable in the stuffed variable, and
+        inverse_data.dual_table, a list of (new_con, old_cons, shapes)
+        listing the original constraints whose duals are read from the
+        dual of each stuffed constraint. A shape of None means the dual is
+        passed through as is; merged constraints list one entry per
+        original constraint.
+        """
+        var_table = []
+        for var_id, offset in inverse_data.var_offsets.items():
+            shape = inverse_data.var_shapes[var_id]
+            size = int(np.prod(shape, dtype=int))
+            var_table.append((var_id, offset, offset + size, shape))
+        inverse_data.var_table = var_table
+
+        groups = {}
+        for old_con, new_con in inverse_data.cons_id_map.items():
+            con_obj = inverse_data.id2cons[old_con]
+            shape = con_obj.shape
+            # TODO rationalize Exponential.
+            if (old_con not in inverse_data.merged_cons and
+               (shape == () or isinstance(con_obj, (ExpCone, SOC)))):
+                shape = None
+            old_cons, shapes = groups.setdefault(new_con, ([], []))
+            old_cons.append(old_con)
+            shapes.append(shape)
+        inverse_data.dual_table = [(new_con, old_cons, shapes)
+                                   for new_con, (old_cons, shapes)
+                                   in groups.items()]
+
     def invert(self, solution, inverse_data):
         """Returns the solution to the original problem given the inverse_data."""
-        var_map = inverse_data.var_offsets
-        con_map = inverse_data.cons_id_map
         # Flip sign of opt val if maximize.
         opt_val = solution.opt_val
         if solution.status not in s.ERROR and not inverse_data.minimize:
@@ -90,27 +176,27 @@ class MatrixStuffing(Reduction):
             return Solution(solution.status, opt_val, primal_vars, dual_vars,
                             solution.attr)
 
-        # Split vectorized variable into components.
+        # Split vectorized variable into components; these are views of
+        # the solver's output.
         x_opt = list(solution.primal_vars.values())[0]
-        for var_id, offset in var_map.items():
-            shape = inverse_data.var_shapes[var_id]
-            size = np.prod(shape, dtype=int)
-            primal_vars[var_id] = np.reshape(x_opt[offset:offset+size], shape,
+        for var_id, start, stop, shape in inverse_data.var_table:
+            primal_vars[var_id] = np.reshape(x_opt[start:stop], shape,
                                              order='F')
         # Remap dual variables if dual exists (problem is convex).
         if solution.dual_vars is not None:
-            for old_con, new_con in con_map.items():
-                con_obj = inverse_data.id2cons[old_con]
-                shape = con_obj.shape
-                # TODO rationalize Exponential.
-                if shape == () or isinstance(con_obj, (ExpCone, SOC)):
-                    dual_vars[old_con] = solution.dual_vars[new_con]
+            for new_con, old_cons, shapes in inverse_data.dual_table:
+                dual = solution.dual_vars[new_con]
+                if len(old_cons) > 1:
+                    # Merged scalar constraints.
+                    dual = np.ravel(dual)
+                    for old_con in old_cons:
+                        idx = inverse_data.merged_cons[old_con]
+                        dual_vars[old_con] = dual[idx]
+                elif shapes[0] is None:
+                    dual_vars[old_cons[0]] = dual
                 else:
-                    dual_vars[old_con] = np.reshape(
-                        solution.dual_vars[new_con],
-                        shape,
-                        order='F'
-                    )
+                    dual_vars[old_cons[0]] = np.reshape(dual, shapes[0],
+                                                        order='F')
 
         # Add constant part
         if inverse_data.minimize:
@@ -0,0 +1,307 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+import cvxpy.settings as s
+from cvxpy import problems
+from cvxpy.constraints import NonPos, Zero
+import cvxpy.interface as intf
+from cvxpy.expressions.variable import Variable
+from cvxpy.problems.objective import Minimize
+from cvxpy.reductions.inverse_data import InverseData
+from cvxpy.reductions.matrix_stuffing import MatrixStuffing
+from cvxpy.reductions.reduction import Reduction
+from cvxpy.reductions.solution import Solution
+from cvxpy.reductions.solvers.conic_solvers.conic_solver import (
+    ConicSolver, is_stuffed_cone_constraint, is_stuffed_cone_objective)
+
+
+class Presolve(Reduction):
+    """Removes redundant linear rows and fixed variables from a cone program.
+
+    The problem must be in the form output by ConeMatrixStuffing. Only the
+    rows of Zero and NonPos constraints are presolved:
+
+    - a variable fixed by an equality with a single nonzero is substituted
+      out, if it appears in no other cone;
+    - empty rows that are satisfied are removed;
+    - rows that are parallel to another row of the same type are removed;
+      among parallel inequalities the tightest one is kept, so redundant
+      bounds on a variable are dropped.
+
+    Rows are compared by hashing their normalized sparsity patterns and
+    values with NumPy, so the cost is linear in the number of nonzeros.
+    Infeasible rows (e.g., inconsistent parallel equalities) are passed to
+    the solver unchanged.
+
+    The removed rows have zero duals, except for the rows that fixed a
+    variable, whose duals are recovered from the stationarity condition of
+    the variable.
+
+    Parameters
+    ----------
+    tol : float, optional
+        The tolerance for considering two numbers equal.
+    """
+
+    def __init__(self, tol=1e-9):
+        self.tol = tol
+
+    def accepts(self, problem):
+        return (type(problem.objective) == Minimize
+                and len(problem.variables()) == 1
+                and is_stuffed_cone_objective(problem.objective)
+                and all(is_stuffed_cone_constraint(c) for c in
+                        problem.constraints))
+
+    def apply(self, problem):
+        inverse_data = InverseData(problem)
+        inverse_data.presolved = False
+        lin_cons = [c for c in problem.constraints
+                    if type(c) in [Zero, NonPos]]
+        if not lin_cons:
+            return problem, inverse_data
+
+        x = problem.variables()[0]
+        c, d = ConicSolver.get_coeff_offset(problem.objective.expr)
+        c = self._dense_vec(c, x.size)
+        d = float(np.sum(d))
+        A, b = self._stack(lin_cons)
+        is_eq = np.repeat([type(con) == Zero for con in lin_cons],
+                          [con.size for con in lin_cons])
+
+        # Substitute out the variables fixed by singleton equalities.
+        if x.boolean_idx or x.integer_idx:
+            fixed_rows = np.zeros(0, dtype=int)
+        else:
+            fixed_rows = self._singleton_rows(problem, A, is_eq)
+        fixed_cols = A.indices[A.indptr[fixed_rows]]
+        fixed_coeffs = A.data[A.indptr[fixed_rows]]
+        fixed_vals = -b[fixed_rows]/fixed_coeffs
+        keep_cols = np.setdiff1d(np.arange(x.size), fixed_cols)
+        A_fixed = A[:, fixed_cols]
+        b = b + A_fixed.dot(fixed_vals)
+        d += c[fixed_cols].dot(fixed_vals)
+        A_red = A[:, keep_cols].tocsr() if fixed_cols.size else A
+        A_red.sort_indices()
+
+        keep_rows = self._kept_rows(A_red, b, is_eq)
+        # At least one constraint is left for the solver.
+        if not keep_rows.any() and len(lin_cons) == len(problem.constraints):
+            keep_rows[0] = True
+        if keep_rows.all() and not fixed_cols.size:
+            return problem, inverse_data
+
+        inverse_data.presolved = True
+        inverse_data.num_rows_eliminated = int(np.sum(~keep_rows))
+        inverse_data.num_cols_eliminated = int(fixed_cols.size)
+        inverse_data.x_id = x.id
+        inverse_data.keep_cols = keep_cols
+        inverse_data.fixed_cols = fixed_cols
+        inverse_data.fixed_vals = fixed_vals
+        inverse_data.fixed_rows = fixed_rows
+        inverse_data.fixed_coeffs = fixed_coeffs
+        inverse_data.c_fixed = c[fixed_cols]
+        inverse_data.A_fixed = A_fixed.T.tocsr()
+
+        if fixed_cols.size:
+            new_var = Variable(keep_cols.size)
+            new_obj = c[keep_cols].T*new_var + d
+        else:
+            new_var = x
+            new_obj = problem.objective.expr
+        inverse_data.new_x_id = new_var.id
+        # Map of old constraint id to the new constraint, or None, and the
+        # positions of the kept rows of linear constraints.
+        inverse_data.presolved_cons = {}
+        inverse_data.lin_cons = [con.id for con in lin_cons]
+        new_cons = []
+        offset = 0
+        for con in problem.constraints:
+            if type(con) not in [Zero, NonPos]:
+                if fixed_cols.size:
+                    args = []
+                    for arg in con.args:
+                        coeff, offset_arg = ConicSolver.get_coeff_offset(arg)
+                        coeff = sp.csr_matrix(coeff)[:, keep_cols]
+                        offset_arg = np.broadcast_to(offset_arg, (arg.size,))
+                        args.append(MatrixStuffing.stuffed_arg(
+                            coeff, offset_arg, new_var, arg.shape))
+                    new_cons.append(con.copy(args))
+                else:
+                    new_cons.append(con)
+                inverse_data.cons_id_map[con.id] = new_cons[-1].id
+                continue
+            rows = np.arange(offset, offset + con.size)
+            offset += con.size
+            kept = np.flatnonzero(keep_rows[rows])
+            if kept.size == con.size and not fixed_cols.size:
+                new_con = con
+            elif kept.size:
+                new_con = type(con)(MatrixStuffing.stuffed_arg(
+                    A_red[rows[kept], :], b[rows[kept]], new_var,
+                    (kept.size,)))
+            else:
+                new_con = None
+            if new_con is not None:
+                new_cons.append(new_con)
+            inverse_data.presolved_cons[con.id] = (new_con, kept)
+        new_prob = problems.problem.Problem._from_reduction(Minimize(new_obj),
+                                                            new_cons)
+        return new_prob, inverse_data
+
+    def invert(self, solution, inverse_data):
+        """Returns the solution to the original problem given the inverse_data.
+        """
+        if not inverse_data.presolved or \
+           solution.status not in s.SOLUTION_PRESENT:
+            return solution
+
+        x = np.zeros(inverse_data.x_length)
+        new_x = solution.primal_vars[inverse_data.new_x_id]
+        x[inverse_data.keep_cols] = np.ravel(new_x)
+        x[inverse_data.fixed_cols] = inverse_data.fixed_vals
+        primal_vars = {inverse_data.x_id: x}
+        if solution.dual_vars is None:
+            return Solution(solution.status, solution.opt_val, primal_vars,
+                            None, solution.attr)
+
+        dual_vars = {}
+        for old_id, new_id in inverse_data.cons_id_map.items():
+            dual_vars[old_id] = solution.dual_vars[new_id]
+        # The duals of the rows of the linear constraints, in order.
+        duals = []
+        for con_id in inverse_data.lin_cons:
+            con = inverse_data.id2cons[con_id]
+            new_con, kept = inverse_data.presolved_cons[con.id]
+            dual = np.zeros(con.size)
+            if new_con is not None:
+                dual[kept] = np.ravel(solution.dual_vars[new_con.id])
+            duals.append((con, dual))
+        y = np.hstack([dual for _, dual in duals])
+        # Each fixed variable appears in a single row that fixed it, so
+        # stationarity (c + A.T*y = 0) can be restored row by row.
+        if inverse_data.fixed_rows.size:
+            resid = inverse_data.c_fixed + inverse_data.A_fixed.dot(y)
+            y[inverse_data.fixed_rows] -= resid/inverse_data.fixed_coeffs
+        offset = 0
+        for con, dual in duals:
+            value = y[offset:offset + con.size]
+            if con.size == 1:
+                value = intf.scalar_value(value)
+            dual_vars[con.id] = value
+            offset += con.size
+        return Solution(solution.status, solution.opt_val, primal_vars,
+                        dual_vars, solution.attr)
+
+    @staticmethod
+    def _dense_vec(coeff, size):
+        if sp.issparse(coeff):
+            coeff = coeff.toarray()
+        return np.broadcast_to(np.ravel(coeff), (size,)).astype(float)
+
+    @staticmethod
+    def _stack(constraints):
+        """Returns the coefficients of constraints of the form A*x + b.
+        """
+        coeffs, offsets = [], []
+        for con in constraints:
+            coeff, offset = ConicSolver.get_coeff_offset(con.args[0])
+            coeffs.append(sp.csr_matrix(coeff))
+            offsets.append(np.broadcast_to(offset, (con.size,)))
+        A = sp.vstack(coeffs).tocsr()
+        A.eliminate_zeros()
+        A.sort_indices()
+        return A, np.hstack(offsets).astype(float)
+
+    @staticmethod
+    def _singleton_rows(problem, A, is_eq):
+        """Returns the equalities that fix a variable, one per variable.
+        """
+        row_nnz = np.diff(A.indptr)
+        rows = np.flatnonzero(is_eq & (row_nnz == 1))
+        cols = A.indices[A.indptr[rows]]
+        # The duals of the rows fixing a variable are recovered from the
+        # linear rows only, so the variable cannot appear in another cone.
+        cone_cols = [sp.csr_matrix(ConicSolver.get_coeff_offset(arg)[0]).indices
+                     for con in problem.constraints
+                     if type(con) not in [Zero, NonPos] for arg in con.args]
+        if cone_cols:
+            in_cone = np.in1d(cols, np.hstack(cone_cols))
+            rows, cols = rows[~in_cone], cols[~in_cone]
+        cols, first = np.unique(cols, return_index=True)
+        rows = rows[first]
+        # At least one variable is left for the solver.
+        if cols.size == A.shape[1]:
+            rows = rows[:-1]
+        return rows
+
+    def _kept_rows(self, A, b, is_eq):
+        """Returns a mask of the rows that are not redundant.
+        """
+        row_nnz = np.diff(A.indptr)
+        keep = row_nnz > 0
+        # Empty rows are kept only if infeasible.
+        empty = ~keep
+        keep[empty] = np.where(is_eq[empty], np.abs(b[empty]) > self.tol,
+                               b[empty] > self.tol)
+
+        rows = np.flatnonzero(row_nnz > 0)
+        if rows.size > 1:
+            # Normalize the rows so their first nonzero is 1 (or -1 for
+            # inequalities, which preserves their direction).
+            scale = A.data[A.indptr[rows]]
+            scale = np.where(is_eq[rows], scale, np.abs(scale))
+            N = sp.diags(1.0/scale).dot(A[rows])
+            P = N.copy()
+            P.data[:] = 1
+            bn = b[rows]/scale
+            # Hash the patterns and values with random weights.
+            weights = np.random.RandomState(0).rand(2, A.shape[1])
+            keys = np.column_stack([is_eq[rows], row_nnz[rows],
+                                    P.dot(weights[0]),
+                                    np.round(N.dot(weights[1]), 8)])
+            _, group = np.unique(keys, axis=0, return_inverse=True)
+            group = np.ravel(group)
+            _, first = np.unique(group, return_index=True)
+            rep = first[group]
+            # Check the rows against the first row of their group, to rule
+            # out hash collisions.
+            dup = np.flatnonzero(rep != np.arange(rows.size))
+            if dup.size:
+                diff = abs(N[dup] - N[rep[dup]]).max(axis=1).toarray()
+                same = (np.ravel(diff) <= self.tol) & \
+                    (abs(P[dup] - P[rep[dup]]).sum(axis=1).A1 == 0)
+                group[dup[~same]] = group.max() + 1 + np.arange(
+                    np.sum(~same))
+            # Keep the first equality and the tightest inequality of each
+            # group.
+            order = np.lexsort((np.where(is_eq[rows], np.arange(rows.size),
+                                         -bn), group))
+            is_first = np.ones(rows.size, dtype=bool)
+            is_first[1:] = group[order][1:] != group[order][:-1]
+            keeper = np.zeros(group.max() + 1, dtype=int)
+            keeper[group[order[is_first]]] = order[is_first]
+            kept = np.zeros(rows.size, dtype=bool)
+            kept[order[is_first]] = True
+            # Inconsistent equalities are left for the solver.
+            bn_keeper = bn[keeper[group]]
+            kept |= is_eq[rows] & \
+                (np.abs(bn - bn_keeper) > self.tol*(1 + np.abs(bn_keeper)))
+            keep[rows] = kept
+        return keep
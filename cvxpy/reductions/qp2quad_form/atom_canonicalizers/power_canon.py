@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import numpy as np
+import scipy.sparse as sp
 
 from cvxpy.atoms.quad_form import SymbolicQuadForm
 from cvxpy.expressions.constants import Constant
@@ -32,6 +33,6 @@ def power_canon(expr, args):
         return affine_expr, []
     elif p == 2:
         t = Variable(affine_expr.shape)
-        return SymbolicQuadForm(t, np.eye(t.size), expr), [affine_expr == t]
+        return SymbolicQuadForm(t, sp.eye(t.size), expr), [affine_expr == t]
     raise ValueError("non-constant quadratic forms can't be raised to a power "
                      "greater than 2.")
@@ -29,6 +29,7 @@ class CBC(ConicSolver):
 
     # Solver capabilities.
     MIP_CAPABLE = True
+    MODULES = ['cylp']
 
     # Map of GLPK MIP status to CVXPY status.
     STATUS_MAP_MIP = {'solution': s.OPTIMAL,
@@ -106,6 +106,11 @@ class ConicSolver(Solver):
     # For such solvers, REQUIRES_CONSTR should be set to True.
     REQUIRES_CONSTR = False
 
+    # Matrix-free solvers only apply the coefficients of the problem to
+    # vectors. They are passed a MatrixFreeConeProg instead of a problem
+    # stuffed by ConeMatrixStuffing.
+    MATRIX_FREE = False
+
     def accepts(self, problem):
         return (type(problem.objective) == Minimize
                 and (self.MIP_CAPABLE or not problem.is_mixed_integer())
@@ -162,16 +167,47 @@ class ConicSolver(Solver):
         SciPy CSR matrix
             A sparse matrix
         """
-        val_arr = []
-        row_arr = []
-        col_arr = []
         # Selects from each column.
-        for var_row in range(shape[1]):
-            val_arr.append(np.float64(1.0))
-            row_arr.append(spacing*var_row + offset)
-            col_arr.append(var_row)
+        col_arr = np.arange(shape[1])
+        row_arr = spacing*col_arr + offset
+        val_arr = np.ones(shape[1], dtype=np.float64)
         return sp.coo_matrix((val_arr, (row_arr, col_arr)), shape).tocsr()
 
+    @staticmethod
+    def interleave_rows(coeffs, offsets, order):
+        """Interleaves the rows of several coefficient matrices and offsets.
+
+        Row k of the i-th matrix is placed at row len(order)*k + order[i]
+        of the result, so that the k-th entries of every argument form a
+        contiguous block (e.g., the k-th exponential cone).
+
+        Parameters
+        ----------
+        coeffs : list
+            SciPy sparse matrices with the same number of rows.
+        offsets : list
+            NumPy 1D arrays (or scalars) matching coeffs.
+        order : list
+            The position of each argument within a block.
+
+        Returns
+        -------
+        (SciPy CSR sparse matrix, NumPy 1D array)
+        """
+        spacing = len(order)
+        num_rows = coeffs[0].shape[0]
+        height = spacing*num_rows
+        # Destination row of each row of the vertically stacked matrices.
+        dest = (spacing*np.tile(np.arange(num_rows), len(coeffs))
+                + np.repeat(order, num_rows))
+        stacked = sp.vstack(coeffs, format="coo")
+        mat = sp.coo_matrix((stacked.data, (dest[stacked.row], stacked.col)),
+                            shape=(height, stacked.shape[1])).tocsr()
+        offset = np.zeros(height, dtype=np.float64)
+        offset[dest] = np.concatenate(
+            [np.broadcast_to(o, (num_rows,)) for o in offsets])
+        return mat, offset
+
     def format_constr(self, problem, constr, exp_cone_order):
         """
         Return the coefficient "A" and offset "b" for the constraint in the following formats:
@@ -229,14 +265,11 @@ class ConicSolver(Solver):
                     mat_arr.append(coeffs[1][i::gap-1, :])
             return -sp.vstack(mat_arr), offset
         elif type(constr) == ExpCone:
-            for i, coeff in enumerate(coeffs):
-                mat = ConicSolver.get_spacing_matrix(
-                                                (height, coeff.shape[0]),
-                                                len(exp_cone_order),
-                                                exp_cone_order[i])
-                offsets[i] = mat*offsets[i]
-                coeffs[i] = -mat*coeffs[i]
-            return sum(coeffs), sum(offsets)
+            # Place the (x, y, z) entries of each cone in the solver's order
+            # with a single permutation of the stacked rows.
+            coeff, offset = ConicSolver.interleave_rows(coeffs, offsets,
+                                                        exp_cone_order)
+            return -coeff, offset
         else:
             # subclasses must handle PSD constraints.
             raise ValueError("Unsupported constraint type.")
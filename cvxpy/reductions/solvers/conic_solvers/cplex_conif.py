@@ -31,6 +31,7 @@ class CPLEX(ConicSolver):
     # Solver capabilities.
     MIP_CAPABLE = True
     SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS + [SOC]
+    MODULES = ['cplex']
 
     def name(self):
         """The name of the solver. """
@@ -30,6 +30,7 @@ class CVXOPT(ConicSolver):
     SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS + [SOC,
                                                                  ExpCone,
                                                                  PSD]
+    MODULES = ['cvxopt']
 
     # Map of CVXOPT status to CVXPY status.
     STATUS_MAP = {'optimal': s.OPTIMAL,
@@ -28,6 +28,7 @@ class Elemental(ConicSolver):
     # Solver capabilities.
     MIP_CAPABLE = False
     SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS + [SOC]
+    MODULES = ['El']
 
     # Map of Elemental status to CVXPY status.
     # TODO
@@ -30,6 +30,9 @@ class GLPK(CVXOPT):
     # Solver capabilities.
     MIP_CAPABLE = False
     SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS
+    # Finding cvxopt.glpk would import cvxopt, so only cvxopt is probed;
+    # a missing glpk module is found when the solver is first imported.
+    MODULES = ['cvxopt']
 
     def name(self):
         """The name of the solver.
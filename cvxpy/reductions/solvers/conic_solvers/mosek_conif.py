@@ -18,9 +18,10 @@ import numpy as np
 import scipy as sp
 import cvxpy.settings as s
 from cvxpy.constraints import PSD, SOC, NonPos, Zero, ExpCone
-from cvxpy.reductions.inverse_data import InverseData
-from cvxpy.utilities.coeff_extractor import CoeffExtractor
 from cvxpy.reductions.solution import Solution
+from cvxpy.utilities.tri_packing import (lower_tri_indices,
+                                         lower_tri_vec_indices,
+                                         unpack_lower_tri)
 from .conic_solver import ConicSolver
 from collections import defaultdict
 
@@ -32,17 +33,7 @@ def vectorized_lower_tri_to_mat(v, dim):
     :return: Return the symmetric 2D array defined by taking "v" to
       specify its lower triangular entries.
     """
-    rows, cols, vals = [], [], []
-    running_idx = 0
-    for j in range(dim):
-        rows += [j + k for k in range(dim - j)]
-        cols += [j] * (dim - j)
-        vals += v[running_idx:(running_idx + dim - j)]
-        running_idx += dim - j
-    A = sp.sparse.coo_matrix((vals, (rows, cols)), shape=(dim, dim)).toarray()
-    d = np.diag(np.diag(A))
-    A = A + A.T - d
-    return A
+    return unpack_lower_tri(v, dim)
 
 
 def psd_coeff_offset(problem, c):
@@ -54,28 +45,92 @@ def psd_coeff_offset(problem, c):
     :param c: a cvxpy Constraint defining a linear matrix inequality
       "B + \sum_j A[j] * z[j] >=_{PSD} 0".
     :return: (G, h) such that "c" holds at "z" iff "G * z <=_{PSD} b"
-      (where the PSD cone is reshaped into a subset of R^N with N = dim ** 2).
-
-    Note: It is desirable to change this mosek interface so that PSD constraints
-    are represented by a vector in R^N with N = (dim * (dim + 1) / 2). This is
-    possible because arguments to a linear matrix inequality are necessarily
-    symmetric. For now we use N = dim ** 2, because it simplifies implementation
-    and only makes a modest difference in the size of the problem seen by mosek.
+      (where the PSD cone is reshaped into a subset of R^N with
+      N = dim * (dim + 1) / 2, by taking the lower triangular entries in
+      column-major order), provided that the argument of "c" is symmetric
+      (see psd_asymmetry_coeff_offset).
     """
-    extractor = CoeffExtractor(InverseData(problem))
-    A_vec, b_vec = extractor.affine(c.expr)
-    G = -A_vec
-    h = b_vec
+    coeff, offset = ConicSolver.get_coeff_offset(c.args[0])
     dim = c.expr.shape[0]
+    lower, _ = lower_tri_vec_indices(dim)
+    G = -sp.sparse.csr_matrix(coeff)[lower, :]
+    h = np.broadcast_to(offset, (dim*dim,))[lower]
     return G, h, dim
 
 
+def psd_asymmetry_coeff_offset(c):
+    """
+    Returns an array "G" and vector "h" such that the argument of the
+      given linear matrix inequality is symmetric iff "G * z == h".
+
+    Only the rows of the strictly lower triangular entries that differ
+    from their mirror image are returned, so (G, h) is empty if the
+    argument is symmetric by construction (e.g., a symmetric variable).
+
+    :param c: a cvxpy Constraint defining a linear matrix inequality.
+    :return: (G, h)
+    """
+    coeff, offset = ConicSolver.get_coeff_offset(c.args[0])
+    dim = c.expr.shape[0]
+    lower, upper = lower_tri_vec_indices(dim)
+    off_diag = lower != upper
+    lower, upper = lower[off_diag], upper[off_diag]
+    coeff = sp.sparse.csr_matrix(coeff)
+    G = coeff[lower, :] - coeff[upper, :]
+    G.eliminate_zeros()
+    offset = np.broadcast_to(offset, (dim*dim,))
+    h = offset[upper] - offset[lower]
+    asymmetric = (np.diff(G.indptr) > 0) | (h != 0)
+    return G[asymmetric, :], h[asymmetric]
+
+
+def put_lmi_rows(task, i, psd_dims):
+    """
+    Adds the contributions of the PSD variables to the rows of the LMIs.
+
+    Each LMI has a row per lower triangular entry (row, col) of its slack
+    variable Xj, in column-major order. The row contributes
+    "tr( E * Xj ) == Xj[row, col]", where E is the symmetric matrix with 1
+    at (row, col) if row == col, and 0.5 at (row, col) and (col, row)
+    otherwise.
+
+    :param task: the mosek Task, with the PSD variables already appended.
+    :param i: the index of the first row of the first LMI.
+    :param psd_dims: the dimension of each LMI.
+    :return: the index of the row after the last LMI.
+    """
+    for j, dim in enumerate(psd_dims):  # SDP slack variable "Xj"
+        rows, cols = lower_tri_indices(dim)
+        vals = np.where(rows == cols, 1., 0.5)
+        num_entries = rows.size
+        if hasattr(task, 'appendsparsesymmatlist'):
+            mat_idx = [0] * num_entries
+            task.appendsparsesymmatlist([dim] * num_entries,
+                                        [1] * num_entries,
+                                        rows.tolist(), cols.tolist(),
+                                        vals.tolist(), mat_idx)
+            task.putbaraijlist(list(range(i, i + num_entries)),
+                               [j] * num_entries,
+                               list(range(num_entries)),
+                               list(range(1, num_entries + 1)),
+                               mat_idx, [1.0] * num_entries)
+        else:
+            # Older versions of mosek lack the list APIs.
+            for k in range(num_entries):
+                mat = task.appendsparsesymmat(dim, [int(rows[k])],
+                                              [int(cols[k])], [vals[k]])
+                task.putbaraij(i + k, j, [mat], [1.0])
+        i += num_entries
+    return i
+
+
 class MOSEK(ConicSolver):
     """ An interface for the Mosek solver.
     """
 
     MIP_CAPABLE = True
     SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS + [SOC, PSD]
+    MODULES = ['mosek']
     EXP_CONE_ORDER = [2, 1, 0]
 
     """
@@ -208,6 +263,18 @@ class MOSEK(ConicSolver):
             Gs.append(G)
             hs.append(h)
 
+        # Linear equations that make the arguments of LMIs symmetric, as the
+        # LMIs only constrain their lower triangular entries.
+        psd_constr = [ci for ci in problem.constraints if type(ci) == PSD]
+        for c in psd_constr:
+            G, h = psd_asymmetry_coeff_offset(c)
+            if h.size > 0:
+                # These rows have no dual variable.
+                inv_data['y_slacks'].append((None, h.size))
+                data[s.DIMS][s.EQ_DIM] += h.size
+                Gs.append(G)
+                hs.append(h)
+
         # Second order cone
         soc_constr = [ci for ci in problem.constraints if type(ci) == SOC]
         data[s.DIMS][s.SOC_DIM] = [dim for ci in soc_constr for dim in ci.cone_sizes()]
@@ -229,7 +296,6 @@ class MOSEK(ConicSolver):
             hs.append(h)
 
         # PSD constraints
-        psd_constr = [ci for ci in problem.constraints if type(ci) == PSD]
         if len(psd_constr) > 0:
             data[s.DIMS][s.PSD_DIM] = list()
             for c in psd_constr:
@@ -384,15 +450,7 @@ class MOSEK(ConicSolver):
 
         # constraint index; start of LMIs.
         i = dims[s.LEQ_DIM] + dims[s.EQ_DIM] + total_soc_exp_slacks
-        for j, dim in enumerate(dims[s.PSD_DIM]):  # SDP slack variable "Xj"
-            for row_idx in range(dim):
-                for col_idx in range(dim):
-                    val = 1. if row_idx == col_idx else 0.5
-                    row = max(row_idx, col_idx)
-                    col = min(row_idx, col_idx)
-                    mat = task.appendsparsesymmat(dim, [row], [col], [val])
-                    task.putbaraij(i, j, [mat], [1.0])
-                    i += 1
+        put_lmi_rows(task, i, dims[s.PSD_DIM])
 
         num_eq = len(h) - dims[s.LEQ_DIM]
         type_constraint = [mosek.boundkey.up] * dims[s.LEQ_DIM] + \
@@ -565,7 +623,8 @@ class MOSEK(ConicSolver):
           function in mosek's Optimzer API.
         :param constr_id_to_constr_dim: a list of tuples (id, dim).
           The entry "id" is the index of the cvxpy Constraint
-          object to which the next "dim" entries of the dual variable belong.
+          object to which the next "dim" entries of the dual variable belong,
+          or None if they belong to no Constraint.
 
         :return: a dictionary keyed by cvxpy Constraint object indicies,
           with either scalar or numpy array values.
@@ -573,7 +632,9 @@ class MOSEK(ConicSolver):
         dual_vars = dict()
         running_idx = 0
         for id, dim in constr_id_to_constr_dim:
-            if dim == 1:
+            if id is None:
+                pass
+            elif dim == 1:
                 dual_vars[id] = dual_var[running_idx]  # a scalar
             else:
                 dual_vars[id] = np.array(dual_var[running_idx:(running_idx + dim)])
@@ -0,0 +1,303 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+import cvxpy.settings as s
+from cvxpy.constraints import SOC, NonPos, Zero
+from cvxpy.reductions.dcp2cone.matrix_free_stuffing import MatrixFreeConeProg
+from cvxpy.reductions.solution import failure_solution, Solution
+from cvxpy.reductions.solvers.conic_solvers.conic_solver import ConicSolver
+
+
+class Cones(object):
+    """The rows of z = A*x + b that lie in each cone.
+
+    Attributes
+    ----------
+    zero : NumPy.ndarray
+        The rows that must be zero.
+    nonpos : NumPy.ndarray
+        The rows that must be nonpositive.
+    soc : list
+        A (t, X) pair of index arrays per SOC constraint, such that
+        z[t[i]] >= norm(z[X[i, :]]) for every i.
+    """
+
+    def __init__(self, zero, nonpos, soc):
+        self.zero = zero
+        self.nonpos = nonpos
+        self.soc = soc
+
+    def project(self, z):
+        """Projects z onto the product of the cones.
+        """
+        result = z.copy()
+        result[self.zero] = 0
+        result[self.nonpos] = np.minimum(z[self.nonpos], 0)
+        for t_idx, x_idx in self.soc:
+            result[t_idx], result[x_idx] = project_soc(z[t_idx], z[x_idx])
+        return result
+
+    def project_polar(self, y):
+        """Projects y onto the polar of the product of the cones.
+
+        By Moreau's decomposition, y is the sum of its projections onto a
+        cone and onto the polar cone.
+        """
+        return y - self.project(y)
+
+
+def project_soc(t, X):
+    """Projects each (t[i], X[i, :]) onto the second-order cone.
+    """
+    norms = np.linalg.norm(X, axis=1)
+    t_proj = t.copy()
+    X_proj = X.copy()
+    # In the polar cone.
+    polar = norms <= -t
+    t_proj[polar] = 0
+    X_proj[polar] = 0
+    # Neither in the cone nor in its polar.
+    outside = norms > np.abs(t)
+    alpha = (t[outside] + norms[outside])/2
+    t_proj[outside] = alpha
+    X_proj[outside] = X[outside]*(alpha/norms[outside])[:, None]
+    return t_proj, X_proj
+
+
+def operator_norm(A, iters=50):
+    """Estimates the largest singular value of A by power iteration.
+    """
+    if min(A.shape) == 0:
+        return 0.
+    np.random.seed(0)
+    x = np.random.randn(A.shape[1])
+    norm = 0.
+    for _ in range(iters):
+        x_norm = np.linalg.norm(x)
+        if x_norm == 0:
+            break
+        x = A.rmatvec(A.matvec(x/x_norm))
+        norm = np.sqrt(np.linalg.norm(x))
+    return norm
+
+
+def pdhg(c, A, b, cones, max_iters=100000, eps_abs=1e-6, eps_rel=1e-6,
+         check_interval=10, verbose=False, x=None, y=None):
+    """Solves a cone program by the primal-dual hybrid gradient method.
+
+    minimize   c'x
+    subject to A*x + b in K
+
+    The saddle point of c'x + y'(A*x + b) over y in the polar cone of K
+    is found with the iterations of Chambolle and Pock, which only apply A
+    and A.T, once each per iteration.
+
+    Parameters
+    ----------
+    c : NumPy.ndarray
+        The coefficients of the objective.
+    A : SciPy LinearOperator
+        The coefficients of the constraints.
+    b : NumPy.ndarray
+        The offsets of the constraints.
+    cones : Cones
+        The cone K.
+    max_iters : int, optional
+        The maximum number of iterations.
+    eps_abs, eps_rel : float, optional
+        The absolute and relative tolerances on the primal residual, the
+        dual residual and the duality gap.
+    check_interval : int, optional
+        The number of iterations between checks of convergence.
+    verbose : bool, optional
+        Whether to print the residuals at every check.
+    x, y : NumPy.ndarray, optional
+        The primal and dual iterates to start from.
+
+    Returns
+    -------
+    dict
+        The status ("solved", "solved_inaccurate" or "failed"), the
+        iterates "x" and "y", the objective "pobj" and "iter".
+    """
+    m, n = A.shape
+    x = np.zeros(n) if x is None else np.array(x, dtype=float)
+    y = np.zeros(m) if y is None else np.array(y, dtype=float)
+    # Step sizes with tau*sigma*norm(A)**2 < 1, balanced by the ratio of the
+    # norms of the objective and of the offsets.
+    norm_A = operator_norm(A)
+    norm_b = np.linalg.norm(b)
+    norm_c = np.linalg.norm(c)
+    weight = norm_c/norm_b if norm_b > 0 and norm_c > 0 else 1.
+    step = 0.95/norm_A if norm_A > 0 else 1.
+    tau, sigma = step/weight, step*weight
+
+    Ax = A.matvec(x)
+    ATy = A.rmatvec(y)
+    status = "failed"
+    residuals = None
+    for k in range(1, max_iters + 1):
+        x_new = x - tau*(c + ATy)
+        Ax_new = A.matvec(x_new)
+        y = cones.project_polar(y + sigma*(2*Ax_new - Ax + b))
+        x, Ax = x_new, Ax_new
+        ATy = A.rmatvec(y)
+        if k % check_interval and k != max_iters:
+            continue
+        z = Ax + b
+        pobj = c.dot(x)
+        dobj = b.dot(y)
+        residuals = (np.linalg.norm(z - cones.project(z)),
+                     np.linalg.norm(c + ATy),
+                     abs(pobj - dobj))
+        bounds = (eps_abs + eps_rel*max(np.linalg.norm(Ax), norm_b),
+                  eps_abs + eps_rel*norm_c,
+                  eps_abs + eps_rel*(abs(pobj) + abs(dobj)))
+        if verbose:
+            print("%8d  pres %.2e  dres %.2e  gap %.2e  pobj %+.6e"
+                  % ((k,) + residuals + (pobj,)))
+        if all(r <= bound for r, bound in zip(residuals, bounds)):
+            status = "solved"
+            break
+    else:
+        if residuals is not None and all(
+                r <= 1e3*bound for r, bound in zip(residuals, bounds)):
+            status = "solved_inaccurate"
+    return {"status": status, "x": x, "y": y, "pobj": c.dot(x), "iter": k}
+
+
+class PDHG(ConicSolver):
+    """A built-in matrix-free first-order solver.
+
+    The problem is stuffed by MatrixFreeStuffing, so its coefficients are
+    never formed: the solver only applies them to vectors (see pdhg).
+    Convolutions are applied with FFTs, and Kronecker products, promotions
+    and sums without forming a matrix, which suits large structured
+    problems such as image deblurring with conv.
+    """
+
+    # Solver capabilities.
+    MIP_CAPABLE = False
+    SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS + [SOC]
+    MATRIX_FREE = True
+
+    # Keys for inverse data.
+    DUALS = "duals"
+
+    # Map of PDHG status to CVXPY status.
+    STATUS_MAP = {"solved": s.OPTIMAL,
+                  "solved_inaccurate": s.OPTIMAL_INACCURATE,
+                  "failed": s.SOLVER_ERROR}
+
+    def name(self):
+        """The name of the solver.
+        """
+        return s.PDHG
+
+    def import_solver(self):
+        """Imports the solver.
+        """
+        # The solver is part of cvxpy.
+        pass
+
+    def accepts(self, problem):
+        return (isinstance(problem, MatrixFreeConeProg)
+                and all(type(c) in self.SUPPORTED_CONSTRAINTS
+                        for c in problem.constraints))
+
+    def apply(self, problem):
+        """Returns the data of the cone program and the inverse data.
+
+        The rows of each cone are located in A*x + b, and, for each
+        constraint, the rows and sign of its dual variable.
+        """
+        zero, nonpos, soc = [], [], []
+        duals = []
+        for con, starts in problem.constraint_rows():
+            rows = np.arange(starts[0], starts[0] + con.args[0].size)
+            if type(con) == Zero:
+                zero.append(rows)
+                duals.append((con.id, rows, 1))
+            elif type(con) == NonPos:
+                nonpos.append(rows)
+                duals.append((con.id, rows, 1))
+            else:
+                # The columns (axis 0) or rows (axis 1) of X, in Fortran
+                # order, pair with the entries of t.
+                X = con.args[1]
+                X_shape = X.shape if len(X.shape) == 2 else (X.size, 1)
+                X_rows = starts[1] + np.reshape(np.arange(X.size), X_shape,
+                                                order='F')
+                if con.axis == 0:
+                    X_rows = X_rows.T
+                soc.append((rows, X_rows))
+                # The dual of an SOC constraint lies in the cone, with the
+                # entries of each elementwise cone contiguous.
+                duals.append((con.id, np.hstack([rows[:, None], X_rows]), -1))
+        empty = np.zeros(0, dtype=int)
+        cones = Cones(np.concatenate(zero + [empty]),
+                      np.concatenate(nonpos + [empty]), soc)
+        data = {s.C: problem.c, s.A: problem.A, s.B: problem.b,
+                'cones': cones}
+        inv_data = {self.DUALS: duals}
+        return data, inv_data
+
+    def invert(self, solution, inverse_data):
+        """Returns the solution to the original problem given the inverse data.
+        """
+        status = self.STATUS_MAP[solution['status']]
+        attr = {s.NUM_ITERS: solution['iter'],
+                s.SOLVE_TIME: solution['time']}
+        if status in s.SOLUTION_PRESENT:
+            y = solution['y']
+            dual_vars = {}
+            for con_id, rows, sign in inverse_data[self.DUALS]:
+                dual = sign*np.ravel(y[rows])
+                dual_vars[con_id] = dual[0] if dual.size == 1 else dual
+            # The stuffed variable is the only variable.
+            primal_vars = {s.PRIMAL: solution['x']}
+            return Solution(status, solution['pobj'], primal_vars, dual_vars,
+                            attr)
+        else:
+            return failure_solution(status)
+
+    def solve_via_data(self, data, warm_start, verbose, solver_opts,
+                       solver_cache=None):
+        """Solves the cone program, warm starting from the last solution.
+
+        The solver options are those of pdhg: max_iters, eps_abs, eps_rel
+        and check_interval.
+        """
+        start = {}
+        if warm_start and solver_cache is not None and \
+                self.name() in solver_cache:
+            old = solver_cache[self.name()]
+            if old['x'].size == data[s.C].size and \
+                    old['y'].size == data[s.B].size:
+                start = {'x': old['x'], 'y': old['y']}
+        start_time = time.time()
+        solution = pdhg(data[s.C], data[s.A], data[s.B], data['cones'],
+                        verbose=verbose, **dict(solver_opts, **start))
+        solution['time'] = time.time() - start_time
+        if solver_cache is not None:
+            solver_cache[self.name()] = solution
+        return solution
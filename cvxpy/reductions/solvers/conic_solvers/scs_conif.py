@@ -18,15 +18,12 @@ import numpy as np
 import scipy.sparse as sp
 
 import cvxpy.settings as s
-from cvxpy.atoms.affine.reshape import reshape
 from cvxpy.constraints import PSD, SOC, ExpCone, NonPos, Zero
-from cvxpy.expressions.constants.constant import Constant
 import cvxpy.interface as intf
-from cvxpy.reductions.inverse_data import InverseData
 from cvxpy.reductions.solution import failure_solution, Solution
 from cvxpy.reductions.solvers.solver import group_constraints
 from cvxpy.reductions.solvers import utilities
-from cvxpy.utilities.coeff_extractor import CoeffExtractor
+import cvxpy.utilities.tri_packing as tri_packing
 
 from .conic_solver import ConeDims, ConicSolver
 
@@ -45,47 +42,6 @@ def dims_to_solver_dict(cone_dims):
 
 
 # Utility methods for special handling of semidefinite constraints.
-def scaled_lower_tri(matrix):
-    """Returns an expression representing the lower triangular entries
-
-    Scales the strictly lower triangular entries by sqrt(2), as required
-    by SCS.
-
-    Parameters
-    ----------
-    matrix : Expression
-        A 2-dimensional CVXPY expression.
-
-    Returns
-    -------
-    Expression
-        An expression representing the (scaled) lower triangular part of
-        the supplied matrix expression.
-    """
-    rows = cols = matrix.shape[0]
-    entries = rows * (cols + 1)//2
-    val_arr = []
-    row_arr = []
-    col_arr = []
-    count = 0
-    for j in range(cols):
-        for i in range(rows):
-            if j <= i:
-                # Index in the original matrix.
-                col_arr.append(j*rows + i)
-                # Index in the extracted vector.
-                row_arr.append(count)
-                if j == i:
-                    val_arr.append(1.0)
-                else:
-                    val_arr.append(np.sqrt(2))
-                count += 1
-    shape = (entries, rows*cols)
-    coeff = Constant(sp.coo_matrix((val_arr, (row_arr, col_arr)), shape).tocsc())
-    vectorized_matrix = reshape(matrix, (rows*cols, 1))
-    return coeff * vectorized_matrix
-
-
 def tri_to_full(lower_tri, n):
     """Expands n*(n+1)//2 lower triangular to full matrix
 
@@ -105,15 +61,7 @@ def tri_to_full(lower_tri, n):
         A 2-dimensional ndarray that is the scaled expansion of the lower
         triangular array.
     """
-    full = np.zeros((n, n))
-    for col in range(n):
-        for row in range(col, n):
-            idx = row - col + n*(n+1)//2 - (n-col)*(n-col+1)//2
-            if row != col:
-                full[row, col] = lower_tri[idx]/np.sqrt(2)
-                full[col, row] = lower_tri[idx]/np.sqrt(2)
-            else:
-                full[row, col] = lower_tri[idx]
+    full = tri_packing.unpack_lower_tri(lower_tri, n, scale=1/np.sqrt(2))
     return np.reshape(full, n*n, order="F")
 
 
@@ -126,6 +74,7 @@ class SCS(ConicSolver):
     SUPPORTED_CONSTRAINTS = ConicSolver.SUPPORTED_CONSTRAINTS + [SOC,
                                                                  ExpCone,
                                                                  PSD]
+    MODULES = ['scs']
     REQUIRES_CONSTR = True
 
     # Map of SCS status to CVXPY status.
@@ -162,10 +111,11 @@ class SCS(ConicSolver):
         sqrt(2).
         """
         if isinstance(constr, PSD):
-            expr = constr.expr
-            triangularized_expr = scaled_lower_tri(expr)
-            extractor = CoeffExtractor(InverseData(problem))
-            A_prime, b_prime = extractor.affine(triangularized_expr)
+            dim = constr.shape[0]
+            coeff, offset = self.get_coeff_offset(constr.args[0])
+            triangularize = tri_packing.scaled_lower_tri_coeff(dim)
+            A_prime = triangularize * sp.csr_matrix(coeff)
+            b_prime = triangularize * np.broadcast_to(offset, (dim*dim,))
             # SCS requests constraints to be formatted as
             # Ax + s = b, where s is constrained to reside in some
             # cone. Here, however, we are formatting the constraint
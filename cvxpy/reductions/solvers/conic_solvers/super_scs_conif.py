@@ -21,6 +21,8 @@ from cvxpy.reductions.solvers.conic_solvers.scs_conif import dims_to_solver_dict
 
 class SuperSCS(SCS):
 
+    MODULES = ['superscs']
+
     DEFAULT_SETTINGS = {'use_indirect': False, 'eps': 1e-8, 'max_iters': 10000}
 
     def name(self):
@@ -15,7 +15,6 @@ limitations under the License.
 """
 
 import cvxpy.settings as s
-import numpy as np
 
 # Conic interfaces
 from cvxpy.reductions.solvers.conic_solvers.ecos_conif \
@@ -46,6 +45,8 @@ from cvxpy.reductions.solvers.conic_solvers.julia_opt_conif \
     import JuliaOpt as JuliaOpt_con
 from cvxpy.reductions.solvers.conic_solvers.cplex_conif \
     import CPLEX as CPLEX_con
+from cvxpy.reductions.solvers.conic_solvers.pdhg_conif \
+    import PDHG as PDHG_con
 
 # QP interfaces
 from cvxpy.reductions.solvers.qp_solvers.osqp_qpif import OSQP as OSQP_qp
@@ -56,7 +57,7 @@ solver_conic_intf = [ECOS_con(), ECOS_BB_con(),
                      CVXOPT_con(), GLPK_con(), XPRESS(),
                      GLPK_MI_con(), CBC_con(), SCS_con(), SuperSCS_con(), GUROBI_con(),
                      Elemental_con(), MOSEK_con(), JuliaOpt_con(),
-                     CPLEX_con()]
+                     CPLEX_con(), PDHG_con()]
 solver_qp_intf = [OSQP_qp(),
                   GUROBI_qp(),
                   CPLEX_qp()
@@ -71,29 +72,80 @@ SOLVER_MAP_QP = {solver.name(): solver for solver in solver_qp_intf}
 CONIC_SOLVERS = [s.MOSEK, s.ECOS, s.ECOS_BB, s.SUPER_SCS, s.SCS,
                  s.GUROBI, s.GLPK, s.XPRESS,
                  s.GLPK_MI, s.CBC, s.ELEMENTAL, s.JULIA_OPT, s.CVXOPT,
-                 s.CPLEX]
+                 s.CPLEX, s.PDHG]
 QP_SOLVERS = [s.OSQP,
               s.GUROBI,
               s.CPLEX]
 
 
+# The names of the installed solvers, computed on first use.
+_INSTALLED_SOLVERS = None
+
+
+def _installed():
+    """Returns the cached list of installed solvers, probing them first if
+       needed. Solvers are probed without importing them.
+    """
+    global _INSTALLED_SOLVERS
+    if _INSTALLED_SOLVERS is None:
+        installed = []
+        # Check conic solvers
+        for name, solver in SOLVER_MAP_CONIC.items():
+            if solver.is_installed():
+                installed.append(name)
+        # Check QP solvers
+        for name, solver in SOLVER_MAP_QP.items():
+            # Skip duplicate names (for solvers that handle both conic and
+            # QP)
+            if name not in installed and solver.is_installed():
+                installed.append(name)
+        _INSTALLED_SOLVERS = installed
+    return _INSTALLED_SOLVERS
+
+
 def installed_solvers():
     """List the installed solvers.
+
+    Solvers are probed without importing them, and the result is cached.
+    """
+    return list(_installed())
+
+
+class _InstalledSolvers(object):
+    """A read-only view of the installed solvers.
+
+    The solvers are only probed when the view is first read, so that
+    importing cvxpy does not look for them.
     """
-    installed = []
-    # Check conic solvers
-    for name, solver in SOLVER_MAP_CONIC.items():
-        if solver.is_installed():
-            installed.append(name)
-    # Check QP solvers
-    for name, solver in SOLVER_MAP_QP.items():
-        if solver.is_installed():
-            installed.append(name)
 
-    # Remove duplicate names (for solvers that handle both conic and QP)
-    np.unique(installed).tolist()
+    def __contains__(self, name):
+        return name in _installed()
+
+    def __iter__(self):
+        return iter(_installed())
+
+    def __len__(self):
+        return len(_installed())
+
+    def __getitem__(self, key):
+        return _installed()[key]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
 
-    return installed
+    def __ne__(self, other):
+        return not self == other
 
+    def __repr__(self):
+        return repr(_installed())
 
-INSTALLED_SOLVERS = installed_solvers()
+
+INSTALLED_SOLVERS = _InstalledSolvers()
+
+
+def remove_installed_solver(name):
+    """Forgets a solver that was found but could not be imported.
+    """
+    installed = _installed()
+    if name in installed:
+        installed.remove(name)
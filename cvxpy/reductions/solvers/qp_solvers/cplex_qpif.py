@@ -25,6 +25,7 @@ class CPLEX(QpSolver):
     """QP interface for the CPLEX solver"""
 
     MIP_CAPABLE = True
+    MODULES = ['cplex']
 
     # Map of CPLEX status to CVXPY status. #TODO: add more!
     STATUS_MAP = {1: s.OPTIMAL,
@@ -25,6 +25,7 @@ class GUROBI(QpSolver):
     """QP interface for the Gurobi solver"""
 
     MIP_CAPABLE = True
+    MODULES = ['gurobipy']
 
     # Map of Gurobi status to CVXPY status.
     STATUS_MAP = {2: s.OPTIMAL,
@@ -10,6 +10,8 @@ import scipy.sparse as sp
 class OSQP(QpSolver):
     """QP interface for the OSQP solver"""
 
+    MODULES = ['osqp']
+
     # Map of OSQP status to CVXPY status.
     STATUS_MAP = {1: s.OPTIMAL,
                   2: s.OPTIMAL_INACCURATE,
@@ -71,7 +71,7 @@ class QpSolver(Solver):
         q = obj.expr.args[1].args[0].value.flatten()
 
         # Get number of variables
-        n = problem.size_metrics.num_scalar_variables
+        n = inverse_data.x_length
 
         # TODO(akshayka): This dependence on ConicSolver is hacky; something
         # should change here.
@@ -16,6 +16,7 @@ limitations under the License.
 
 import abc
 from collections import defaultdict
+import importlib
 
 from cvxpy.reductions.reduction import Reduction
 
@@ -39,6 +40,37 @@ def group_constraints(constraints):
     return constr_map
 
 
+def module_exists(name):
+    """Can the module be found?
+
+    The module itself is not imported, although its parent packages are.
+
+    Parameters
+    ----------
+    name : str
+        The full name of the module.
+
+    Returns
+    -------
+    bool
+        True if the module can be found.
+    """
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        # Python 2 cannot locate a module without importing it.
+        try:
+            importlib.import_module(name)
+            return True
+        except ImportError:
+            return False
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        # A parent package is missing.
+        return False
+
+
 class Solver(Reduction):
     """Generic interface for a solver that uses reduction semantics
     """
@@ -48,6 +80,10 @@ class Solver(Reduction):
     # Solver capabilities.
     MIP_CAPABLE = False
 
+    # The modules the solver depends on. If listed, is_installed checks that
+    # they can be found instead of importing them.
+    MODULES = []
+
     # Keys for inverse data.
     VAR_ID = 'var_id'
     EQ_CONSTR = 'eq_constr'
@@ -68,6 +104,8 @@ class Solver(Reduction):
     def is_installed(self):
         """Is the solver installed?
         """
+        if self.MODULES:
+            return all(module_exists(name) for name in self.MODULES)
         try:
             self.import_solver()
             return True
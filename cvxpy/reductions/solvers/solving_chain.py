@@ -1,20 +1,25 @@
 from cvxpy.atoms import EXP_ATOMS, PSD_ATOMS, SOC_ATOMS
+from cvxpy.atoms.quad_form import QuadForm
 from cvxpy.constraints import ExpCone, PSD, SOC
-from cvxpy.error import DCPError, SolverError
+from cvxpy.error import (DCPError, ParameterAffineError, ParameterError,
+                         SolverError)
 from cvxpy.problems.objective import Maximize
 from cvxpy.reductions import (Chain, ConeMatrixStuffing, Dcp2Cone, EvalParams,
-                              FlipObjective, Qp2SymbolicQp, QpMatrixStuffing,
-                              CvxAttr2Constr, Complex2Real)
+                              FlipObjective, MatrixFreeStuffing, Presolve,
+                              Qp2SymbolicQp, QpMatrixStuffing, CvxAttr2Constr,
+                              Complex2Real)
 from cvxpy.reductions.solvers.constant_solver import ConstantSolver
 from cvxpy.reductions.solvers.solver import Solver
+from cvxpy.utilities import profiling
 from cvxpy.reductions.solvers.defines import (SOLVER_MAP_CONIC,
                                               SOLVER_MAP_QP,
                                               INSTALLED_SOLVERS,
                                               CONIC_SOLVERS,
-                                              QP_SOLVERS)
+                                              QP_SOLVERS,
+                                              remove_installed_solver)
 
 
-def construct_solving_chain(problem, solver=None):
+def construct_solving_chain(problem, solver=None, presolve=False):
     """Build a reduction chain from a problem to an installed solver.
 
     Note that if the supplied problem has 0 variables, then the solver
@@ -29,6 +34,9 @@ def construct_solving_chain(problem, solver=None):
         is supplied (i.e., if solver is None), then the targeted solver may be
         any of those that are installed. If the problem is variable-free,
         then this parameter is ignored.
+    presolve : bool, optional
+        Whether to remove redundant rows and fixed variables from cone
+        programs before they are passed to the solver.
 
     Returns
     -------
@@ -44,7 +52,10 @@ def construct_solving_chain(problem, solver=None):
         if the target solver is not installed.
     """
     if solver is not None:
-        if solver not in INSTALLED_SOLVERS:
+        instances = [solver_map[solver] for solver_map in
+                     (SOLVER_MAP_CONIC, SOLVER_MAP_QP) if solver in solver_map]
+        if (solver not in INSTALLED_SOLVERS or
+                not all([_import_solver(inst) for inst in instances])):
             raise SolverError("The solver %s is not installed." % solver)
         candidates = [solver]
     else:
@@ -57,7 +68,7 @@ def construct_solving_chain(problem, solver=None):
         reductions += [EvalParams()]
     if len(problem.variables()) == 0:
         reductions += [ConstantSolver()]
-        return SolvingChain(reductions=reductions)
+        return SolvingChain(reductions=reductions, presolve=presolve)
     if Complex2Real().accepts(problem):
         reductions += [Complex2Real()]
 
@@ -80,14 +91,15 @@ def construct_solving_chain(problem, solver=None):
             [s for s in candidate_qp_solvers if
              SOLVER_MAP_QP[s].MIP_CAPABLE]
     if candidate_qp_solvers and Qp2SymbolicQp().accepts(problem):
-        solver = sorted(candidate_qp_solvers,
-                        key=lambda s: QP_SOLVERS.index(s))[0]
-        solver_instance = SOLVER_MAP_QP[solver]
-        reductions += [CvxAttr2Constr(),
-                       Qp2SymbolicQp(),
-                       QpMatrixStuffing(),
-                       solver_instance]
-        return SolvingChain(reductions=reductions)
+        for solver in sorted(candidate_qp_solvers,
+                             key=lambda s: QP_SOLVERS.index(s)):
+            solver_instance = SOLVER_MAP_QP[solver]
+            if _import_solver(solver_instance):
+                reductions += [CvxAttr2Constr(),
+                               Qp2SymbolicQp(),
+                               QpMatrixStuffing(),
+                               solver_instance]
+                return SolvingChain(reductions=reductions, presolve=presolve)
 
     candidate_conic_solvers = [s for s in CONIC_SOLVERS if s in candidates]
     if problem.is_mixed_integer():
@@ -129,12 +141,23 @@ def construct_solving_chain(problem, solver=None):
     for solver in sorted(candidate_conic_solvers,
                          key=lambda s: CONIC_SOLVERS.index(s)):
         solver_instance = SOLVER_MAP_CONIC[solver]
+        # Solvers are not imported until they are considered, and importing
+        # a solver may extend the constraints it supports.
+        if not _import_solver(solver_instance):
+            continue
         if (all(c in solver_instance.SUPPORTED_CONSTRAINTS for c in cones)
                 and (has_constr or not solver_instance.REQUIRES_CONSTR)):
-            reductions += [Dcp2Cone(),
-                           CvxAttr2Constr(), ConeMatrixStuffing(),
-                           solver_instance]
-            return SolvingChain(reductions=reductions)
+            reductions += [Dcp2Cone(), CvxAttr2Constr()]
+            if solver_instance.MATRIX_FREE:
+                # The coefficients are never formed, so there is no matrix
+                # to presolve.
+                reductions += [MatrixFreeStuffing()]
+            else:
+                reductions += [ConeMatrixStuffing()]
+                if presolve:
+                    reductions += [Presolve()]
+            reductions += [solver_instance]
+            return SolvingChain(reductions=reductions, presolve=presolve)
 
     raise SolverError("Either candidate conic solvers (%s) do not support the "
                       "cones output by the problem (%s), or there are not "
@@ -143,6 +166,52 @@ def construct_solving_chain(problem, solver=None):
                           ", ".join([cone.__name__ for cone in cones])))
 
 
+def _import_solver(solver_instance):
+    """Imports a solver.
+
+    Solvers are listed as installed if their modules can be found, so a
+    solver whose modules fail to import is forgotten.
+
+    Returns
+    -------
+    bool
+        Whether the solver was imported.
+    """
+    try:
+        solver_instance.import_solver()
+        return True
+    except ImportError:
+        remove_installed_solver(solver_instance.name())
+        return False
+
+
+def _param_cache_key(problem):
+    """The key of the ParamConeProg of a problem in a SolvingChain.
+
+    Problems are immutable, so a ParamConeProg is valid for the problem it
+    was stuffed from, with the same parameters in the same order.
+    """
+    return (id(problem), tuple(param.id for param in problem.parameters()))
+
+
+def _has_param_quad_form(problem):
+    """Does the problem have a quad_form whose matrix has parameters?
+    """
+    exprs = [problem.objective.expr]
+    for con in problem.constraints:
+        exprs += con.args
+    visited = set()
+    while exprs:
+        expr = exprs.pop()
+        if id(expr) in visited:
+            continue
+        visited.add(id(expr))
+        if isinstance(expr, QuadForm) and expr.args[1].parameters():
+            return True
+        exprs += expr.args
+    return False
+
+
 class SolvingChain(Chain):
     """A reduction chain that ends with a solver.
 
@@ -151,6 +220,8 @@ class SolvingChain(Chain):
     reductions : list[Reduction]
         A list of reductions. The last reduction in the list must be a solver
         instance.
+    presolve : bool, optional
+        Whether presolve was requested when the chain was constructed.
 
     Attributes
     ----------
@@ -158,13 +229,118 @@ class SolvingChain(Chain):
         A list of reductions.
     solver : Solver
         The solver, i.e., reductions[-1].
+    presolve : bool
+        Whether presolve was requested when the chain was constructed.
     """
 
-    def __init__(self, reductions=[]):
+    def __init__(self, reductions=[], presolve=False):
         super(SolvingChain, self).__init__(reductions=reductions)
+        self.presolve = presolve
         if not isinstance(self.reductions[-1], Solver):
             raise ValueError("Solving chains must terminate with a Solver.")
         self.solver = self.reductions[-1]
+        # The key (see _param_cache_key) of the problem applied last, the
+        # problem, and, once it is applied again, its ParamConeProg (see
+        # _param_cone_prog). The problem is kept so its id is not reused.
+        self._param_cache = (None, None, None)
+
+    def apply(self, problem):
+        """Applies the chain to a problem and returns an equivalent problem.
+
+        When the chain is applied again to the same problem, e.g., after the
+        values of its parameters changed, a cone program is stuffed once as
+        a function of the parameters (see ParamConeProg). Its data is then
+        computed from the values of the parameters, without canonicalizing
+        the problem again.
+
+        Parameters
+        ----------
+        problem : Problem
+            The problem to which the chain will be applied.
+
+        Returns
+        -------
+        Problem or dict
+            The problem yielded by applying the reductions in sequence,
+            starting at self.reductions[0].
+        list
+            The inverse data yielded by each of the reductions.
+        """
+        key = _param_cache_key(problem)
+        cached_key, _, param_prog = self._param_cache
+        if key != cached_key:
+            # A problem applied once is not stuffed as a function of its
+            # parameters, as it may never be applied again.
+            self._param_cache = (key, problem, None)
+            return super(SolvingChain, self).apply(problem)
+        if param_prog is None:
+            param_prog = self._param_cone_prog(problem)
+            self._param_cache = (key, problem, param_prog)
+        if not param_prog:
+            return super(SolvingChain, self).apply(problem)
+
+        idx, prog, inverse_data, params = param_prog
+        if any(param.value is None for param in params):
+            raise ParameterError("Problem contains unspecified parameters.")
+        profiler = profiling.PROFILER
+        if profiler is not None:
+            start = profiler.start(type(prog).__name__)
+        problem, inv = prog.apply_parameters()
+        if profiler is not None:
+            profiler.stop(start)
+        inverse_data = inverse_data + [inv]
+        for r in self.reductions[idx+1:]:
+            if profiler is not None:
+                start = profiler.start(type(r).__name__)
+            problem, inv = r.apply(problem)
+            if profiler is not None:
+                profiler.stop(start)
+            inverse_data.append(inv)
+        return problem, inverse_data
+
+    def _param_cone_prog(self, problem):
+        """Stuffs the problem as a function of its parameters.
+
+        Only chains that evaluate the parameters and then reduce the problem
+        to a cone program without using their values are supported.
+
+        Returns
+        -------
+        tuple, bool or None
+            The index of the ConeMatrixStuffing in the chain, the
+            ParamConeProg, the inverse data of the reductions preceding it
+            and the parameters of the problem; False if the chain is not
+            supported, or None if a parameter has no value.
+        """
+        reductions = self.reductions
+        if not isinstance(reductions[0], EvalParams):
+            return False
+        for idx, r in enumerate(reductions[1:], 1):
+            if isinstance(r, ConeMatrixStuffing):
+                break
+            elif type(r) not in (FlipObjective, Dcp2Cone, CvxAttr2Constr):
+                return False
+        else:
+            return False
+        # Quadratic forms are canonicalized using the values of their
+        # matrices.
+        if QuadForm in problem.atoms() and _has_param_quad_form(problem):
+            return False
+
+        params = problem.parameters()
+        if any(param.value is None for param in params):
+            # Left to EvalParams to report, and tried again later.
+            return None
+        inverse_data = [[]]
+        for r in reductions[1:idx]:
+            problem, inv = r.apply(problem)
+            inverse_data.append(inv)
+        try:
+            prog = reductions[idx].param_cone_prog(problem)
+        except ParameterAffineError:
+            # The problem data is not affine in the parameters.
+            return False
+        return idx, prog, inverse_data, params
 
     def solve(self, problem, warm_start, verbose, solver_opts):
         """Solves the problem by applying the chain.
@@ -14,6 +14,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import numpy as np
+
 import cvxpy.interface as intf
 
 
@@ -46,9 +48,61 @@ def get_dual_values(result_vec, parse_func, constraints):
     -------
        A map of constraint id to dual variable value.
     """
+    if parse_func is extract_dual_value:
+        return split_dual_values(result_vec, constraints)
     dual_vars = {}
     offset = 0
     for constr in constraints:
         # TODO reshape based on dual variable size.
         dual_vars[constr.id], offset = parse_func(result_vec, offset, constr)
     return dual_vars
+
+
+def dual_offsets(constraints):
+    """Returns the offsets of the constraints' duals in the result vector.
+
+    Parameters
+    ----------
+    constraints : list
+        A list of the constraints in the problem.
+
+    Returns
+    -------
+    tuple
+        (NumPy array of starting offsets, NumPy array of sizes)
+    """
+    sizes = np.fromiter((constr.size for constr in constraints), dtype=int,
+                        count=len(constraints))
+    starts = np.cumsum(sizes) - sizes
+    return starts, sizes
+
+
+def split_dual_values(result_vec, constraints):
+    """Splits a vector of dual values into the constraints' duals.
+
+    Equivalent to get_dual_values with extract_dual_value, but the
+    offsets are computed at once, scalar duals are read with a single
+    gather and the others are views into result_vec.
+
+    Parameters
+    ----------
+    result_vec : array_like
+        A vector containing the dual variable values.
+    constraints : list
+        A list of the constraints in the problem.
+
+    Returns
+    -------
+       A map of constraint id to dual variable value.
+    """
+    result_vec = np.asarray(result_vec).ravel()
+    starts, sizes = dual_offsets(constraints)
+    ids = [constr.id for constr in constraints]
+    scalar = sizes == 1
+    if scalar.all():
+        return dict(zip(ids, result_vec[starts].tolist()))
+    dual_vars = dict(zip([ids[i] for i in np.flatnonzero(scalar)],
+                         result_vec[starts[scalar]].tolist()))
+    for i in np.flatnonzero(~scalar):
+        dual_vars[ids[i]] = result_vec[starts[i]:starts[i] + sizes[i]]
+    return dual_vars
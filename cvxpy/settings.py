@@ -65,9 +65,10 @@ ELEMENTAL = "ELEMENTAL"
 MOSEK = "MOSEK"
 JULIA_OPT = "JULIA_OPT"
 XPRESS = "XPRESS"
+PDHG = "PDHG"
 SOLVERS = [ECOS, ECOS_BB, CVXOPT, GLPK,
            GLPK_MI, SCS, GUROBI, OSQP, CPLEX, ELEMENTAL,
-           MOSEK, CBC, JULIA_OPT, XPRESS, SUPER_SCS]
+           MOSEK, CBC, JULIA_OPT, XPRESS, SUPER_SCS, PDHG]
 
 # Xpress-specific items
 XPRESS_IIS = "XPRESS_IIS"
@@ -19,7 +19,7 @@ from cvxpy.atoms.affine.add_expr import AddExpression
 from cvxpy.expressions.expression import *
 from cvxpy.expressions.variable import Variable
 from cvxpy.expressions.constants import Constant
-from cvxpy.expressions.constants import Parameter
+from cvxpy.expressions.constants import CallbackParam, Parameter
 from cvxpy import Problem, Minimize
 import cvxpy.utilities as u
 import cvxpy.interface.matrix_utilities as intf
@@ -31,6 +31,7 @@ import numpy as np
 import scipy.sparse as sp
 import warnings
 import sys
+from unittest import mock
 PY35 = sys.version_info >= (3, 5)
 
 
@@ -281,6 +282,63 @@ class TestExpressions(BaseTest):
             p = Parameter((2, 2), NSD=True, value=[[1, 0], [0, -1]])
         self.assertEqual(str(cm.exception), "Parameter value must be negative semidefinite.")
 
+    def test_callback_param(self):
+        """Test caching the values of callback parameters.
+        """
+        p = Parameter(2, value=[1, 2])
+        q = Parameter(value=3)
+        calls = []
+
+        def evaluate(expr):
+            calls.append(expr)
+            return expr.value
+        expr = p*q
+        cb = CallbackParam(lambda: evaluate(expr), expr.shape, [p, q])
+        nested = CallbackParam(lambda: evaluate(cb + 1), (2,), [cb])
+        self.assertItemsAlmostEqual(nested.value, [4, 7])
+        self.assertItemsAlmostEqual(nested.value, [4, 7])
+        self.assertItemsAlmostEqual(cb.value, [3, 6])
+        self.assertEqual(len(calls), 2)
+        # Assigning a value, even an equal one, invalidates the cache.
+        q.value = 3
+        self.assertItemsAlmostEqual(nested.value, [4, 7])
+        self.assertEqual(len(calls), 4)
+        p.value = [0, 1]
+        self.assertItemsAlmostEqual(nested.value, [1, 4])
+        self.assertEqual(len(calls), 6)
+        # Without dependencies, the callback is evaluated on every read.
+        cb = CallbackParam(lambda: evaluate(expr), expr.shape)
+        cb.value
+        cb.value
+        self.assertEqual(len(calls), 8)
+        nested = CallbackParam(lambda: evaluate(cb + 1), (2,), [cb])
+        nested.value
+        self.assertEqual(len(calls), 10)
+
+        # The cached values cannot be modified through the values read.
+        p = Parameter(2, nonneg=True, value=[1, 2])
+        cb = CallbackParam(lambda: p.value*2, (2,), [p])
+        nested = CallbackParam(lambda: cb.value + 1, (2,), [cb])
+        value = nested.value
+        with self.assertRaises(ValueError):
+            value[0] = 0
+        self.assertItemsAlmostEqual(nested.value, [3, 5])
+        # Nor do they change when the dependencies are assigned projected
+        # values, which invalidate the caches.
+        p.project_and_assign([-1, 3])
+        self.assertItemsAlmostEqual(value, [3, 5])
+        self.assertItemsAlmostEqual(cb.value, [0, 6])
+        self.assertItemsAlmostEqual(nested.value, [1, 7])
+
+        # Every way of assigning a value invalidates the cache.
+        x = Variable(2)
+        p = Parameter(value=1.)
+        prob = Problem(Minimize(sum_squares(x) - exp(p)*sum(x)))
+        for value in [2., 3., 0.]:
+            p.project_and_assign(value)
+            self.assertAlmostEqual(prob.solve(solver=s.ECOS),
+                                   -np.exp(2*value)/2, places=3)
+
     # Test the Parameter class on bad inputs.
     def test_parameters_failures(self):
         p = Parameter(name='p')
@@ -492,6 +550,18 @@ class TestExpressions(BaseTest):
         exp = self.x + c + self.x
         self.assertEqual(len(exp.args), 3)
 
+        # Sums built from a common sum have separate args.
+        base = self.x + c
+        exp1 = base + z
+        exp2 = base + self.x
+        self.assertEqual(len(base.args), 2)
+        self.assertIs(exp1.args[2], z)
+        self.assertIs(exp2.args[2], self.x)
+        exp3 = exp2 + z
+        self.assertEqual([id(arg) for arg in exp3.args],
+                         [id(self.x), id(c), id(self.x), id(z)])
+        self.assertEqual(len(exp2.args), 3)
+
         # Test repr.
         self.assertEqual(repr(exp), "Expression(AFFINE, UNKNOWN, (2,))")
 
@@ -1051,3 +1121,63 @@ class TestExpressions(BaseTest):
         expr = pnorm(3 * self.y ** 2, 1)
         self.assertEqual(expr.is_pwl(), False)
 
+
+    def test_deep_tree_traversal(self):
+        """Test tree passes on expressions deeper than the recursion limit.
+        """
+        from cvxpy.reductions.canonicalization import Canonicalization
+        from cvxpy.reductions.dcp2cone.atom_canonicalizers import CANON_METHODS
+        from cvxpy.reductions.eval_params import replace_params_with_consts
+        p = Parameter(2, value=[1., 2.])
+        expr = self.x
+        for _ in range(sys.getrecursionlimit() + 100):
+            expr = -expr
+        self.assertEqual(expr.variables(), [self.x])
+        self.assertEqual(expr.tree_copy().variables(), [self.x])
+        obj, constr = expr.canonical_form
+        self.assertEqual(constr, [])
+
+        expr = pnorm(expr + p, 2)
+        self.assertEqual(expr.parameters(), [p])
+        expr = replace_params_with_consts(expr)
+        self.assertEqual(expr.parameters(), [])
+        _, constr = Canonicalization(CANON_METHODS).canonicalize_tree(expr)
+        self.assertEqual(len(constr), 1)
+
+    def test_variable_free_subtree_canonicalization(self):
+        """Test that variable-free subtrees are found in a single pass.
+        """
+        from cvxpy.reductions.canonicalization import Canonicalization
+        from cvxpy.reductions.dcp2cone.atom_canonicalizers import CANON_METHODS
+        from cvxpy.utilities.canonical import Canonical
+        inner = Constant([1., 2.])
+        const = inner
+        for _ in range(50):
+            const = -(const + 1)
+        expr = self.x + const
+        variables = Canonical.variables
+        with mock.patch.object(Canonical, 'variables', autospec=True,
+                               side_effect=variables) as calls:
+            canon, constr = Canonicalization(
+                CANON_METHODS).canonicalize_tree(expr)
+            self.assertEqual(calls.call_count, 0)
+        self.assertEqual(constr, [])
+        self.assertIsInstance(canon.args[1], Constant)
+        self.assertItemsAlmostEqual(canon.args[1].value, [1., 2.])
+
+        # Constant atoms are canonicalized as a leaf, without their args.
+        obj, constr = expr.canonical_form
+        self.assertEqual(constr, [])
+        self.assertFalse(hasattr(const, '_lazy_canonical_form'))
+        self.assertFalse(hasattr(const.args[0], '_lazy_canonical_form'))
+
+    def test_shared_subexpression_canonicalization(self):
+        """Test that a shared subexpression is canonicalized once per tree.
+        """
+        from cvxpy.reductions.canonicalization import Canonicalization
+        from cvxpy.reductions.dcp2cone.atom_canonicalizers import CANON_METHODS
+        r = abs(self.x - 1)
+        expr = sum(r) + max(r)
+        _, constr = Canonicalization(CANON_METHODS).canonicalize_tree(expr)
+        # Two constraints for abs, one for max.
+        self.assertEqual(len(constr), 3)
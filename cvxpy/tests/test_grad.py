@@ -22,7 +22,8 @@ from cvxpy.transforms.partial_optimize import partial_optimize
 from cvxpy.expressions.variable import Variable
 from cvxpy.expressions.constants import Parameter
 import cvxpy.utilities as u
-from cvxpy.transforms import linearize
+from cvxpy.transforms import linearize, Linearization
+from cvxpy.utilities.eval_plan import EvalPlan
 import numpy as np
 import unittest
 from cvxpy import Problem, Minimize, Maximize
@@ -755,3 +756,74 @@ class TestGrad(BaseTest):
         self.x.value = [1, 2]
         val = np.eye(2)
         self.assertItemsAlmostEqual(expr.grad[self.x].todense(), val)
+
+    def test_eval_plan(self):
+        """Test evaluating values and gradients with an EvalPlan.
+        """
+        x = Variable((3, 1))
+        shared = exp(x) + self.a
+        expr = log_sum_exp(shared) + sum(abs(x - 1)) + 3*pnorm(shared, 2)
+        plan = EvalPlan(expr)
+        self.assertIsNone(plan.value)
+
+        x.value = np.array([[1.], [2.], [3.]])
+        self.a.value = 2
+        value, grad = plan.evaluate(grad=True)
+        self.assertAlmostEqual(value, expr.value)
+        self.assertItemsAlmostEqual(grad[x].todense(), expr.grad[x].todense())
+        self.assertAlmostEqual(grad[self.a], expr.grad[self.a])
+
+        # Supplied values are used instead of the stored ones.
+        self.assertAlmostEqual(plan.evaluate({self.a: 3}),
+                               (log_sum_exp(exp(x) + 3) + sum(abs(x - 1)) +
+                                3*pnorm(exp(x) + 3, 2)).value)
+        self.assertEqual(self.a.value, 2)
+
+        # Subexpressions that do not depend on a changed value are not
+        # recomputed.
+        abs_expr = expr.args[1].args[0]
+        calls = []
+        numeric = abs_expr.numeric
+        abs_expr.numeric = lambda values: calls.append(1) or numeric(values)
+        self.a.value = 1
+        value = plan.value
+        self.assertEqual(len(calls), 0)
+        self.assertAlmostEqual(value, expr.value)
+        x.value = np.zeros((3, 1))
+        del calls[:]
+        value = plan.value
+        self.assertEqual(len(calls), 1)
+        self.assertAlmostEqual(value, expr.value)
+
+    def test_linearization(self):
+        """Test the parametric Linearization.
+        """
+        expr = log(self.x)/2
+        lin = Linearization(expr)
+        with self.assertRaises(Exception) as cm:
+            lin.update()
+        self.assertEqual(str(cm.exception),
+                         "Cannot linearize non-affine expression with missing variable values.")
+
+        self.x.value = [1, 2]
+        lin.update()
+        lin_expr = linearize(expr)
+        self.assertItemsAlmostEqual(lin.expr.value, expr.value)
+        self.x.value = [3, 4.4]
+        self.assertItemsAlmostEqual(lin.expr.value, lin_expr.value)
+
+        # The same problem is solved at each iteration of the
+        # convex-concave method.
+        expr = exp(self.a)
+        lin = Linearization(expr)
+        prob = Problem(Minimize(abs(self.a - 2) - lin.expr), [self.a <= 3])
+        self.a.value = 1
+        for _ in range(3):
+            lin.update()
+            prob.solve()
+        self.assertAlmostEqual(self.a.value, 3, places=2)
+        self.assertEqual(len(lin.parameters), 3)
+
+        # Affine expressions are returned unchanged.
+        expr = 2*self.x - 5
+        self.assertIs(Linearization(expr).expr, expr)
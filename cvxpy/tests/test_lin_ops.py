@@ -156,3 +156,116 @@ class test_lin_ops(BaseTest):
         self.assertEqual(expr.shape, (1, 1))
         self.assertEqual(len(expr.args), 1)
         self.assertEqual(expr.type, lo.SUM_ENTRIES)
+
+    def test_operator(self):
+        """Test the matrix-free coefficient operator.
+        """
+        import cvxpy as cvx
+        from cvxpy.reductions.inverse_data import InverseData
+        from cvxpy.utilities.coeff_extractor import CoeffExtractor
+        np.random.seed(0)
+        x = cvx.Variable((3, 2))
+        y = cvx.Variable(3)
+        z = cvx.Variable()
+        X = cvx.Variable((3, 3))
+        A = np.random.randn(4, 3)
+        c = np.random.randn(5)
+        exprs = [A*x + 1, x*np.random.randn(2, 5), A*y, y*A.T,
+                 sp.random(4, 3, 0.5)*x, cvx.conv(c, y),
+                 cvx.kron(np.random.randn(2, 3), x), z + x, cvx.sum(x) + z,
+                 x[1:, ::-1], x[2::-2, 1], x.T, cvx.reshape(x, (2, 3)),
+                 cvx.diag(y), cvx.diag(X), cvx.upper_tri(X), cvx.trace(X),
+                 cvx.hstack([y, 2*y, c[:3]]),
+                 cvx.vstack([x, x[0:1, :], np.ones((1, 2))]),
+                 cvx.multiply(np.random.randn(3, 2), x), -x/3,
+                 cvx.sum(x, axis=0)]
+        prob = cvx.Problem(cvx.Minimize(0), [expr == 0 for expr in exprs])
+        inverse_data = InverseData(prob)
+        extractor = CoeffExtractor(inverse_data)
+        for expr in exprs + [exprs]:
+            A_mat, b = extractor.affine(expr)
+            A_op, b_op = extractor.affine_operator(expr)
+            self.assertEqual(A_op.shape, A_mat.shape)
+            self.assertItemsAlmostEqual(b_op, b)
+            x_val = np.random.randn(A_op.shape[1])
+            self.assertItemsAlmostEqual(A_op.matvec(x_val), A_mat.dot(x_val))
+            y_val = np.random.randn(A_op.shape[0])
+            self.assertItemsAlmostEqual(A_op.rmatvec(y_val),
+                                        A_mat.T.dot(y_val))
+
+    def test_problem_csr(self):
+        """Test the CSR matrix written by build_matrix.
+        """
+        import cvxpy as cvx
+        from cvxpy.cvxcore.python import canonInterface
+        np.random.seed(0)
+        x = cvx.Variable((3, 2))
+        y = cvx.Variable(3)
+        z = cvx.Variable()
+        A = np.random.randn(4, 3)
+        exprs = [A*x + 1, y*A.T + z, cvx.kron(np.random.randn(2, 3), x),
+                 cvx.conv(np.random.randn(3), y) - 2, z + x + x[::-1, :],
+                 cvx.hstack([y, 2*y, np.ones(3)]), sp.random(4, 3, 0.5)*x]
+        constrs = [create_eq(expr.canonical_form[0]) for expr in exprs]
+        # The variables are numbered against their order of appearance.
+        id_to_col = {z.id: 0, y.id: 1, x.id: 4}
+        A_csr, b = canonInterface.get_problem_csr(constrs, id_to_col, 10)
+        self.assertTrue(A_csr.has_sorted_indices)
+        V, I, J, b_coo = canonInterface.get_problem_matrix(constrs, id_to_col)
+        A_coo = sp.coo_matrix((V, (I, J)), shape=A_csr.shape)
+        self.assertItemsAlmostEqual(A_csr.todense(), A_coo.todense())
+        self.assertItemsAlmostEqual(b, b_coo)
+        self.assertEqual(A_csr.nnz, V.size)
+        sizes = [expr.size for expr in exprs]
+        self.assertEqual(b.size, sum(sizes))
+
+        # Constraints with offsets leave empty rows between them.
+        offsets = np.cumsum([0] + [size + 2 for size in sizes[:-1]])
+        V, I, J, b = canonInterface.get_problem_matrix(constrs, id_to_col,
+                                                       offsets)
+        A_gaps = sp.coo_matrix((V, (I, J)), shape=(b.size, 10)).tocsr()
+        rows = np.concatenate([np.arange(offset, offset + size)
+                               for offset, size in zip(offsets, sizes)])
+        self.assertItemsAlmostEqual(A_gaps[rows].todense(), A_csr.todense())
+        self.assertItemsAlmostEqual(b[rows], b_coo)
+
+    def test_parameter_tensor(self):
+        """Test the tensor built by build_parameter_tensor.
+        """
+        import cvxpy as cvx
+        from cvxpy.cvxcore.python import canonInterface
+        from cvxpy.error import ParameterAffineError
+        np.random.seed(0)
+        x = cvx.Variable(3)
+        X = cvx.Variable((3, 2))
+        a = cvx.Parameter(3)
+        C = cvx.Parameter((2, 3))
+        g = cvx.Parameter()
+        params = [a, C, g]
+        param_to_col = {a.id: 0, C.id: 3, g.id: 9}
+        id_to_col = {x.id: 0, X.id: 3}
+        exprs = [C*x + 1, X.T*a, cvx.multiply(a, x), g*x[0] + X[0, 0],
+                 -(C*(2*x[::-1] + 1)), cvx.vstack([C*X, 2*X[:2]]),
+                 cvx.sum(cvx.multiply(a, X[:, 1])), (C*X).T]
+        constrs = [create_eq(expr.canonical_form[0]) for expr in exprs]
+        V, I, J = canonInterface.get_parameter_tensor(constrs, id_to_col,
+                                                      param_to_col, 9, 10)
+        rows = sum(expr.size for expr in exprs)
+        T = sp.coo_matrix((V, (I, J)), shape=(rows*10, 11)).tocsr()
+        for _ in range(2):
+            for param in params:
+                param.value = np.random.randn(*param.shape)
+            values = np.concatenate([np.ravel(param.value, order='F')
+                                     for param in params] + [[1.]])
+            Ab = np.reshape(T*values, (rows, 10), order='F')
+            consts = [create_eq(replace_params_with_consts(constr.expr))
+                      for constr in constrs]
+            A, b = canonInterface.get_problem_csr(consts, id_to_col, 9)
+            self.assertItemsAlmostEqual(Ab[:, :9], A.todense())
+            self.assertItemsAlmostEqual(Ab[:, 9], b)
+
+        # Products of parameters are not affine.
+        constr = create_eq((C*(g*x)).canonical_form[0])
+        with self.assertRaises(ParameterAffineError):
+            canonInterface.get_parameter_tensor([constr], id_to_col,
+                                                param_to_col, 9, 10)
@@ -311,3 +311,21 @@ class TestLinearCone(BaseTest):
         constraints = [C << [[2, 0], [0, 2]]]
         prob, _ = CvxAttr2Constr().apply(Problem(obj, constraints))
         self.assertTrue(ConeMatrixStuffing().accepts(prob))
+
+    def test_exp_cone_format(self):
+        """Test interleaving the exponential cone arguments.
+        """
+        x = Variable(2)
+        constr = ExpCone(x + 1, 2*x, Constant([3, 4]) + 0*x)
+        prob, _ = ConeMatrixStuffing().apply(Problem(Minimize(0), [constr]))
+        stuffed = prob.constraints[0]
+        z = numpy.array([5, 6])
+        for order in [[0, 1, 2], [0, 2, 1], [2, 1, 0]]:
+            A, b = ECOS().format_constr(prob, stuffed, order)
+            self.assertEqual(A.shape, (6, 2))
+            # (A, b) is such that A * z <=_{EXP} b, so b - A * z
+            # holds the cone entries.
+            vals = b - A.dot(z)
+            args = [z + 1, 2*z, [3, 4]]
+            for i, arg in enumerate(args):
+                self.assertItemsAlmostEqual(vals[order[i]::3], arg)
@@ -14,11 +14,64 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import unittest
+from collections import defaultdict
+
 import cvxpy as cvx
 import numpy as np
+import scipy.sparse as sp
 from cvxpy.tests.base_test import BaseTest
 
 
+def full_lmi_rows(task, i, psd_dims):
+    """Adds the LMI rows of the former format, with a row and a bar matrix
+    per entry of each LMI.
+    """
+    for j, dim in enumerate(psd_dims):
+        for col_idx in range(dim):
+            for row_idx in range(dim):
+                val = 1. if row_idx == col_idx else 0.5
+                row = max(row_idx, col_idx)
+                col = min(row_idx, col_idx)
+                mat = task.appendsparsesymmat(dim, [row], [col], [val])
+                task.putbaraij(i, j, [mat], [1.0])
+                i += 1
+    return i
+
+
+def lmi_task(env, G, psd_dims, i, put_lmi_rows):
+    """Returns a mosek Task with the rows of G and the given LMI rows.
+    """
+    task = env.Task(0, 0)
+    task.appendvars(G.shape[1])
+    task.appendbarvars(psd_dims)
+    task.appendcons(G.shape[0])
+    row, col, vals = sp.find(G)
+    task.putaijlist(row.tolist(), col.tolist(), vals.tolist())
+    put_lmi_rows(task, i, psd_dims)
+    return task
+
+
+def task_coeffs(task):
+    """Returns the A matrix of a mosek Task, dense, and the entries of its
+    bar matrices, keyed by (row, bar variable, row of entry, col of entry).
+    """
+    A = np.zeros((task.getnumcon(), task.getnumvar()))
+    for i in range(task.getnumcon()):
+        nnz = task.getarownumnz(i)
+        sub, val = [0] * nnz, [0.] * nnz
+        task.getarow(i, sub, val)
+        A[i, sub] = val
+    num = task.getnumbarablocktriplets()
+    subi, subj, subk, subl = [0] * num, [0] * num, [0] * num, [0] * num
+    val = [0.] * num
+    task.getbarablocktriplet(subi, subj, subk, subl, val)
+    bara = defaultdict(float)
+    for entry in zip(subi, subj, subk, subl, val):
+        bara[entry[:4]] += entry[4]
+    return A, bara
+
+
 class TestMosek(BaseTest):
     """ Unit tests for solver specific behavior. """
 
@@ -192,3 +245,110 @@ class TestMosek(BaseTest):
         else:
             pass
 
+
+    def test_mosek_psd_format(self):
+        """Test the half-vectorized format of LMIs.
+        """
+        from cvxpy.reductions import ConeMatrixStuffing, CvxAttr2Constr, Dcp2Cone
+        from cvxpy.reductions.solvers.conic_solvers import mosek_conif
+        v = np.arange(6.)
+        X = mosek_conif.vectorized_lower_tri_to_mat(v, 3)
+        self.assertItemsAlmostEqual(X, np.array([[0, 1, 2], [1, 3, 4], [2, 4, 5]]))
+
+        C = np.array([[1., 2.], [3., 4.]])
+        for X, num_asym in [(cvx.Variable((2, 2)), 1),
+                            (cvx.Variable((2, 2), symmetric=True), 0)]:
+            prob = cvx.Problem(cvx.Minimize(cvx.trace(X)), [X + C + C.T >> 0])
+            for reduction in [Dcp2Cone(), CvxAttr2Constr(), ConeMatrixStuffing()]:
+                prob = reduction.apply(prob)[0]
+            con = prob.constraints[-1]
+            G, h, dim = mosek_conif.psd_coeff_offset(prob, con)
+            G_asym, h_asym = mosek_conif.psd_asymmetry_coeff_offset(con)
+            self.assertEqual(dim, 2)
+            self.assertEqual(G.shape[0], 3)
+            self.assertEqual(G_asym.shape[0], num_asym)
+            z = np.arange(1., G.shape[1] + 1)
+            prob.variables()[0].value = z
+            value = con.args[0].value
+            self.assertItemsAlmostEqual(h - G.dot(z), value[[0, 1, 1], [0, 0, 1]])
+            if num_asym:
+                self.assertItemsAlmostEqual(h_asym - G_asym.dot(z),
+                                            [value[0, 1] - value[1, 0]])
+
+    @unittest.skipUnless(cvx.MOSEK in cvx.installed_solvers(),
+                         'MOSEK is not installed.')
+    def test_mosek_psd_full_format(self):
+        """Test the half-vectorized LMIs against all dim**2 entries.
+        """
+        import mosek
+        from cvxpy.reductions import ConeMatrixStuffing, CvxAttr2Constr, Dcp2Cone
+        from cvxpy.reductions.solvers.conic_solvers import mosek_conif
+        from cvxpy.reductions.solvers.conic_solvers.conic_solver import ConicSolver
+        from cvxpy.utilities.tri_packing import lower_tri_vec_indices
+
+        np.random.seed(0)
+        C = np.random.randn(3, 3)
+        X = cvx.Variable((3, 3))
+        Y = cvx.Variable((2, 2), symmetric=True)
+        prob = cvx.Problem(cvx.Minimize(cvx.trace(X) + cvx.trace(Y)),
+                           [X + C + C.T >> 0, Y >> np.eye(2), X[0, 1] == 1])
+        for reduction in [Dcp2Cone(), CvxAttr2Constr(), ConeMatrixStuffing()]:
+            prob = reduction.apply(prob)[0]
+        data, inv_data = mosek_conif.MOSEK().apply(prob)
+        dims = data[cvx.settings.DIMS]
+        self.assertEqual(dims[cvx.settings.PSD_DIM], [3, 2])
+
+        # The former format: all entries of each LMI, G * z <=_{PSD} h.
+        psd_constr = [con for con in prob.constraints
+                      if type(con) == cvx.constraints.PSD]
+        G_full, h_full = [], []
+        for con in psd_constr:
+            coeff, offset = ConicSolver.get_coeff_offset(con.args[0])
+            G_full.append(-sp.csr_matrix(coeff))
+            h_full.append(np.broadcast_to(offset, (con.expr.size,)))
+
+        env = mosek.Env()
+        task = lmi_task(env, data[cvx.settings.G], dims[cvx.settings.PSD_DIM],
+                        dims[cvx.settings.LEQ_DIM] + dims[cvx.settings.EQ_DIM],
+                        mosek_conif.put_lmi_rows)
+        full_task = lmi_task(env, sp.vstack(G_full), dims[cvx.settings.PSD_DIM],
+                             0, full_lmi_rows)
+        A, bara = task_coeffs(task)
+        A_full, bara_full = task_coeffs(full_task)
+
+        # Each row of the half-vectorized LMIs is the row of its lower
+        # triangular entry in the former format.
+        row = dims[cvx.settings.LEQ_DIM] + dims[cvx.settings.EQ_DIM]
+        full_row = 0
+        new_rows = {}
+        for dim, h in zip(dims[cvx.settings.PSD_DIM], h_full):
+            lower, _ = lower_tri_vec_indices(dim)
+            for k, l in enumerate(lower):
+                new_rows[full_row + l] = row + k
+            self.assertItemsAlmostEqual(A[row:row + lower.size],
+                                        A_full[full_row + lower])
+            self.assertItemsAlmostEqual(data[cvx.settings.H][row:row + lower.size],
+                                        h[lower])
+            row += lower.size
+            full_row += dim * dim
+        self.assertEqual(row, A.shape[0])
+        expected = {(new_rows[i],) + key[1:]: val
+                    for key, val in bara_full.items()
+                    for i in [key[0]] if i in new_rows}
+        self.assertEqual(sorted(bara.keys()), sorted(expected.keys()))
+        for key, val in expected.items():
+            self.assertAlmostEqual(bara[key], val)
+
+        # The only equations without a dual variable make the argument of
+        # the nonsymmetric LMI symmetric; its upper and lower entries agree.
+        asym_start = dims[cvx.settings.EQ_DIM] + dims[cvx.settings.LEQ_DIM]
+        sizes = [size for id, size in inv_data['y_slacks'] if id is None]
+        self.assertEqual(sizes, [3])
+        asym_start -= 3
+        lower, upper = lower_tri_vec_indices(3)
+        lower, upper = lower[lower != upper], upper[lower != upper]
+        self.assertItemsAlmostEqual(A[asym_start:asym_start + 3],
+                                    A_full[upper] - A_full[lower])
+        self.assertItemsAlmostEqual(
+            data[cvx.settings.H][asym_start:asym_start + 3],
+            h_full[0][upper] - h_full[0][lower])
@@ -0,0 +1,136 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest import mock
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+import cvxpy as cvx
+from cvxpy.constraints import SOC
+from cvxpy.cvxcore.python import canonInterface
+from cvxpy.tests.base_test import BaseTest
+
+
+class TestPDHG(BaseTest):
+    """ Unit tests for the matrix-free PDHG solver. """
+
+    # Overriden method to assume lower accuracy.
+    def assertItemsAlmostEqual(self, a, b, places=3):
+        super(TestPDHG, self).assertItemsAlmostEqual(a, b, places=places)
+
+    # Overriden method to assume lower accuracy.
+    def assertAlmostEqual(self, a, b, places=3):
+        super(TestPDHG, self).assertAlmostEqual(a, b, places=places)
+
+    def assertSameSolution(self, prob, cons, variables):
+        """Solves prob with ECOS and PDHG and compares the solutions.
+        """
+        result = prob.solve(solver=cvx.ECOS)
+        values = [var.value for var in variables]
+        duals = [con.dual_value for con in cons]
+        self.assertAlmostEqual(prob.solve(solver=cvx.PDHG), result)
+        self.assertEqual(prob.status, cvx.OPTIMAL)
+        for var, value in zip(variables, values):
+            self.assertItemsAlmostEqual(var.value, value)
+        for con, dual in zip(cons, duals):
+            self.assertItemsAlmostEqual(np.ravel(con.dual_value),
+                                        np.ravel(dual))
+
+    def test_cone_program(self):
+        """Test the primal and dual solutions of a cone program.
+        """
+        np.random.seed(0)
+        A = np.random.randn(15, 10)
+        b = np.random.randn(15)
+        x = cvx.Variable(10)
+        cons = [x >= -1, cvx.sum(x) == 1, cvx.norm(x[:5]) <= 2]
+        prob = cvx.Problem(cvx.Minimize(cvx.norm(A*x - b) + cvx.norm(x, 1)),
+                           cons)
+        self.assertSameSolution(prob, cons, [x])
+
+        # The duals of SOC constraints pair each t with a column or a row.
+        X = cvx.Variable((3, 4))
+        t = cvx.Variable(4)
+        u = cvx.Variable(3)
+        C = np.random.randn(3, 4)
+        cons = [SOC(t, X - C), SOC(u, (X + C).T), X[0, 0] == 1]
+        prob = cvx.Problem(cvx.Maximize(-cvx.sum(t) - cvx.sum(u)), cons)
+        self.assertSameSolution(prob, cons, [X, t, u])
+        duals = [con.dual_value for con in cons]
+        cons[1] = SOC(u, X + C, axis=1)
+        prob = cvx.Problem(cvx.Maximize(-cvx.sum(t) - cvx.sum(u)), cons)
+        prob.solve(solver=cvx.PDHG)
+        for con, dual in zip(cons, duals):
+            self.assertItemsAlmostEqual(np.ravel(con.dual_value),
+                                        np.ravel(dual))
+
+    def test_matrix_free(self):
+        """Test that the coefficients of conv and kron are never formed.
+        """
+        np.random.seed(0)
+        n = 50
+        kernel = np.exp(-np.linspace(-2, 2, 7)**2)
+        signal = np.zeros(n)
+        signal[10:20] = 1
+        blurred = np.convolve(kernel/kernel.sum(), signal)
+        x = cvx.Variable(n)
+        K = np.random.randn(2, 3)
+        Z = cvx.Variable((2, 2))
+        obj = (cvx.sum_squares(cvx.conv(kernel/kernel.sum(), x) -
+                               blurred[:, None]) +
+               0.01*cvx.norm(cvx.diff(x), 1) +
+               cvx.norm(cvx.kron(K, Z) - 1, 'fro'))
+        cons = [Z >= 0]
+        prob = cvx.Problem(cvx.Minimize(obj), cons)
+        result = prob.solve(solver=cvx.ECOS)
+        x_value, Z_value = x.value, Z.value
+
+        data, _, _ = prob.get_problem_data(cvx.PDHG)
+        self.assertIsInstance(data[cvx.settings.A], LinearOperator)
+        with mock.patch.object(canonInterface, 'get_problem_matrix',
+                               side_effect=AssertionError):
+            self.assertAlmostEqual(prob.solve(solver=cvx.PDHG), result)
+        self.assertItemsAlmostEqual(x.value, x_value, places=2)
+        self.assertItemsAlmostEqual(Z.value, Z_value)
+
+    def test_warm_start(self):
+        """Test solving again from the last solution.
+        """
+        np.random.seed(0)
+        A = np.random.randn(15, 10)
+        b = cvx.Parameter(15, value=np.random.randn(15))
+        x = cvx.Variable(10)
+        prob = cvx.Problem(cvx.Minimize(cvx.norm(A*x - b)), [x >= 0])
+        prob.solve(solver=cvx.PDHG)
+        num_iters = prob.solver_stats.num_iters
+        result = prob.solve(solver=cvx.PDHG, warm_start=True)
+        self.assertTrue(prob.solver_stats.num_iters < num_iters)
+        self.assertAlmostEqual(result, prob.solve(solver=cvx.ECOS))
+
+        b.value = b.value + 0.01
+        result = prob.solve(solver=cvx.PDHG, warm_start=True)
+        self.assertAlmostEqual(result, prob.solve(solver=cvx.ECOS))
+
+    def test_max_iters(self):
+        """Test the status when the solver runs out of iterations.
+        """
+        x = cvx.Variable(2)
+        prob = cvx.Problem(cvx.Minimize(cvx.norm(x - 1)), [x >= 0])
+        with self.assertRaises(cvx.SolverError):
+            prob.solve(solver=cvx.PDHG, max_iters=2)
+        prob.solve(solver=cvx.PDHG, max_iters=2, eps_abs=1e3)
+        self.assertEqual(prob.status, cvx.OPTIMAL)
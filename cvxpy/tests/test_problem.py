@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from unittest import mock
 from fractions import Fraction
 import cvxpy.settings as s
 import cvxpy as cvx
@@ -22,14 +23,21 @@ from cvxpy.error import DCPError, ParameterError, SolverError
 from cvxpy.expressions.constants import Constant, Parameter
 from cvxpy.expressions.variable import Variable
 from cvxpy.problems.problem import Problem
+from cvxpy.reductions.matrix_stuffing import MatrixStuffing
 from cvxpy.reductions.solvers.conic_solvers.conic_solver import ConicSolver
 from cvxpy.reductions.solvers.conic_solvers import ecos_conif, scs_conif
+from cvxpy.reductions.solvers.solving_chain import construct_solving_chain
 from cvxpy.reductions.solvers.defines import SOLVER_MAP_CONIC, SOLVER_MAP_QP, INSTALLED_SOLVERS
 import cvxpy.interface as intf
 from cvxpy.tests.base_test import BaseTest
+from cvxpy.utilities.profiling import profiling
 from numpy import linalg as LA
 import numpy
+import scipy.sparse as sp
+import os
+import shutil
 import sys
+import tempfile
 # Solvers.
 import scs
 import ecos
@@ -167,6 +175,18 @@ class TestProblem(BaseTest):
         ref = max(p3.shape)
         self.assertEqual(max_data_dim, ref)
 
+    def test_from_reduction(self):
+        """Test creating a problem without validation, as reductions do.
+        """
+        constraints = [self.a >= 1, self.x == 0]
+        p = Problem._from_reduction(cvx.Minimize(self.a), constraints)
+        self.assertIs(p.args[1], constraints)
+        self.assertIsNone(p._vars)
+        self.assertIsNone(p._size_metrics)
+        self.assertEqual(p.variables(), [self.a, self.x])
+        self.assertEqual(p.size_metrics.num_scalar_variables, 3)
+        self.assertAlmostEqual(p.solve(solver=s.ECOS), 1)
+
     def test_solver_stats(self):
         """Test the solver_stats method.
         """
@@ -177,6 +197,27 @@ class TestProblem(BaseTest):
         self.assertGreater(stats.setup_time, 0)
         self.assertGreater(stats.num_iters, 0)
 
+    def test_compilation_stats(self):
+        """Test that shared subexpressions are canonicalized once.
+        """
+        A = numpy.array([[1., 2.], [3., 4.]])
+        r = cvx.abs(A*self.x - 1)
+        prob = Problem(cvx.Minimize(cvx.sum(r)), [r <= 5, cvx.max(r) <= 4])
+        self.assertIsNone(prob.compilation_stats)
+        prob.solve(solver=s.ECOS)
+        stats = prob.compilation_stats
+        self.assertGreater(stats.num_canon_exprs, 0)
+        self.assertGreater(stats.num_shared_exprs, 0)
+        self.assertItemsAlmostEqual(self.x.value, [-1, 1])
+
+        # The abs atom is canonicalized once, so there is a single copy of
+        # its epigraph constraints.
+        data, _, _ = prob.get_problem_data(s.ECOS)
+        unshared = Problem(cvx.Minimize(cvx.sum(cvx.abs(A*self.x - 1))),
+                           [cvx.abs(A*self.x - 1) <= 5,
+                            cvx.max(cvx.abs(A*self.x - 1)) <= 4])
+        unshared_data, _, _ = unshared.get_problem_data(s.ECOS)
+        self.assertLess(data["G"].shape[0], unshared_data["G"].shape[0])
 
     def test_get_problem_data(self):
         """Test get_problem_data method.
@@ -204,6 +245,34 @@ class TestProblem(BaseTest):
             # offsets were correctly parsed until we update the CVXOPT
             # interface.
 
+    def test_broken_solver(self):
+        """Test skipping a solver that is found but fails to import.
+        """
+        from cvxpy.reductions.solvers import defines
+        if s.MOSEK in INSTALLED_SOLVERS:
+            return
+        tmp = tempfile.mkdtemp()
+        os.mkdir(os.path.join(tmp, "mosek"))
+        with open(os.path.join(tmp, "mosek", "__init__.py"), "w") as f:
+            f.write("raise ImportError('broken')\n")
+        sys.path.insert(0, tmp)
+        installed = list(defines.INSTALLED_SOLVERS)
+        try:
+            defines._INSTALLED_SOLVERS = None
+            self.assertIn(s.MOSEK, cvx.installed_solvers())
+            p = Problem(cvx.Minimize(cvx.norm(self.x - 1)))
+            self.assertAlmostEqual(p.solve(), 0)
+            self.assertEqual(p.solver_stats.solver_name, s.ECOS)
+            self.assertNotIn(s.MOSEK, cvx.installed_solvers())
+            with self.assertRaises(SolverError) as cm:
+                p.solve(solver=s.MOSEK)
+            self.assertEqual(str(cm.exception),
+                             "The solver MOSEK is not installed.")
+        finally:
+            sys.path.remove(tmp)
+            shutil.rmtree(tmp)
+            defines._INSTALLED_SOLVERS = installed
+
     def test_unpack_results(self):
         """Test unpack results method.
         """
@@ -908,6 +977,323 @@ class TestProblem(BaseTest):
                 self.assertItemsAlmostEqual(p.constraints[1].dual_value, 4*[0], places=acc)
                 self.assertItemsAlmostEqual(p.constraints[2].dual_value, 6*[0], places=acc)
 
+    def test_scalar_constraint_merging(self):
+        """Test that scalar constraints are stuffed as one constraint.
+        """
+        n = 5
+        x = cvx.Variable(n)
+        expr = 0
+        for i in range(n):
+            expr += (i + 1)*x[i]
+        eq_cons = [x[i] == i for i in range(n - 1)]
+        leq_cons = [x[n - 1] >= 1, x[n - 1] <= 3]
+        p = Problem(cvx.Minimize(expr), eq_cons + leq_cons)
+        data, _, _ = p.get_problem_data(s.ECOS)
+        self.assertEqual(data["A"].shape[0], n - 1)
+        self.assertEqual(data["G"].shape[0], 2)
+
+        result = p.solve(solver=s.ECOS)
+        self.assertAlmostEqual(result, 25)
+        self.assertItemsAlmostEqual(x.value, [0, 1, 2, 3, 1])
+        for i, con in enumerate(eq_cons):
+            self.assertEqual(con.dual_value.shape, ())
+            self.assertAlmostEqual(con.dual_value, -(i + 1))
+        self.assertAlmostEqual(leq_cons[0].dual_value, n)
+        self.assertAlmostEqual(leq_cons[1].dual_value, 0)
+
+        # Merged duals are split by position in the merged constraint,
+        # whatever the order in which the constraints are listed.
+        from cvxpy.reductions import ConeMatrixStuffing
+        from cvxpy.reductions.solution import Solution
+        stuffed, inverse_data = ConeMatrixStuffing().apply(p)
+        inverse_data.dual_table = [(new_con, old_cons[::-1], shapes[::-1])
+                                   for new_con, old_cons, shapes
+                                   in inverse_data.dual_table]
+        dual_vars = {con.id: numpy.arange(float(con.size))
+                     for con in stuffed.constraints}
+        solution = Solution(s.OPTIMAL, 0, {stuffed.variables()[0].id:
+                                           numpy.zeros(n)}, dual_vars, {})
+        duals = ConeMatrixStuffing().invert(solution, inverse_data).dual_vars
+        for i, con in enumerate(eq_cons):
+            self.assertEqual(duals[con.id], i)
+        for i, con in enumerate(leq_cons):
+            self.assertEqual(duals[con.id], i)
+
+        # Only constraints on the same variables are merged, in the order
+        # in which they are listed.
+        y = cvx.Variable()
+        cons = [x[0] == 1, y == 2, x[1] == 3, y + x[2] == 4, y <= 5,
+                x[3] <= 6, y <= 7]
+        p = Problem(cvx.Minimize(cvx.sum(x) + y), cons)
+        stuffed, inverse_data = ConeMatrixStuffing().apply(p)
+        stuffed_ids = [con.id for con in stuffed.constraints]
+        groups = [[0, 2], [1], [3], [4, 6], [5]]
+        self.assertEqual(len(stuffed.constraints), len(groups))
+        for pos, group in enumerate(groups):
+            for idx, con_idx in enumerate(group):
+                con_id = cons[con_idx].id
+                self.assertEqual(inverse_data.cons_id_map[con_id],
+                                 stuffed_ids[pos])
+                if len(group) > 1:
+                    self.assertEqual(inverse_data.merged_cons[con_id], idx)
+                else:
+                    self.assertNotIn(con_id, inverse_data.merged_cons)
+
+    def test_dual_value_table(self):
+        """Test splitting the solver's duals among the constraints.
+        """
+        from cvxpy.reductions.solvers import utilities
+        x = cvx.Variable(3)
+        X = cvx.Variable((2, 2))
+        cons = [x[:2] >= 1, x[2] >= 2, X >= 0]
+        result_vec = numpy.arange(7.)
+        duals = utilities.split_dual_values(result_vec, cons)
+        self.assertItemsAlmostEqual(duals[cons[0].id], [0, 1])
+        self.assertEqual(duals[cons[1].id], 2)
+        self.assertItemsAlmostEqual(duals[cons[2].id], [3, 4, 5, 6])
+        # Duals of vector constraints are views of the solver's output.
+        self.assertTrue(numpy.shares_memory(duals[cons[2].id], result_vec))
+        # A custom parse function goes through the constraints in order.
+        looped = utilities.get_dual_values(
+            result_vec, lambda *args: utilities.extract_dual_value(*args),
+            cons)
+        for con in cons:
+            self.assertItemsAlmostEqual(looped[con.id], duals[con.id])
+
+        p = Problem(cvx.Minimize(cvx.sum(x) + cvx.sum(X)), cons)
+        p.solve(solver=s.ECOS)
+        self.assertItemsAlmostEqual(cons[0].dual_value, [1, 1])
+        self.assertAlmostEqual(cons[1].dual_value, 1)
+        self.assertItemsAlmostEqual(cons[2].dual_value, numpy.ones((2, 2)))
+
+    def test_return_raw(self):
+        """Test solving without saving the solution in the problem.
+        """
+        x = cvx.Variable(3)
+        y = cvx.Variable(2, nonneg=True)
+        cons = [x >= 1, y >= -1]
+        p = Problem(cvx.Minimize(cvx.sum(x) + cvx.sum(y)), cons)
+        invert = MatrixStuffing.invert
+        with mock.patch.object(MatrixStuffing, 'invert', autospec=True,
+                               side_effect=invert) as stuffing_invert:
+            result = p.solve(solver=s.ECOS, return_raw=True)
+            self.assertEqual(result.status, s.OPTIMAL)
+            # Only the solver's output is unpacked until a value is read.
+            self.assertIsNone(result._solution)
+            self.assertEqual(stuffing_invert.call_count, 0)
+            self.assertIs(result.raw['x'], result.primal)
+            self.assertEqual(len(result.inverse_data),
+                             len(p._solving_chain.reductions))
+            self.assertAlmostEqual(result.value, 3)
+            result.primal_values
+            result.dual_values
+            self.assertEqual(stuffing_invert.call_count, 1)
+        self.assertEqual(p.value, None)
+        self.assertEqual(x.value, None)
+        self.assertEqual(cons[0].dual_value, None)
+
+        self.assertItemsAlmostEqual(result.primal_value(x), [1, 1, 1])
+        self.assertItemsAlmostEqual(result.primal_value(y), [0, 0])
+        self.assertItemsAlmostEqual(result.dual_value(cons[0]), [1, 1, 1])
+        # x is a view of the stacked primal vector; y is projected onto
+        # the nonnegative orthant, so it is not indexed.
+        self.assertEqual(list(result.index_map.keys()), [x.id])
+        start, stop, shape = result.index_map[x.id]
+        self.assertEqual(shape, (3,))
+        self.assertItemsAlmostEqual(result.primal[start:stop], [1, 1, 1])
+        # The duals of y >= 0 and of the constraints are consecutive slices
+        # of ECOS's z, so they are stacked without a copy.
+        self.assertTrue(numpy.shares_memory(result.dual, result.raw['z']))
+        self.assertItemsAlmostEqual(result.dual, [1, 1, 1, 1, 1, 0, 0])
+        self.assertEqual(set(result.dual_index_map.keys()),
+                         {cons[0].id, cons[1].id})
+        self.assertTrue(numpy.shares_memory(result.dual_value(cons[1]),
+                                            result.dual))
+
+        result.save()
+        self.assertAlmostEqual(p.value, 3)
+        self.assertEqual(p.status, s.OPTIMAL)
+        self.assertItemsAlmostEqual(x.value, [1, 1, 1])
+        self.assertItemsAlmostEqual(cons[0].dual_value, [1, 1, 1])
+
+        p = Problem(cvx.Minimize(cvx.sum(x)), [x >= 1, x <= 0])
+        result = p.solve(solver=s.ECOS, return_raw=True)
+        self.assertEqual(result.status, s.INFEASIBLE)
+        self.assertEqual(result.primal, None)
+        self.assertEqual(result.primal_value(x), None)
+
+        with self.assertRaises(ValueError):
+            p.solve(solver=s.ECOS, parallel=True, return_raw=True)
+
+    def test_profile(self):
+        """Test profiling the compilation of a problem.
+        """
+        from cvxpy.utilities import profiling
+        x = cvx.Variable(3)
+        p = Problem(cvx.Minimize(cvx.norm(x - 1) + cvx.sum(cvx.exp(x))),
+                    [x >= 0])
+        result = p.solve(solver=s.ECOS)
+        self.assertEqual(p.profiler, None)
+        self.assertAlmostEqual(p.solve(solver=s.ECOS, profile=True), result)
+        self.assertEqual(profiling.PROFILER, None)
+
+        totals = p.profiler.totals()
+        for name in ["solve", "Dcp2Cone", "ConeMatrixStuffing", "ECOS",
+                     "Pnorm", "exp", "cvxcore", "build_matrix",
+                     "solve_via_data"]:
+            self.assertIn(name, totals)
+        self.assertIn(("solve", "compile", "Dcp2Cone", "exp"), p.profiler.stats)
+        self.assertTrue(totals["cvxcore"][2] > 0)
+        self.assertEqual(totals["build_matrix"][2], totals["cvxcore"][2])
+        # The time and nonzeros of the coefficients of each LinOp type are
+        # nested in build_matrix.
+        lin_op_frames = [key for key in p.profiler.stats
+                         if len(key) > 1 and key[-2] == "build_matrix"]
+        self.assertIn("variable", [key[-1] for key in lin_op_frames])
+        self.assertIn("sum", [key[-1] for key in lin_op_frames])
+        for key in lin_op_frames:
+            calls, seconds, nnz = p.profiler.stats[key]
+            self.assertTrue(calls > 0 and seconds >= 0 and nnz >= 0)
+        self.assertTrue(totals["variable"][2] > 0)
+        collapsed = p.profiler.collapsed()
+        self.assertIn(";cvxcore;build_matrix;variable ", collapsed)
+        for line in collapsed.splitlines():
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertEqual(stack.split(";")[0], "solve")
+            self.assertTrue(int(microseconds) >= 0)
+        self.assertIn("Dcp2Cone", p.profiler.report())
+
+    def test_coeff_cache(self):
+        """Test reusing the coefficients of parameter-free constraints.
+        """
+        numpy.random.seed(0)
+        A = numpy.random.randn(5, 3)
+        x = cvx.Variable(3)
+        gamma = cvx.Parameter(nonneg=True, value=1)
+
+        def make_problem():
+            cons = [A*x <= 1, x[0] + x[1] <= 1, x[1] + x[2] <= 1,
+                    cvx.norm(x) <= 2*gamma]
+            return Problem(cvx.Minimize(cvx.sum(x)), cons)
+        p = make_problem()
+        with profiling() as profiler:
+            p.get_problem_data(s.ECOS)
+        calls = profiler.totals()["cvxcore"][0]
+        gamma.value = 2
+        with profiling() as profiler:
+            p.get_problem_data(s.ECOS)
+        self.assertTrue(profiler.totals()["cvxcore"][0] < calls)
+        result = p.solve(solver=s.ECOS)
+        x_value = x.value
+        self.assertAlmostEqual(result, make_problem().solve(solver=s.ECOS))
+        self.assertItemsAlmostEqual(x_value, x.value)
+
+    def test_param_cone_prog(self):
+        """Test solving again from the data stuffed as a function of the
+           parameters.
+        """
+        numpy.random.seed(0)
+        A = numpy.random.randn(6, 3)
+        x = cvx.Variable(3)
+        b = cvx.Parameter(6)
+        C = cvx.Parameter((2, 3))
+        gamma = cvx.Parameter(nonneg=True)
+
+        def make_problem():
+            obj = cvx.sum_squares(A*x - b) + gamma*cvx.norm(x, 1)
+            cons = [C*x <= 1, x[0] >= -gamma, cvx.sum(x) <= 2*gamma + 1]
+            return Problem(cvx.Maximize(-obj), cons)
+        p = make_problem()
+        for _ in range(4):
+            b.value = numpy.random.randn(6)
+            C.value = numpy.random.randn(2, 3)
+            gamma.value = numpy.random.rand()
+            result = p.solve(solver=s.ECOS, profile=True)
+            x_value = x.value
+            duals = [con.dual_value for con in p.constraints]
+            self.assertAlmostEqual(result, make_problem().solve(solver=s.ECOS))
+            self.assertItemsAlmostEqual(x_value, x.value)
+            for con, dual in zip(p.constraints, duals):
+                self.assertItemsAlmostEqual(numpy.atleast_1d(dual),
+                                            numpy.atleast_1d(con.dual_value))
+        # The data is computed from the values of the parameters.
+        totals = p.profiler.totals()
+        self.assertIn("ParamConeProg", totals)
+        self.assertNotIn("Dcp2Cone", totals)
+        self.assertNotIn("cvxcore", totals)
+
+        b.value = None
+        with self.assertRaises(ParameterError):
+            p.solve(solver=s.ECOS)
+
+        # Parameters that multiply each other are evaluated.
+        gamma.value = 1
+        p = Problem(cvx.Minimize(gamma*cvx.norm(x/gamma - 1)), [x >= 0])
+        for value in [1, 2]:
+            gamma.value = value
+            self.assertAlmostEqual(p.solve(solver=s.ECOS), 0)
+            self.assertItemsAlmostEqual(x.value, [value]*3)
+
+        # The stuffed program belongs to the problem it was stuffed from,
+        # and is built when the problem is applied again.
+        b.value = numpy.random.randn(6)
+        p = make_problem()
+        chain = construct_solving_chain(p, s.ECOS)
+        chain.apply(p)
+        self.assertIsNone(chain._param_cache[2])
+        chain.apply(p)
+        self.assertIsInstance(chain._param_cache[2], tuple)
+        q = make_problem()
+        chain.apply(q)
+        self.assertIs(chain._param_cache[1], q)
+        self.assertIsNone(chain._param_cache[2])
+
+        # Data that is not affine in the parameters is stuffed again.
+        p = Problem(cvx.Minimize(gamma*cvx.norm(x/gamma - 1)), [x >= 0])
+        p.solve(solver=s.ECOS)
+        p.solve(solver=s.ECOS)
+        self.assertIs(p._solving_chain._param_cache[2], False)
+
+    def test_presolve(self):
+        """Test removing redundant rows and fixed variables.
+        """
+        numpy.random.seed(0)
+        x = cvx.Variable(4)
+        A = numpy.random.randn(2, 4)
+        cons = [A*x == 1, 2*A[0]*x == 2, x[0] == 0.5, x[1] >= -1,
+                2*x[1] >= -4, x[2] + x[3] <= 1, 3*x[2] + 3*x[3] <= 6,
+                cvx.norm(x[2:]) <= 2]
+        obj = cvx.Minimize(cvx.sum(x))
+        p = Problem(obj, cons)
+        result = p.solve(solver=s.ECOS)
+        x_value = x.value
+
+        data, _, _ = p.get_problem_data(s.ECOS, presolve=True)
+        # x[0] is fixed; the norm introduces an epigraph variable.
+        self.assertEqual(data["A"].shape, (2, 4))
+        self.assertEqual(data["G"].shape[0], 3 + 3)
+        self.assertEqual(p.compilation_stats.num_rows_eliminated, 4)
+        self.assertEqual(p.compilation_stats.num_cols_eliminated, 1)
+
+        self.assertAlmostEqual(p.solve(solver=s.ECOS, presolve=True), result)
+        self.assertItemsAlmostEqual(x.value, x_value)
+        # The duals of the removed rows move to the rows that were kept.
+        self.assertAlmostEqual(cons[1].dual_value, 0)
+        self.assertAlmostEqual(cons[4].dual_value, 0)
+        self.assertAlmostEqual(cons[6].dual_value, 0)
+        grad = numpy.ones(4) + A.T.dot(cons[0].dual_value)
+        grad[0] += cons[2].dual_value
+        grad[1] -= cons[3].dual_value
+        grad[2:] += cons[5].dual_value
+        self.assertItemsAlmostEqual(grad[:2], [0, 0])
+
+        # The chain is reused when presolve does not apply to it.
+        p = Problem(cvx.Minimize(cvx.Constant(1)))
+        p.solve(presolve=True)
+        chain = p._solving_chain
+        p.solve(presolve=True)
+        self.assertTrue(p._solving_chain is chain)
+
     # Test problems with indexing.
     def test_indexing(self):
         # Vector variables
@@ -1157,6 +1543,50 @@ class TestProblem(BaseTest):
         self.assertAlmostEqual(result, 10)
         self.assertItemsAlmostEqual(self.C.value, 2*[1, 2, 2])
 
+    def test_gather_coefficients(self):
+        """Test the coefficients of indexing, transposing, reshaping and
+           promoting, which cvxcore computes without matrix products.
+        """
+        X = Variable((4, 5))
+        Y = Variable((3, 4))
+        X.value = numpy.arange(20.).reshape((4, 5), order='F')
+        Y.value = numpy.arange(20., 32.).reshape((3, 4), order='F')
+        exprs = [X[1:3, ::2], X[::-1, 4:0:-2], X.T, X[::-2, 1:].T[1:, :],
+                 cvx.reshape(X[:, 1:3].T, (2, 4)), X[2, 3] + numpy.zeros((2, 3)),
+                 (2*X + 1)[3, :], cvx.hstack([X[:, 0], Y[0, :]]),
+                 X[[0, 3, 1], 2], (X[:, :3] + Y.T)[1::2, :]]
+        for expr in exprs:
+            p = Problem(cvx.Minimize(0), [expr == 0])
+            data = p.get_problem_data(s.ECOS)[0]
+            x = numpy.concatenate([X.value.flatten('F'), Y.value.flatten('F')])
+            if data["A"].shape[1] == X.size:
+                x = x[:X.size]
+            value = data["A"].dot(x) - data["b"]
+            self.assertItemsAlmostEqual(abs(value),
+                                        abs(numpy.ravel(expr.value, 'F')))
+
+    def test_mul_coefficients(self):
+        """Test the coefficients of left and right multiplication, which
+           cvxcore computes without forming Kronecker products, using dense
+           constants in place.
+        """
+        numpy.random.seed(0)
+        X = Variable((4, 3))
+        X.value = numpy.random.randn(4, 3)
+        A = numpy.random.randn(5, 4)
+        B = numpy.random.randn(3, 2)
+        exprs = [A*X, X*B, A*X*B, (A*X)[::2, :]*B, A*(X*B)[:, 1],
+                 sp.random(5, 4, 0.4, random_state=0)*X, A*(X[:, 0] + X[:, 1]),
+                 X[1, :]*B, A*(X + X*numpy.ones((3, 3))),
+                 # Products of dense constants are computed densely.
+                 numpy.random.randn(2, 5)*(A*X), (A*X*B).T*A]
+        for expr in exprs:
+            p = Problem(cvx.Minimize(0), [expr == 0])
+            data = p.get_problem_data(s.ECOS)[0]
+            value = data["A"].dot(numpy.ravel(X.value, 'F')) - data["b"]
+            self.assertItemsAlmostEqual(abs(value),
+                                        abs(numpy.ravel(expr.value, 'F')))
+
     def test_multiplication_on_left(self):
         """Test multiplication on the left by a non-constant.
         """
@@ -400,3 +400,40 @@ class TestQp(BaseTest):
         result2 = prob.solve(warm_start=False)
         self.assertAlmostEqual(result, result2)
         pass
+
+    def test_quad_form_coeffs(self):
+        """Test the assembly of the quadratic coefficients.
+        """
+        P = sp.csc_matrix(numpy.array([[2., 1.], [1., 3.]]))
+        # Quadratic forms with sparse and dense matrices, and with scalar
+        # and elementwise weights; self.c appears only linearly.
+        expr = (3*QuadForm(self.x, P) + 2*sum_squares(self.y) +
+                power(self.a, 2) + QuadForm(self.x, 2*P.toarray()) +
+                sum(self.x) - self.c + 1)
+        p = Problem(Minimize(expr), [self.y >= 1, self.a >= 1, self.c <= 1])
+        data, _, _ = p.get_problem_data('OSQP')
+        self.assertTrue(sp.issparse(data['P']))
+        row_sums = data['P'].dot(numpy.ones(data['P'].shape[0]))
+        self.assertItemsAlmostEqual(sorted(row_sums[row_sums != 0]),
+                                    [2., 4., 4., 4., 12., 16., 18., 24.])
+        self.assertItemsAlmostEqual(sorted(data['q'][data['q'] != 0]),
+                                    [-1., 1., 1.])
+        result = p.solve(solver='OSQP')
+        self.assertAlmostEqual(result, 6.97, places=3)
+
+    def test_stuffing_preserves_objective(self):
+        """Test that stuffing a QP does not modify its objective.
+        """
+        p = Problem(Minimize(sum_squares(self.x - 1) + 2*power(self.a, 2) +
+                             quad_over_lin(self.y, 2) + sum(self.y)),
+                    [self.y >= 1])
+        symbolic, _ = Qp2SymbolicQp().apply(p)
+        expr = symbolic.objective.expr
+        leaves = [id(leaf) for leaf in expr.atoms() + expr.variables()]
+        args = list(expr.args)
+        stuffed, _ = QpMatrixStuffing().apply(symbolic)
+        self.assertEqual(list(expr.args), args)
+        self.assertEqual([id(leaf) for leaf in
+                          expr.atoms() + expr.variables()], leaves)
+        self.assertAlmostEqual(stuffed.solve(solver='OSQP'),
+                               p.solve(solver='OSQP'), places=3)
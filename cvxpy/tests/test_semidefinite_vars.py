@@ -82,3 +82,35 @@ class TestSemidefiniteVariable(BaseTest):
         self.assertAlmostEqual(self.X.value[0, 1], 2, places=2)
         self.assertAlmostEqual(self.X.value[1, 0], 2, places=2)
         self.assertAlmostEqual(self.X.value[1, 1], 4, places=3)
+
+    def test_tri_packing(self):
+        """Test packing and unpacking the triangular entries of a matrix.
+        """
+        from cvxpy.utilities import tri_packing
+        n = 4
+        A = np.arange(n*n, dtype=float).reshape((n, n))
+        A = A + A.T
+        vec = tri_packing.pack_lower_tri(A)
+        self.assertEqual(vec.size, n*(n+1)//2)
+        self.assertItemsAlmostEqual(vec[:n], A[:, 0])
+        self.assertItemsAlmostEqual(tri_packing.unpack_lower_tri(vec, n), A)
+
+        # The fill matrix mirrors the packed entries.
+        fill = tri_packing.upper_tri_to_full(n)
+        self.assertItemsAlmostEqual(fill.dot(vec), A.flatten(order='F'))
+
+        # The scaled packing preserves the trace inner product.
+        B = A**2
+        coeff = tri_packing.scaled_lower_tri_coeff(n)
+        a = coeff.dot(A.flatten(order='F'))
+        b = tri_packing.pack_lower_tri(B, scale=np.sqrt(2))
+        self.assertAlmostEqual(a.dot(b), np.trace(A.dot(B)))
+        unpacked = tri_packing.unpack_lower_tri(a, n, scale=1/np.sqrt(2))
+        self.assertItemsAlmostEqual(unpacked, A)
+
+        # Modifying a coefficient matrix does not affect later calls.
+        fill.data[:] = 0
+        fill = tri_packing.upper_tri_to_full(n)
+        self.assertItemsAlmostEqual(fill.dot(vec), A.flatten(order='F'))
+        with self.assertRaises(ValueError):
+            tri_packing.lower_tri_indices(n)[0][0] = 1
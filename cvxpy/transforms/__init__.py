@@ -16,7 +16,7 @@ limitations under the License.
 
 # from cvxpy.transforms.partial_optimize import partial_optimize
 # from cvxpy.transforms.separable_problems import get_separable_problems
-from cvxpy.transforms.linearize import linearize
+from cvxpy.transforms.linearize import linearize, Linearization
 from cvxpy.transforms.indicator import indicator
 from cvxpy.transforms.scalarize import (weighted_sum,
                                         targets_and_priorities,
@@ -14,8 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import numpy as np
+
 from cvxpy.atoms import reshape, vec
-from cvxpy.expressions.constants import Constant
+import cvxpy.interface as intf
+from cvxpy.expressions.constants import Constant, Parameter
+from cvxpy.utilities.eval_plan import EvalPlan
 
 
 def linearize(expr):
@@ -45,12 +49,12 @@ def linearize(expr):
     if expr.is_affine():
         return expr
     else:
-        tangent = expr.value
+        # The value and the gradient are computed in a single pass.
+        tangent, grad_map = EvalPlan(expr).evaluate(grad=True)
         if tangent is None:
             raise ValueError(
                 "Cannot linearize non-affine expression with missing variable values."
             )
-        grad_map = expr.grad
         for var in expr.variables():
             if grad_map[var] is None:
                 return None
@@ -60,3 +64,85 @@ def linearize(expr):
             else:
                 tangent = tangent + Constant(grad_map[var]).T*(var - var.value)
         return tangent
+
+
+class Linearization(object):
+    """A parametric affine approximation to an expression.
+
+    Unlike :func:`linearize`, which builds a new expression each time it is
+    called, a Linearization builds its affine expression once. The point at
+    which the approximation is taken, the gradient and the value there are
+    held in parameters, which :meth:`update` sets from the current variable
+    values. A problem built with ``Linearization.expr`` can therefore be
+    solved repeatedly, e.g., in the convex-concave method, without
+    constructing a new problem at each iteration:
+
+    .. code :: python
+
+        lin_g = Linearization(g)
+        prob = Problem(Minimize(f - lin_g.expr))
+        for iters in range(N):
+            lin_g.update()
+            prob.solve()
+
+    Parameters
+    ----------
+    expr : Expression
+        The expression to approximate.
+    """
+
+    def __init__(self, expr):
+        self.original = Constant.cast_to_const(expr)
+        self._plan = None
+        self._params = []
+        if self.original.is_affine():
+            self.expr = self.original
+            return
+        self._plan = EvalPlan(self.original)
+        shape = self.original.shape
+        size = self.original.size
+        self._value = Parameter(shape)
+        self.expr = self._value
+        for var in self.original.variables():
+            point = Parameter(var.shape)
+            grad = Parameter((var.size, size))
+            self._params.append((var, point, grad))
+            self.expr = self.expr + reshape(grad.T*vec(var - point), shape)
+
+    @property
+    def parameters(self):
+        """list : The parameters of the affine expression.
+        """
+        if self._plan is None:
+            return []
+        return [self._value] + [param for _, point, grad in self._params
+                                for param in (point, grad)]
+
+    def update(self):
+        """Moves the approximation to the current variable values.
+
+        Raises
+        ------
+        ValueError
+            If a variable has no value, or the expression is not
+            differentiable at the variable values.
+        """
+        if self._plan is None:
+            return
+        value, grad_map = self._plan.evaluate(grad=True)
+        if value is None:
+            raise ValueError(
+                "Cannot linearize non-affine expression with missing variable values."
+            )
+        for var, _, _ in self._params:
+            if grad_map[var] is None:
+                raise ValueError(
+                    "Cannot linearize expression at the current variable values."
+                )
+        self._value.value = value
+        for var, point, grad in self._params:
+            D = grad_map[var]
+            if intf.is_sparse(D):
+                D = D.toarray()
+            point.value = var.value
+            grad.value = np.reshape(D, grad.shape, order='F')
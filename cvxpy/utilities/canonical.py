@@ -16,6 +16,7 @@ limitations under the License.
 
 import abc
 from cvxpy.utilities import performance_utils as pu
+from cvxpy.utilities.traversal import get_args, post_order
 
 
 class Canonical(object):
@@ -43,32 +44,47 @@ class Canonical(object):
     def variables(self):
         """Returns all the variables present in the arguments.
         """
-        # Remove duplicates.
-        return list(set(var for arg in self.args for var in arg.variables()))
+        return self._collect_leaves('variables')
 
     def parameters(self):
         """Returns all the parameters present in the arguments.
         """
-        # Remove duplicates.
-        return list(set(param for arg in self.args for param in arg.parameters()))
+        return self._collect_leaves('parameters')
 
     def constants(self):
         """Returns all the constants present in the arguments.
         """
-        const_list = (const for arg in self.args for const in arg.constants())
-        # Remove duplicates:
-        const_dict = {id(constant): constant for constant in const_list}
-        return list(const_dict.values())
+        return self._collect_leaves('constants')
+
+    def _collect_leaves(self, method):
+        """Gathers the objects returned by the leaves' accessor METHOD.
+
+        Nodes that override METHOD (e.g., leaves) are asked directly;
+        all other nodes are traversed. Duplicates are removed.
+        """
+        default = getattr(Canonical, method)
+
+        def overrides(node):
+            return node is not self and not isinstance(node, list) and \
+                getattr(type(node), method) != default
+
+        found = {}
+
+        def visit(node, _):
+            if overrides(node):
+                for obj in getattr(node, method)():
+                    found[id(obj)] = obj
+
+        post_order(self, visit,
+                   lambda node: [] if overrides(node) else get_args(node))
+        return list(found.values())
 
     def tree_copy(self, id_objects={}):
-        new_args = []
-        for arg in self.args:
-            if isinstance(arg, list):
-                arg_list = [elem.tree_copy(id_objects) for elem in arg]
-                new_args.append(arg_list)
-            else:
-                new_args.append(arg.tree_copy(id_objects))
-        return self.copy(args=new_args, id_objects=id_objects)
+        def visit(node, new_args):
+            if isinstance(node, list):
+                return new_args
+            return node.copy(args=new_args, id_objects=id_objects)
+        return post_order(self, visit)
 
     def copy(self, args=None, id_objects={}):
         """Returns a shallow copy of the object.
@@ -16,18 +16,13 @@ limitations under the License.
 
 from __future__ import division
 
-import operator
-
 import numpy as np
 import scipy.sparse as sp
 
-import cvxpy
 from cvxpy.cvxcore.python import canonInterface
 import cvxpy.lin_ops.lin_utils as lu
-from cvxpy.reductions.inverse_data import InverseData
+from cvxpy.lin_ops.lin_operator import get_problem_operator
 from cvxpy.utilities.replace_quad_forms import replace_quad_forms
-from cvxpy.lin_ops.lin_op import LinOp, NO_OP
-from cvxpy.problems.objective import Minimize
 
 
 # TODO find best format for sparse matrices: csr, csc, dok, lil, ...
@@ -58,8 +53,10 @@ class CoeffExtractor(object):
 
         Parameters
         ----------
-        expr : Expression
-            The expression to process.
+        expr : Expression or list
+            The expression to process, or a list of expressions, in which
+            case the coefficients of the expressions are stacked vertically
+            and extracted in a single pass.
 
         Returns
         -------
@@ -68,99 +65,148 @@ class CoeffExtractor(object):
         NumPy.ndarray
             The offset vector b of shape (np.prod(expr.shape,)).
         """
-        if not expr.is_affine():
+        exprs = expr if isinstance(expr, list) else [expr]
+        if not all(e.is_affine() for e in exprs):
             raise ValueError("Expression is not affine")
-        s, _ = expr.canonical_form
-        V, I, J, b = canonInterface.get_problem_matrix([lu.create_eq(s)],
-                                                       self.id_map)
-        A = sp.csr_matrix((V, (I, J)), shape=(expr.size, self.N))
-        return A, b.flatten()
-
-    def extract_quadratic_coeffs(self, affine_expr, quad_forms):
-        # TODO(akshayka): What are the assumptions on the affine expression
-        # supplied to this method?
-
-        # Extract affine data.
-        affine_problem = cvxpy.Problem(Minimize(affine_expr), [])
-        affine_inverse_data = InverseData(affine_problem)
-        affine_id_map = affine_inverse_data.id_map
-        affine_var_shapes = affine_inverse_data.var_shapes
-        extractor = CoeffExtractor(affine_inverse_data)
-        c, b = extractor.affine(affine_problem.objective.expr)
-
-        # Combine affine data with quadforms.
-        coeffs = {}
-        for var in affine_problem.variables():
-            if var.id in quad_forms:
-                var_id = var.id
-                orig_id = quad_forms[var_id][2].args[0].id
-                var_offset = affine_id_map[var_id][0]
-                var_size = affine_id_map[var_id][1]
-                if quad_forms[var_id][2].P.value is not None:
-                    c_part = c[0, var_offset:var_offset+var_size].toarray().flatten()
-                    P = quad_forms[var_id][2].P.value
-                    if sp.issparse(P):
-                        P = P.toarray()
-                    P = c_part * P
-                else:
-                    P = sp.diags(c[0, var_offset:var_offset+var_size].toarray().flatten())
-                if orig_id in coeffs:
-                    coeffs[orig_id]['P'] += P
-                    coeffs[orig_id]['q'] += np.zeros(P.shape[0])
-                else:
-                    coeffs[orig_id] = dict()
-                    coeffs[orig_id]['P'] = P
-                    coeffs[orig_id]['q'] = np.zeros(P.shape[0])
-            else:
-                var_offset = affine_id_map[var.id][0]
-                var_size = np.prod(affine_var_shapes[var.id], dtype=int)
-                if var.id in coeffs:
-                    coeffs[var.id]['P'] += sp.csr_matrix((var_size, var_size))
-                    coeffs[var.id]['q'] += c[
-                        0, var_offset:var_offset+var_size].toarray().flatten()
-                else:
-                    coeffs[var.id] = dict()
-                    coeffs[var.id]['P'] = sp.csr_matrix((var_size, var_size))
-                    coeffs[var.id]['q'] = c[
-                        0, var_offset:var_offset+var_size].toarray().flatten()
-        return coeffs, b
+        # The coefficients of parameter-free expressions only depend on the
+        # offsets of their variables, so they are stored on the (first)
+        # expression and reused when it is compiled again, e.g., when the
+        # problem is solved again after changing the values of parameters
+        # that appear in other constraints.
+        cacheable = not any(e.parameters() for e in exprs)
+        if cacheable:
+            offsets = tuple(self.id_map.get(var.id) for e in exprs
+                            for var in e.variables())
+            cached = getattr(exprs[0], '_coeff_cache', None)
+            if (cached is not None and cached[1] == offsets and
+                    len(cached[0]) == len(exprs) and
+                    all(old is new for old, new in zip(cached[0], exprs))):
+                A, b = cached[2], cached[3]
+                if A.shape[1] != self.N:
+                    A = sp.csr_matrix((A.data, A.indices, A.indptr),
+                                      shape=(A.shape[0], self.N))
+                return A, b
+        # Parameters are evaluated at their current values.
+        constrs = [lu.create_eq(e.canonical_form[0] if cacheable else
+                                lu.replace_params_with_consts(
+                                    e.canonical_form[0]))
+                   for e in exprs]
+        A, b = canonInterface.get_problem_csr(constrs, self.id_map, self.N)
+        if cacheable:
+            exprs[0]._coeff_cache = (exprs, offsets, A, b)
+        return A, b
+
+    def affine_tensor(self, expr, param_offsets, param_length):
+        """Extract [A | b] from an affine expression as an affine function of
+           its parameters.
+
+        Parameters
+        ----------
+        expr : Expression or list
+            The expression to process, or a list of expressions, in which
+            case the coefficients of the expressions are stacked vertically.
+        param_offsets : dict
+            Map from parameter id to offset in the vector of parameter
+            entries.
+        param_length : int
+            The number of parameter entries.
+
+        Returns
+        -------
+        SciPy COO matrix
+            The tensor T of shape (np.prod(expr.shape)*(self.N + 1),
+            param_length + 1) such that [A | b] is T*[p; 1] reshaped in
+            Fortran order, where p stacks the values of the parameters (see
+            canonInterface.get_parameter_tensor).
+
+        Raises
+        ------
+        ValueError
+            If the expression is not affine.
+        ParameterAffineError
+            If [A | b] is not affine in the parameters.
+        """
+        exprs = expr if isinstance(expr, list) else [expr]
+        if not all(e.is_affine() for e in exprs):
+            raise ValueError("Expression is not affine")
+        constrs = [lu.create_eq(e.canonical_form[0]) for e in exprs]
+        V, I, J = canonInterface.get_parameter_tensor(
+            constrs, self.id_map, param_offsets, self.N, param_length)
+        size = sum(e.size for e in exprs)
+        return sp.coo_matrix((V, (I, J)),
+                             shape=(size*(self.N + 1), param_length + 1))
+
+    def affine_operator(self, expr):
+        """Extract a matrix-free A, b from an expression that is reducable
+           to A*x + b.
+
+        Parameters
+        ----------
+        expr : Expression or list
+            The expression to process, or a list of expressions, in which
+            case the coefficients of the expressions are stacked vertically.
+
+        Returns
+        -------
+        SciPy LinearOperator
+            The coefficient operator A of shape (np.prod(expr.shape), self.N),
+            which is applied without forming its matrix.
+        NumPy.ndarray
+            The offset vector b of shape (np.prod(expr.shape,)).
+        """
+        exprs = expr if isinstance(expr, list) else [expr]
+        if not all(e.is_affine() for e in exprs):
+            raise ValueError("Expression is not affine")
+        lin_ops = [e.canonical_form[0] for e in exprs]
+        return get_problem_operator(lin_ops, self.id_map, self.N)
 
     def quad_form(self, expr):
         """Extract quadratic, linear constant parts of a quadratic objective.
+
+        The quadratic forms are replaced by placeholder variables, without
+        modifying expr, and the coefficients of the resulting affine
+        expression are extracted in a single pass. The coefficients of a
+        placeholder weight the matrix of the quadratic form it replaces.
         """
-        # Insert no-op such that root is never a quadratic form, for easier
-        # processing
-        root = LinOp(NO_OP, expr.shape, [expr], [])
-
-        # Replace quadratic forms with dummy variables.
-        quad_forms = replace_quad_forms(root, {})
-
-        # Calculate affine parts and combine them with quadratic forms to get
-        # the coefficients.
-        coeffs, constant = self.extract_quadratic_coeffs(root.args[0],
-                                                         quad_forms)
-
-        # Sort variables corresponding to their starting indices, in ascending
-        # order.
-        offsets = sorted(self.id_map.items(), key=operator.itemgetter(1))
-
-        # Concatenate quadratic matrices and vectors
-        P = sp.csr_matrix((0, 0))
-        q = np.zeros(0)
-        for var_id, offset in offsets:
-            if var_id in coeffs:
-                P = sp.block_diag([P, coeffs[var_id]['P']])
-                q = np.concatenate([q, coeffs[var_id]['q']])
+        quad_forms = {}
+        affine_expr = replace_quad_forms(expr, quad_forms)
+
+        # The placeholders are placed after the variables of the problem.
+        id_map = dict(self.id_map)
+        N = self.N
+        for var_id, quad_form in quad_forms.items():
+            id_map[var_id] = N
+            N += quad_form.size
+        constr = lu.create_eq(affine_expr.canonical_form[0])
+        V, I, J, constant = canonInterface.get_problem_matrix([constr],
+                                                              id_map)
+        constant = constant.flatten()
+        c = np.bincount(J.astype(int), V, minlength=N)
+
+        # Assemble P in one pass from the (row, col, data) triplets of the
+        # quadratic forms, shifted by the offsets of their variables.
+        rows, cols, vals = [], [], []
+        for var_id, quad_form in quad_forms.items():
+            c_part = c[id_map[var_id]:id_map[var_id]+quad_form.size]
+            P = quad_form.P.value
+            if P is not None:
+                P = P.tocoo() if sp.issparse(P) else sp.coo_matrix(P)
+                # Elementwise quadratic forms scale the columns.
+                scale = c_part[P.col] if c_part.size > 1 else c_part[0]
+                row, col, data = P.row, P.col, scale*P.data
             else:
-                shape = self.var_shapes[var_id]
-                size = np.prod(shape, dtype=int)
-                P = sp.block_diag([P, sp.csr_matrix((size, size))])
-                q = np.concatenate([q, np.zeros(size)])
-
-        # TODO(akshayka): This chain of != smells of a bug.
-        if P.shape[0] != P.shape[1] != self.N or q.shape[0] != self.N:
-            raise RuntimeError("Resulting quadratic form does not have "
-                               "appropriate dimensions")
+                row = col = np.arange(c_part.size)
+                data = c_part
+            offset = self.id_map[quad_form.args[0].id]
+            rows.append(row + offset)
+            cols.append(col + offset)
+            vals.append(data)
+        if vals:
+            rows, cols, vals = [np.concatenate(arr) for arr in
+                                (rows, cols, vals)]
+        P = sp.csr_matrix((vals, (rows, cols)), shape=(self.N, self.N))
+        q = c[:self.N]
+
         if constant.size != 1:
             raise RuntimeError("Constant must be a scalar")
-        return P.tocsr(), q, constant[0]
+        return P, q, constant[0]
@@ -0,0 +1,212 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from cvxpy.atoms.atom import Atom
+import cvxpy.interface as intf
+from cvxpy.expressions.constants import Constant
+from cvxpy.expressions.leaf import Leaf
+from cvxpy.utilities import grad as grad_utils
+from cvxpy.utilities.traversal import post_order
+
+
+class EvalPlan(object):
+    """A reusable program that evaluates an expression and its gradient.
+
+    The expression DAG is sorted topologically once, when the plan is built.
+    Each evaluation then visits the nodes in that order, computing each node
+    from the cached results of its arguments, so a node shared by several
+    parents is evaluated once. Results are kept between evaluations, and
+    a node is only recomputed if the value of a variable or parameter it
+    depends on has changed since the previous evaluation.
+
+    The results are those of ``expr.value`` and ``expr.grad``.
+
+    Parameters
+    ----------
+    expr : Expression
+        The expression to evaluate.
+    """
+
+    def __init__(self, expr):
+        self.expr = Constant.cast_to_const(expr)
+        # The nodes in topological order, and the positions of the arguments
+        # of each node.
+        self._nodes = []
+        self._arg_idx = []
+        # The positions of the leaves (variables, parameters, constants and
+        # nodes that implement value or grad themselves).
+        self._leaf_idx = []
+
+        def visit(node, arg_idx):
+            self._nodes.append(node)
+            self._arg_idx.append(arg_idx)
+            if not arg_idx:
+                self._leaf_idx.append(len(self._nodes) - 1)
+            return len(self._nodes) - 1
+
+        post_order(self.expr, visit, self._children)
+
+        num_nodes = len(self._nodes)
+        self._values = [None]*num_nodes
+        self._grads = [None]*num_nodes
+        self._has_value = [False]*num_nodes
+        self._has_grad = [False]*num_nodes
+        # Copies of the leaf values used by the last evaluation.
+        self._leaf_values = {}
+
+    @staticmethod
+    def _children(node):
+        # Atoms that compute their own value or gradient (e.g., the
+        # objective of a partially optimized problem) are evaluated
+        # directly, as are leaves.
+        if isinstance(node, Atom) and \
+           type(node).value == Atom.value and type(node).grad == Atom.grad:
+            return node.args
+        return []
+
+    def evaluate(self, values=None, grad=False):
+        """Evaluates the expression.
+
+        Parameters
+        ----------
+        values : dict, optional
+            A map from variables or parameters to values used instead of the
+            values stored in them. The stored values are not modified.
+        grad : bool, optional
+            Whether to also evaluate the gradient.
+
+        Returns
+        -------
+        The value of the expression, and, if ``grad`` is True, a map of
+        variable to the gradient of the expression w.r.t. that variable.
+        """
+        if values is None:
+            values = {}
+        self._update_leaves(values)
+        for idx, node in enumerate(self._nodes):
+            if not self._has_value[idx]:
+                self._values[idx] = self._node_value(idx, node)
+                self._has_value[idx] = True
+        if not grad:
+            return self._values[-1]
+        for idx, node in enumerate(self._nodes):
+            if not self._has_grad[idx]:
+                self._grads[idx] = self._node_grad(idx, node)
+                self._has_grad[idx] = True
+        return self._values[-1], self._grads[-1]
+
+    @property
+    def value(self):
+        """The value of the expression at the current variable values.
+        """
+        return self.evaluate()
+
+    @property
+    def grad(self):
+        """The gradient of the expression at the current variable values.
+        """
+        return self.evaluate(grad=True)[1]
+
+    def _update_leaves(self, values):
+        """Invalidates the results that depend on a changed leaf value.
+        """
+        # Whether some argument of the node has changed.
+        dirty = [False]*len(self._nodes)
+        for idx in self._leaf_idx:
+            node = self._nodes[idx]
+            if isinstance(node, Constant):
+                continue
+            val = values[node] if node in values else node.value
+            if isinstance(node, Leaf):
+                if idx in self._leaf_values and \
+                   self._same_value(self._leaf_values[idx], val):
+                    continue
+                self._leaf_values[idx] = self._copy_value(val)
+            # Values of leaves are not cached, since they are read from the
+            # expression or from the supplied values.
+            self._values[idx] = val
+            self._grads[idx] = None
+            self._has_value[idx] = True
+            self._has_grad[idx] = False
+            dirty[idx] = True
+        for idx in range(len(self._nodes)):
+            if not dirty[idx] and any(dirty[i] for i in self._arg_idx[idx]):
+                dirty[idx] = True
+                self._has_value[idx] = False
+                self._has_grad[idx] = False
+
+    @staticmethod
+    def _same_value(old, new):
+        if old is None or new is None:
+            return old is new
+        if intf.is_sparse(old) or intf.is_sparse(new):
+            return old is new
+        return np.shape(old) == np.shape(new) and np.array_equal(old, new)
+
+    @staticmethod
+    def _copy_value(val):
+        if val is None or intf.is_sparse(val):
+            return val
+        return np.array(val, copy=True)
+
+    def _node_value(self, idx, node):
+        if not self._arg_idx[idx]:
+            return node.value
+        # Mirrors Atom.value.
+        if 0 in node.shape:
+            return np.array([])
+        elif node.is_zero():
+            return intf.DEFAULT_INTF.zeros(node.shape)
+        arg_values = [self._values[i] for i in self._arg_idx[idx]]
+        if any(val is None for val in arg_values) and not node.is_constant():
+            return None
+        return node.numeric(arg_values)
+
+    def _node_grad(self, idx, node):
+        if not self._arg_idx[idx]:
+            if isinstance(node, Leaf) and node.variables():
+                return {node: sp.eye(node.size).tocsc()}
+            elif isinstance(node, Leaf):
+                return {}
+            return node.grad
+        # Mirrors Atom.grad.
+        if node.is_constant():
+            return grad_utils.constant_grad(node)
+        arg_values = [self._values[i] for i in self._arg_idx[idx]]
+        if any(val is None for val in arg_values):
+            return grad_utils.error_grad(node)
+
+        grad_self = node._grad(arg_values)
+        result = {}
+        for k, i in enumerate(self._arg_idx[idx]):
+            grad_arg = self._grads[i]
+            for key in grad_arg:
+                if grad_arg[key] is None or grad_self[k] is None:
+                    result[key] = None
+                else:
+                    D = grad_arg[key]*grad_self[k]
+                    # Convert 1x1 matrices to scalars.
+                    if not np.isscalar(D) and D.shape == (1, 1):
+                        D = D[0, 0]
+
+                    if key in result:
+                        result[key] += D
+                    else:
+                        result[key] = D
+        return result
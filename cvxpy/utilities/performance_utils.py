@@ -36,4 +36,10 @@ def lazyprop(func):
         if not hasattr(self, attr_name):
             setattr(self, attr_name, func(self))
         return getattr(self, attr_name)
+
+    @_lazyprop.setter
+    def _lazyprop(self, value):
+        """Stores a value computed elsewhere as the evaluated property.
+        """
+        setattr(self, attr_name, value)
     return _lazyprop
@@ -0,0 +1,165 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Opt-in instrumentation of the compilation of problems.
+
+Instrumented code checks whether PROFILER is set, so profiling costs a
+single global lookup per hook when it is disabled. Enable it with
+``Problem.solve(profile=True)`` or with the ``profiling`` context manager.
+"""
+
+from __future__ import print_function
+
+from contextlib import contextmanager
+from timeit import default_timer as timer
+
+
+# The active Profiler, or None if profiling is disabled.
+PROFILER = None
+
+
+class Profiler(object):
+    """Aggregates the time spent in, and the output size of, nested frames.
+
+    Frames are named by what they process, e.g. the reduction being
+    applied, the type of the atom being canonicalized, the cvxcore call
+    computing coefficients or the type of LinOp whose coefficients it
+    computes. Statistics are kept per stack
+    of frame names, and the time recorded for a stack excludes the time
+    of the frames nested in it, as in a flame graph.
+
+    Attributes
+    ----------
+    stats : dict
+        Maps a tuple of frame names to a list [calls, seconds, size].
+    """
+    def __init__(self):
+        self.stats = {}
+        self._stack = []
+        self._child_time = []
+
+    def start(self, name):
+        """Enters a frame; returns the token to pass to stop().
+        """
+        self._stack.append(name)
+        self._child_time.append(0.)
+        return timer()
+
+    def stop(self, start, size=0):
+        """Leaves the innermost frame, recording its output size.
+        """
+        elapsed = timer() - start
+        key = tuple(self._stack)
+        self._stack.pop()
+        self._record(key, elapsed - self._child_time.pop(), size)
+        if self._child_time:
+            self._child_time[-1] += elapsed
+
+    def add(self, name, seconds, size=0, calls=1):
+        """Records calls of a frame nested in the current one whose time was
+           measured by the caller.
+        """
+        self._record(tuple(self._stack) + (name,), seconds, size, calls)
+        if self._child_time:
+            self._child_time[-1] += seconds
+
+    def exclude(self, seconds):
+        """Excludes time spent in the current frame, e.g. on profiling.
+        """
+        if self._child_time:
+            self._child_time[-1] += seconds
+
+    @contextmanager
+    def frame(self, name):
+        start = self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(start)
+
+    def _record(self, key, seconds, size, calls=1):
+        entry = self.stats.get(key)
+        if entry is None:
+            self.stats[key] = [calls, seconds, size]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+            entry[2] += size
+
+    def totals(self):
+        """Returns the statistics aggregated by frame name.
+
+        Returns
+        -------
+        dict
+            Maps a frame name to a list [calls, seconds, size].
+        """
+        totals = {}
+        for key, (calls, seconds, size) in self.stats.items():
+            entry = totals.setdefault(key[-1], [0, 0., 0])
+            entry[0] += calls
+            entry[1] += seconds
+            entry[2] += size
+        return totals
+
+    def report(self):
+        """Returns a table of the frames, by decreasing time.
+        """
+        lines = ["%-40s %10s %12s %12s" % ("frame", "calls", "seconds",
+                                           "size")]
+        totals = sorted(self.totals().items(), key=lambda item: -item[1][1])
+        for name, (calls, seconds, size) in totals:
+            lines.append("%-40s %10d %12.6f %12d" % (name, calls, seconds,
+                                                     size))
+        return "\n".join(lines)
+
+    def collapsed(self):
+        """Returns the stacks in the collapsed format read by flame graph
+           tools: one "frame;frame;frame microseconds" line per stack.
+        """
+        lines = []
+        for key in sorted(self.stats):
+            microseconds = int(round(1e6*max(self.stats[key][1], 0.)))
+            lines.append("%s %d" % (";".join(key), microseconds))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Writes the collapsed stacks to a file.
+        """
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+
+
+@contextmanager
+def profiling(profiler=None):
+    """Enables profiling within a block.
+
+    Parameters
+    ----------
+    profiler : Profiler, optional
+        The profiler to record to; a new one by default.
+
+    Yields
+    ------
+    Profiler
+        The active profiler.
+    """
+    global PROFILER
+    previous = PROFILER
+    PROFILER = Profiler() if profiler is None else profiler
+    try:
+        yield PROFILER
+    finally:
+        PROFILER = previous
@@ -16,20 +16,42 @@ limitations under the License.
 
 from cvxpy.atoms.quad_form import SymbolicQuadForm, QuadForm
 from cvxpy.expressions.variable import Variable
+from cvxpy.utilities.traversal import post_order
+
+
+def is_quad_form(expr):
+    return isinstance(expr, SymbolicQuadForm) or isinstance(expr, QuadForm)
 
 
 def replace_quad_forms(expr, quad_forms):
-    for idx, arg in enumerate(expr.args):
-        if isinstance(arg, SymbolicQuadForm) or isinstance(arg, QuadForm):
-            quad_forms = replace_quad_form(expr, idx, quad_forms)
+    """Replaces the quadratic forms in an expression with variables.
+
+    The expression is not modified: only the nodes on the paths from the
+    root to the quadratic forms are copied.
+
+    Parameters
+    ----------
+    expr : Expression
+        The expression to process.
+    quad_forms : dict
+        Filled with a map from the id of each placeholder variable to the
+        quadratic form it replaces.
+
+    Returns
+    -------
+    Expression
+        The expression with the quadratic forms replaced.
+    """
+    def visit(node, new_args):
+        if is_quad_form(node):
+            placeholder = Variable(node.shape)
+            quad_forms[placeholder.id] = node
+            return placeholder
+        elif all(new is old for new, old in zip(new_args, node.args)):
+            return node
         else:
-            quad_forms = replace_quad_forms(arg, quad_forms)
-    return quad_forms
-
+            return node.copy(new_args)
 
-def replace_quad_form(expr, idx, quad_forms):
-    quad_form = expr.args[idx]
-    placeholder = Variable(quad_form.shape)
-    expr.args[idx] = placeholder
-    quad_forms[placeholder.id] = (expr, idx, quad_form)
-    return quad_forms
+    # The arguments of quadratic forms are not visited.
+    return post_order(expr, visit,
+                      lambda node: [] if is_quad_form(node) else node.args)
@@ -0,0 +1,79 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+def get_args(node):
+    """Returns the children of a node in an expression tree.
+
+    Lists (e.g., the constraints of a problem) are treated as nodes whose
+    children are their elements.
+    """
+    if isinstance(node, list):
+        return node
+    return node.args
+
+
+def post_order(root, visit, children=get_args, memo=None):
+    """Visits the nodes of an expression DAG in post-order.
+
+    The traversal uses an explicit stack rather than recursion, so it is not
+    limited by the interpreter's recursion limit. Each distinct node
+    (by identity) is visited exactly once, even if it is shared by several
+    parents; its children are always visited before it, from left to right.
+
+    Parameters
+    ----------
+    root : object
+        The root of the DAG.
+    visit : function
+        Called as ``visit(node, child_results)``, where ``child_results`` is
+        the list of results of the children of ``node``. The return value is
+        the result of ``node``.
+    children : function, optional
+        Returns the list of children of a node. Nodes for which it returns
+        an empty list are leaves of the traversal.
+    memo : dict, optional
+        A map from ``id(node)`` to ``(node, result)`` for visited nodes.
+        Supply the same dict to several traversals to share results between
+        them.
+
+    Returns
+    -------
+    object
+        The result of visiting ``root``.
+    """
+    if memo is None:
+        memo = {}
+    if id(root) in memo:
+        return memo[id(root)][1]
+    # Entries are (node, children); children is None until the node is
+    # expanded.
+    stack = [(root, None)]
+    while stack:
+        node, kids = stack.pop()
+        if id(node) in memo:
+            continue
+        if kids is None:
+            kids = children(node)
+            stack.append((node, kids))
+            for kid in reversed(kids):
+                if id(kid) not in memo:
+                    stack.append((kid, None))
+        else:
+            # The node is kept in the memo so its id cannot be reused.
+            memo[id(node)] = (node, visit(node, [memo[id(kid)][1]
+                                                 for kid in kids]))
+    return memo[id(root)][1]
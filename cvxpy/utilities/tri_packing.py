@@ -0,0 +1,182 @@
+"""
+Copyright 2013 Steven Diamond
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Packing and unpacking of the triangular entries of square matrices.
+
+A triangle of an n by n matrix is packed into a vector of length
+n*(n+1)//2. Unless stated otherwise, the lower triangle is packed in
+column-major order, which is the order used by SCS and MOSEK, and the
+indices refer to the column-major vectorization of the full matrix.
+
+The index arrays only depend on n, so they are cached; the returned
+arrays are shared and read-only. The coefficient matrices are built from
+them on every call, so callers may modify them.
+"""
+
+from fastcache import clru_cache
+import numpy as np
+import scipy.sparse as sp
+
+
+def _readonly(*arrays):
+    for arr in arrays:
+        arr.flags.writeable = False
+    return arrays
+
+
+@clru_cache(maxsize=100)
+def lower_tri_indices(n):
+    """Returns the row and column indices of the lower triangular entries.
+
+    Parameters
+    ----------
+    n : int
+        The width/height of the matrix.
+
+    Returns
+    -------
+    tuple
+        The (rows, cols) of the lower triangular entries, in column-major
+        order.
+    """
+    cols, rows = np.triu_indices(n)
+    return _readonly(rows, cols)
+
+
+@clru_cache(maxsize=100)
+def lower_tri_vec_indices(n):
+    """Returns the indices of the lower triangular entries in the
+       column-major vectorization of the matrix, together with the indices
+       of their mirror images.
+
+    Parameters
+    ----------
+    n : int
+        The width/height of the matrix.
+
+    Returns
+    -------
+    tuple
+        The (lower, upper) index arrays, each of length n*(n+1)//2.
+    """
+    rows, cols = lower_tri_indices(n)
+    return _readonly(cols*n + rows, rows*n + cols)
+
+
+def upper_tri_to_full(n):
+    """Returns a coefficient matrix to create a symmetric matrix.
+
+    The matrix maps the upper triangular entries, in row-major order
+    (equivalently, the lower triangular entries in column-major order),
+    to the column-major vectorization of the symmetric matrix.
+
+    Parameters
+    ----------
+    n : int
+        The width/height of the matrix.
+
+    Returns
+    -------
+    SciPy CSC matrix
+        The coefficient matrix.
+    """
+    entries = n*(n+1)//2
+    lower, upper = lower_tri_vec_indices(n)
+    count = np.arange(entries)
+    off_diag = lower != upper
+    # Index in the filled matrix of each entry, and of its mirror image.
+    row_arr = np.hstack([lower, upper[off_diag]])
+    # Index in the original matrix.
+    col_arr = np.hstack([count, count[off_diag]])
+    val_arr = np.ones(row_arr.size)
+    return sp.coo_matrix((val_arr, (row_arr, col_arr)),
+                         (n*n, entries)).tocsc()
+
+
+def scaled_lower_tri_coeff(n):
+    """Returns a coefficient matrix that extracts the lower triangle.
+
+    The strictly lower triangular entries are scaled by sqrt(2), so that
+    the inner product of two packed symmetric matrices equals the trace
+    inner product of the full matrices (as required by SCS).
+
+    Parameters
+    ----------
+    n : int
+        The width/height of the matrix.
+
+    Returns
+    -------
+    SciPy CSR matrix
+        The coefficient matrix of shape (n*(n+1)//2, n*n).
+    """
+    entries = n*(n+1)//2
+    lower, upper = lower_tri_vec_indices(n)
+    val_arr = np.where(lower == upper, 1.0, np.sqrt(2))
+    return sp.csr_matrix((val_arr, (np.arange(entries), lower)),
+                         (entries, n*n))
+
+
+def pack_lower_tri(matrix, scale=1.0):
+    """Packs the lower triangle of a square matrix into a vector.
+
+    Parameters
+    ----------
+    matrix : numpy.ndarray
+        A square matrix.
+    scale : float
+        The factor by which the strictly lower triangular entries are
+        multiplied.
+
+    Returns
+    -------
+    numpy.ndarray
+        The lower triangular entries, in column-major order.
+    """
+    n = matrix.shape[0]
+    rows, cols = lower_tri_indices(n)
+    vec = np.asarray(matrix)[rows, cols]
+    if scale != 1.0:
+        vec = np.where(rows == cols, vec, scale*vec)
+    return vec
+
+
+def unpack_lower_tri(lower_tri, n, scale=1.0):
+    """Expands n*(n+1)//2 lower triangular entries to a symmetric matrix.
+
+    Parameters
+    ----------
+    lower_tri : numpy.ndarray
+        The lower triangular part of the matrix, stacked in column-major
+        order.
+    n : int
+        The width/height of the matrix.
+    scale : float
+        The factor by which the strictly lower triangular entries are
+        multiplied.
+
+    Returns
+    -------
+    numpy.ndarray
+        The n by n symmetric matrix.
+    """
+    rows, cols = lower_tri_indices(n)
+    vec = np.asarray(lower_tri, dtype=float).ravel()
+    if scale != 1.0:
+        vec = np.where(rows == cols, vec, scale*vec)
+    full = np.zeros((n, n))
+    full[rows, cols] = vec
+    full[cols, rows] = vec
+    return full